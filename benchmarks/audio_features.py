@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# coding=utf-8
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Compares computing log mel filterbanks of random clips with the previous
+per file implementation (frames copied in a loop, full complex FFT, filter
+matrix rebuilt every call), the current one called per file and the current
+one called once on the whole batch of clips.
+
+    python benchmarks/audio_features.py --num_clips 200 --length_in_s 5
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.signal.windows import get_window
+
+from ludwig.utils import audio_utils
+from ludwig.utils.audio_utils import get_fbank
+
+
+def reference_fbank(raw_data, sampling_rate_in_hz, window_length_in_s,
+                    window_shift_in_s, num_fft_points, window_type,
+                    num_filter_bands):
+    data = audio_utils._pre_emphasize_data(raw_data)
+    window_length_in_samp = int(window_length_in_s * sampling_rate_in_hz)
+    window_shift_in_samp = int(window_shift_in_s * sampling_rate_in_hz)
+    num_input = data.shape[0]
+    num_output = audio_utils.get_num_output_padded_to_fit_input(
+        num_input, window_length_in_samp, window_shift_in_samp
+    )
+    matrix = np.zeros((num_output, window_length_in_samp))
+    for i in range(num_output):
+        start_idx = window_shift_in_samp * i
+        is_last_output = i == num_output - 1
+        end_idx = (start_idx + window_length_in_samp
+                   if not is_last_output else num_input)
+        window_data = data[start_idx:end_idx]
+        matrix[i, :end_idx - start_idx] = window_data - np.mean(window_data)
+    matrix = matrix * get_window(window_type, window_length_in_samp,
+                                 fftbins=False)
+    stft = np.fft.fft(matrix, n=num_fft_points)
+    stft = stft[:, :audio_utils.get_non_symmetric_length(num_fft_points)]
+
+    upper_limit_mel = audio_utils._convert_hz_to_mel(
+        int(sampling_rate_in_hz / 2)
+    )
+    mel_points = np.linspace(0, upper_limit_mel, num_filter_bands + 2)
+    mel_fbank_matrix = audio_utils._get_mel_fbank_matrix(
+        mel_points, num_filter_bands, num_fft_points, sampling_rate_in_hz
+    )
+    mel_fbank_feature = np.dot(np.abs(stft) ** 2, mel_fbank_matrix.T)
+    return np.transpose(np.log(mel_fbank_feature + 1.0e-10))
+
+
+def main(num_clips, length_in_s, sampling_rate_in_hz, num_filter_bands,
+         random_seed):
+    clips = np.random.RandomState(random_seed).uniform(
+        -1, 1, (num_clips, int(length_in_s * sampling_rate_in_hz))
+    )
+    params = (sampling_rate_in_hz, 0.04, 0.02, 1024, 'hamming',
+              num_filter_bands)
+
+    start = time.perf_counter()
+    reference = [reference_fbank(clip, *params) for clip in clips]
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_file = [get_fbank(clip, *params) for clip in clips]
+    per_file_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = get_fbank(clips, *params)
+    batch_time = time.perf_counter() - start
+
+    assert np.allclose(np.stack(reference), np.stack(per_file))
+    assert np.allclose(np.stack(per_file), batch)
+
+    print('{} clips of {}s at {}Hz, {} filter bands'.format(
+        num_clips, length_in_s, sampling_rate_in_hz, num_filter_bands
+    ))
+    for name, elapsed in (
+            ('reference', reference_time),
+            ('per file', per_file_time),
+            ('batch', batch_time),
+    ):
+        print('{:>10}: {:8.3f} s  {:6.2f} ms/clip'.format(
+            name, elapsed, 1000 * elapsed / num_clips
+        ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark filterbank computation per file and in batch'
+    )
+    parser.add_argument('--num_clips', type=int, default=200)
+    parser.add_argument('--length_in_s', type=float, default=5)
+    parser.add_argument('--sampling_rate_in_hz', type=int, default=16000)
+    parser.add_argument('--num_filter_bands', type=int, default=80)
+    parser.add_argument('--random_seed', type=int, default=42)
+    args = parser.parse_args()
+    main(args.num_clips, args.length_in_s, args.sampling_rate_in_hz,
+         args.num_filter_bands, args.random_seed)
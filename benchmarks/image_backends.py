@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# coding=utf-8
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Compares the image backends decoding and resizing JPEG photos, the way
+image features are preprocessed, for a few target sizes.
+
+    python benchmarks/image_backends.py --num_images 20 --height 3000 \
+        --width 4000 --sizes 64 128 224
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from ludwig.constants import CROP_OR_PAD, INTERPOLATE
+from ludwig.features.image_feature import ImageFeatureMixin
+from ludwig.utils.image_utils import IMAGE_BACKENDS
+
+
+def generate_images(directory, num_images, height, width, random_seed):
+    rs = np.random.RandomState(random_seed)
+    # smooth gradients plus noise compress like photos, unlike pure noise
+    y, x = np.mgrid[0:height, 0:width]
+    file_paths = []
+    for i in range(num_images):
+        phase = rs.uniform(0, 2 * np.pi, 3)
+        img = np.stack(
+            [127 + 100 * np.sin(x / width * 6 + y / height * 4 + p)
+             for p in phase],
+            axis=2
+        ) + rs.normal(0, 10, (height, width, 3))
+        file_path = os.path.join(directory, '{}.jpg'.format(i))
+        Image.fromarray(np.clip(img, 0, 255).astype(np.uint8)).save(
+            file_path, quality=90
+        )
+        file_paths.append(file_path)
+    return file_paths
+
+
+def time_backend(file_paths, backend, size, resize_method):
+    start = time.perf_counter()
+    for file_path in file_paths:
+        ImageFeatureMixin._read_image_and_resize(
+            file_path,
+            img_width=size,
+            img_height=size,
+            should_resize=True,
+            num_channels=3,
+            resize_method=resize_method,
+            user_specified_num_channels=False,
+            backend=backend
+        )
+    return (time.perf_counter() - start) / len(file_paths)
+
+
+def main(num_images, height, width, sizes, random_seed):
+    with tempfile.TemporaryDirectory() as directory:
+        file_paths = generate_images(
+            directory, num_images, height, width, random_seed
+        )
+        print('{} JPEG images of {}x{}'.format(num_images, width, height))
+        for resize_method in (INTERPOLATE, CROP_OR_PAD):
+            for size in sizes:
+                timings = [
+                    '{}: {:7.1f} ms'.format(
+                        backend,
+                        1000 * time_backend(
+                            file_paths, backend, size, resize_method
+                        )
+                    )
+                    for backend in IMAGE_BACKENDS
+                ]
+                print('{:>11} {:>4}x{:<4} {}'.format(
+                    resize_method, size, size, '  '.join(timings)
+                ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark image decoding and resizing backends'
+    )
+    parser.add_argument('--num_images', type=int, default=20)
+    parser.add_argument('--height', type=int, default=3000)
+    parser.add_argument('--width', type=int, default=4000)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[64, 128, 224])
+    parser.add_argument('--random_seed', type=int, default=42)
+    args = parser.parse_args()
+    main(args.num_images, args.height, args.width, args.sizes,
+         args.random_seed)
@@ -25,6 +25,9 @@ import copy
 import logging
 import os
 import tempfile
+import time
+import uuid
+from functools import partial
 from pprint import pformat
 
 import numpy as np
@@ -34,11 +37,14 @@ import ludwig.contrib
 
 ludwig.contrib.contrib_import()
 
-from ludwig.constants import PREPROCESSING, TRAINING, VALIDATION, TEST
+from ludwig.constants import NAME, PREPROCESSING, TRAINING, VALIDATION, TEST
 from ludwig.contrib import contrib_command
+from ludwig.data.dataset_synthesizer import generate_entries_from_metadata
+from ludwig.data.inference_preprocessing import InferencePreprocessor, \
+    MAX_INFERENCE_PREPROCESSING_ROWS, get_num_rows
 from ludwig.data.postprocessing import convert_predictions, postprocess
 from ludwig.data.preprocessing import preprocess_for_training, \
-    preprocess_for_prediction, load_metadata
+    preprocess_for_prediction, load_metadata, iter_dataset_file_chunks
 from ludwig.features.feature_registries import \
     update_model_definition_with_metadata
 from ludwig.globals import TRAIN_SET_METADATA_FILE_NAME, \
@@ -50,11 +56,14 @@ from ludwig.models.predictor import Predictor, save_prediction_outputs, \
 from ludwig.models.trainer import Trainer
 from ludwig.modules.metric_modules import get_best_function
 from ludwig.utils.data_utils import save_json, load_json, generate_kfold_splits
+from ludwig.utils.data_utils import DATAFRAME_FORMATS, DICT_FORMATS, \
+    FILE_FORMATS, figure_data_format_dataset, save_data_chunks
 from ludwig.utils.horovod_utils import broadcast_return, configure_horovod, \
     set_on_master, \
     is_on_master
 from ludwig.utils.misc_utils import get_output_directory, get_file_names, \
     get_experiment_description
+from ludwig.utils.prediction_cache import PredictionCache
 from ludwig.utils.tf_utils import initialize_tensorflow
 
 import yaml
@@ -122,6 +131,13 @@ class LudwigModel:
         # online training state
         self._online_trainer = None
 
+        # built on first use from the training set metadata
+        self._inference_preprocessor = None
+
+        # optional, see enable_prediction_cache
+        self.prediction_cache = None
+        self._update_model_version()
+
     def train(
             self,
             dataset=None,
@@ -426,6 +442,7 @@ class LudwigModel:
         contrib_command("train_save", output_directory)
 
         self.training_set_metadata = training_set_metadata
+        self._update_model_version()
 
         if not skip_save_model:
             # Load the best weights from saved checkpoint
@@ -487,6 +504,7 @@ class LudwigModel:
             self.model,
             training_dataset,
         )
+        self._update_model_version()
 
     def predict(
             self,
@@ -498,10 +516,75 @@ class LudwigModel:
             output_directory='results',
             return_type=pd.DataFrame,
             debug=False,
+            output_features=None,
+            skip_probabilities=False,
             **kwargs
     ):
         self._check_initialization()
 
+        # validated and in a canonical order, they are part of cache keys
+        if output_features is not None:
+            output_features = self.model.get_output_feature_names(
+                output_features
+            )
+
+        if self._use_prediction_cache(
+                dataset,
+                data_format,
+                return_type,
+                skip_save_unprocessed_output and skip_save_predictions
+        ):
+            # identical rows are predicted once, and only when not cached
+            postproc_predictions = self.prediction_cache.predict(
+                dataset,
+                [feature[NAME]
+                 for feature in self.model_definition['input_features']],
+                (self.model_version, output_features, skip_probabilities),
+                lambda rows: self._predict(
+                    rows,
+                    data_format=data_format,
+                    batch_size=batch_size,
+                    output_features=output_features,
+                    skip_probabilities=skip_probabilities,
+                    debug=debug
+                )
+            )
+        else:
+            postproc_predictions = self._predict(
+                dataset,
+                data_format=data_format,
+                batch_size=batch_size,
+                skip_save_unprocessed_output=skip_save_unprocessed_output,
+                skip_save_predictions=skip_save_predictions,
+                output_directory=output_directory,
+                return_type=return_type,
+                output_features=output_features,
+                skip_probabilities=skip_probabilities,
+                debug=debug
+            )
+
+        if is_on_master():
+            if not skip_save_predictions:
+                save_prediction_outputs(postproc_predictions,
+                                        output_directory)
+
+                logger.info('Saved to: {0}'.format(output_directory))
+
+        return postproc_predictions, output_directory
+
+    def _predict(
+            self,
+            dataset,
+            data_format=None,
+            batch_size=128,
+            skip_save_unprocessed_output=True,
+            skip_save_predictions=True,
+            output_directory='results',
+            return_type=pd.DataFrame,
+            output_features=None,
+            skip_probabilities=False,
+            debug=False
+    ):
         logger.debug('Preprocessing')
         # Added [:] to next line, before I was just assigning,
         # this way I'm copying the list. If you don't do it, you are actually
@@ -510,6 +593,8 @@ class LudwigModel:
         features_to_load = self.model_definition['input_features'][:]
 
         # preprocessing
+        if self._use_inference_preprocessor(dataset, data_format):
+            dataset = self.get_inference_preprocessor()(dataset)
         dataset, training_set_metadata = preprocess_for_prediction(
             self.model_definition,
             dataset=dataset,
@@ -525,7 +610,13 @@ class LudwigModel:
         predictions = predictor.batch_predict(
             self.model,
             dataset,
+            output_features=output_features,
+            skip_probabilities=skip_probabilities
         )
+        predicted_output_features = {
+            of_name: self.model.output_features[of_name]
+            for of_name in self.model.get_output_feature_names(output_features)
+        }
 
         if is_on_master():
             # if we are skipping all saving,
@@ -540,25 +631,274 @@ class LudwigModel:
         postproc_predictions = convert_predictions(
             postprocess(
                 predictions,
-                self.model.output_features,
+                predicted_output_features,
                 self.training_set_metadata,
                 output_directory=output_directory,
                 skip_save_unprocessed_output=skip_save_unprocessed_output
                                              or not is_on_master(),
             ),
-            self.model.output_features,
+            predicted_output_features,
             self.training_set_metadata,
             return_type=return_type
         )
+        return postproc_predictions
 
-        if is_on_master():
-            if not skip_save_predictions:
-                save_prediction_outputs(postproc_predictions,
-                                        output_directory)
+    def enable_prediction_cache(self, max_size=10000, ttl_s=None):
+        """Caches the predictions of `predict` and `predict_chunks` for
+        DataFrames, dicts and lists of dicts, so repeated rows are predicted
+        once. Rows are identified by their input feature values and the
+        version of the model, which changes whenever its weights do.
+        Predictions that are saved to disk or not returned as DataFrames
+        are never cached.
 
-                logger.info('Saved to: {0}'.format(output_directory))
+        # Inputs
 
-        return postproc_predictions, output_directory
+        :param max_size: (int, default: `10000`) number of distinct rows
+               whose predictions are kept, the least recently used ones are
+               dropped beyond it
+        :param ttl_s: (float, default: `None`) seconds a prediction is kept,
+               forever if `None`
+
+        # Return
+
+        :return: (PredictionCache) the cache, e.g. for its metrics
+        """
+        self.prediction_cache = PredictionCache(
+            max_size=max_size,
+            ttl_s=ttl_s
+        )
+        return self.prediction_cache
+
+    def disable_prediction_cache(self):
+        self.prediction_cache = None
+
+    def _use_prediction_cache(self, dataset, data_format, return_type,
+                              skip_save):
+        if self.prediction_cache is None or return_type is not pd.DataFrame:
+            return False
+        # saved unprocessed outputs would miss the cached rows
+        if not skip_save:
+            return False
+        if not (data_format in (None, 'auto') or
+                data_format in DICT_FORMATS or
+                data_format in DATAFRAME_FORMATS):
+            return False
+        return (isinstance(dataset, (pd.DataFrame, dict, list)) and
+                get_num_rows(dataset) > 0)
+
+    def _update_model_version(self):
+        # keys predictions, the cached ones of previous weights never match
+        self.model_version = uuid.uuid4().hex
+
+    def get_inference_preprocessor(self):
+        """Returns the `InferencePreprocessor` of the model, preprocessing a
+        few rows given as dicts without pandas. It is built on first use and
+        rebuilt when the training set metadata changes.
+
+        # Return
+
+        :return: (InferencePreprocessor) the preprocessor of the model inputs
+        """
+        self._check_initialization()
+        if (self._inference_preprocessor is None or
+                self._inference_preprocessor.training_set_metadata is not
+                self.training_set_metadata):
+            self._inference_preprocessor = InferencePreprocessor(
+                self.model_definition,
+                self.training_set_metadata
+            )
+        return self._inference_preprocessor
+
+    def warm_up(self, batch_sizes=(1,)):
+        """Predicts entries generated from the training set metadata once for
+        each batch size, so that the first actual predictions don't wait for
+        the prediction function to be traced for their batch size, for lazy
+        imports or for lookup tables to be built.
+
+        # Inputs
+
+        :param batch_sizes: (list, default: `(1,)`) numbers of entries
+               predicted together, e.g. the batch sizes expected when serving
+
+        # Return
+
+        :return: (dict) seconds taken by the prediction of each batch size
+        """
+        self._check_initialization()
+        timings = {}
+        for batch_size in batch_sizes:
+            entries = generate_entries_from_metadata(
+                self.model_definition['input_features'],
+                self.training_set_metadata,
+                batch_size
+            )
+            start = time.perf_counter()
+            # synthetic rows don't go through the prediction cache
+            self._predict(
+                entries,
+                data_format=dict,
+                batch_size=batch_size
+            )
+            timings[batch_size] = time.perf_counter() - start
+            logger.info('Warm-up with batch size {}: {:.3f} s'.format(
+                batch_size, timings[batch_size]
+            ))
+        return timings
+
+    def _use_inference_preprocessor(self, dataset, data_format):
+        # lists of dicts are rows, like the entries batched by the server
+        if not (data_format in DICT_FORMATS or
+                (data_format in (None, 'auto') and
+                 isinstance(dataset, (dict, list)))):
+            return False
+        if get_num_rows(dataset) > MAX_INFERENCE_PREPROCESSING_ROWS:
+            return False
+        return self.get_inference_preprocessor().supported
+
+    def predict_chunks(
+            self,
+            dataset=None,
+            data_format=None,
+            chunk_size=100000,
+            batch_size=128,
+            debug=False
+    ):
+        """Predicts a dataset chunk by chunk, so memory is bounded by the
+        chunk size and not by the size of the dataset.
+
+        # Inputs
+
+        :param dataset: (string, pd.DataFrame or dict) a raw dataset file in
+               one of the file formats (csv, parquet, feather) read
+               chunk_size rows at a time, or a DataFrame or dict split in
+               chunks of chunk_size rows
+        :param data_format: (string, default: `None`) format of the dataset,
+               figured out from the dataset if `None` or `'auto'`
+        :param chunk_size: (int, default: `100000`) number of rows preprocessed
+               and predicted at a time
+        :param batch_size: (int, default: `128`) size of prediction batches
+
+        # Return
+
+        :return: (generator) postprocessed predictions of each chunk as a
+                 pd.DataFrame, in the order of the rows of the dataset
+        """
+        self._check_initialization()
+
+        if not data_format or data_format == 'auto':
+            data_format = figure_data_format_dataset(dataset)
+
+        input_features = self.model_definition['input_features']
+        if data_format in FILE_FORMATS:
+            chunks = iter_dataset_file_chunks(
+                dataset,
+                data_format,
+                input_features,
+                self.model_definition.get(PREPROCESSING, {}),
+                chunk_size
+            )
+        elif data_format in DATAFRAME_FORMATS or data_format in DICT_FORMATS:
+            if data_format in DICT_FORMATS:
+                dataset = pd.DataFrame(dataset)
+            chunks = (dataset.iloc[start:start + chunk_size]
+                      for start in range(0, len(dataset), chunk_size))
+        else:
+            raise ValueError(
+                'Chunked prediction is not supported with {} data '
+                'format.'.format(data_format)
+            )
+
+        predictor = Predictor(
+            batch_size=batch_size, horovod=self._horovod, debug=debug
+        )
+        for chunk in chunks:
+            logger.debug('Preprocessing chunk of {} rows'.format(len(chunk)))
+            chunk_df = chunk.reset_index(drop=True)
+            if hasattr(chunk, 'csv'):
+                # relative paths of image and audio files
+                chunk_df.csv = chunk.csv
+            if self.prediction_cache is not None and len(chunk_df):
+                yield self.prediction_cache.predict(
+                    chunk_df,
+                    [feature[NAME] for feature in input_features],
+                    # the key of predict with all the outputs
+                    (self.model_version, None, False),
+                    partial(self._predict_chunk, predictor)
+                )
+            else:
+                yield self._predict_chunk(predictor, chunk_df)
+
+    def _predict_chunk(self, predictor, chunk_df):
+        chunk_dataset, _ = preprocess_for_prediction(
+            self.model_definition,
+            dataset=chunk_df,
+            data_format='df',
+            training_set_metadata=self.training_set_metadata,
+            include_outputs=False,
+        )
+
+        predictions = predictor.batch_predict(
+            self.model,
+            chunk_dataset,
+        )
+        return convert_predictions(
+            postprocess(
+                predictions,
+                self.model.output_features,
+                self.training_set_metadata,
+                skip_save_unprocessed_output=True,
+            ),
+            self.model.output_features,
+            self.training_set_metadata,
+            return_type=pd.DataFrame
+        )
+
+    def predict_to_file(
+            self,
+            dataset=None,
+            output_path='predictions.csv',
+            data_format=None,
+            output_format=None,
+            chunk_size=100000,
+            batch_size=128,
+            debug=False
+    ):
+        """Predicts a dataset chunk by chunk with `predict_chunks` and
+        appends the predictions of each chunk to a csv or parquet file.
+
+        # Inputs
+
+        :param output_path: (string, default: `'predictions.csv'`) path of
+               the file the predictions are written to
+        :param output_format: (string, default: `None`) `'csv'` or
+               `'parquet'`, figured out from output_path if `None`
+
+        The other parameters are the ones of `predict_chunks`.
+
+        # Return
+
+        :return: (int) number of predicted rows
+        """
+        chunks = self.predict_chunks(
+            dataset=dataset,
+            data_format=data_format,
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            debug=debug,
+        )
+        if not is_on_master():
+            # only the master writes, the other workers just take part
+            # in the distributed prediction
+            return sum(len(chunk) for chunk in chunks)
+
+        output_directory = os.path.dirname(output_path)
+        if output_directory:
+            os.makedirs(output_directory, exist_ok=True)
+        num_rows = save_data_chunks(chunks, output_path, output_format)
+        logger.info('Saved {} predictions to: {}'.format(
+            num_rows, output_path
+        ))
+        return num_rows
 
     # def evaluate_pseudo(self, data, return_preds=False):
     #     preproc_data = preprocess_data(data)
@@ -824,7 +1164,8 @@ class LudwigModel:
              use_horovod=None,
              gpus=None,
              gpu_memory_limit=None,
-             allow_parallel_threads=True):
+             allow_parallel_threads=True,
+             warm_up_batch_sizes=None):
         """This function allows for loading pretrained models
 
         # Inputs
@@ -839,6 +1180,9 @@ class LudwigModel:
         :param allow_parallel_threads: (bool, default: `True`) allow TensorFlow to use
                multithreading parallelism to improve performance at the cost of
                determinism.
+        :param warm_up_batch_sizes: (list, default: `None`) if provided the
+               model is warmed up predicting synthetic entries in batches of
+               these sizes, see `warm_up`
 
         # Return
 
@@ -884,6 +1228,9 @@ class LudwigModel:
             ), horovod
         )
 
+        if warm_up_batch_sizes:
+            ludwig_model.warm_up(warm_up_batch_sizes)
+
         return ludwig_model
 
     def load_weights(self, model_dir):
@@ -900,6 +1247,8 @@ class LudwigModel:
             self._horovod.broadcast_variables(self.model.variables,
                                               root_rank=0)
 
+        self._update_model_version()
+
     def save(self, save_path):
         """This function allows to save models on disk
 
@@ -196,7 +196,7 @@ def cli_collect_activations(sys_argv):
         '--data_format',
         help='format of the input data',
         default='auto',
-        choices=['auto', 'csv', 'hdf5']
+        choices=['auto', 'csv', 'hdf5', 'parquet', 'feather']
     )
 
     # ----------------
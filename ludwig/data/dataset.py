@@ -19,7 +19,8 @@ import numpy as np
 
 
 class Dataset:
-    def __init__(self, dataset, input_features, output_features, data_hdf5_fp):
+    def __init__(self, dataset, input_features, output_features, data_hdf5_fp,
+                 training_set_metadata=None):
         self.dataset = dataset
 
         self.size = min(map(len, self.dataset.values()))
@@ -36,9 +37,29 @@ class Dataset:
         self.features.update(self.output_features)
         self.data_hdf5_fp = data_hdf5_fp
 
+        # features preprocessed with lazy_load only store file paths,
+        # images given in memory are decoded during preprocessing anyway
+        self.image_loaders = {}
+        if training_set_metadata is not None:
+            for feature_name in self.features:
+                preprocessing = training_set_metadata.get(
+                    feature_name, {}
+                ).get('preprocessing', {})
+                if (preprocessing.get('lazy_load') and
+                        self.dataset[feature_name].dtype != np.uint8):
+                    # imported here as it depends on tensorflow
+                    from ludwig.features.image_feature import \
+                        ImageFeatureMixin
+                    self.image_loaders[feature_name] = \
+                        ImageFeatureMixin.create_image_loader(preprocessing)
+
     def get(self, feature_name, idx=None):
         if idx is None:
             idx = range(self.size)
+        if feature_name in self.image_loaders:
+            return self.image_loaders[feature_name].load(
+                self.dataset[feature_name][idx]
+            )
         if (self.data_hdf5_fp is None or
                 'preprocessing' not in self.features[feature_name] or
                 'in_memory' not in self.features[feature_name][
@@ -49,16 +70,24 @@ class Dataset:
 
         sub_batch = self.dataset[feature_name][idx]
 
-        indices = np.empty((3, len(sub_batch)), dtype=np.int64)
-        indices[0, :] = sub_batch
-        indices[1, :] = np.arange(len(sub_batch))
-        indices = indices[:, np.argsort(indices[0])]
-
+        # h5py needs increasing indices without repetitions, rows sharing
+        # the same image are read once and repeated afterwards
+        unique_indices, inverse = np.unique(sub_batch, return_inverse=True)
         with h5py.File(self.data_hdf5_fp, 'r') as h5_file:
-            im_data = h5_file[feature_name + '_data'][indices[0, :], :, :]
-        indices[2, :] = np.arange(len(sub_batch))
-        indices = indices[:, np.argsort(indices[1])]
-        return im_data[indices[2, :]]
+            im_data = h5_file[feature_name + '_data'][unique_indices, :, :]
+        return im_data[inverse]
+
+    def prefetch(self, idx):
+        """Starts loading the lazily loaded features of the rows in idx,
+        usually the next batch, in the background."""
+        for feature_name, image_loader in self.image_loaders.items():
+            image_loader.prefetch(self.dataset[feature_name][idx])
+
+    def close(self):
+        """Stops the threads loading lazily loaded features, they start
+        again if the dataset is used afterwards."""
+        for image_loader in self.image_loaders.values():
+            image_loader.close()
 
     def get_dataset(self):
         return self.dataset
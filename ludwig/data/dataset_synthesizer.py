@@ -15,6 +15,7 @@
 # limitations under the License.
 # ==============================================================================
 import argparse
+import io
 import logging
 import os
 import random
@@ -25,10 +26,11 @@ import uuid
 import numpy as np
 import yaml
 
-from ludwig.constants import VECTOR, TYPE, NAME
+from ludwig.constants import VECTOR, TYPE, NAME, PREPROCESSING
 from ludwig.utils.data_utils import save_csv
 from ludwig.utils.h3_util import components_to_h3
 from ludwig.utils.misc_utils import get_from_registry
+from ludwig.utils.strings_utils import PADDING_SYMBOL, UNKNOWN_SYMBOL
 
 logger = logging.getLogger(__name__)
 
@@ -386,6 +388,131 @@ cyclers_registry = {
     'binary': cycle_binary
 }
 
+
+def generate_image_bytes(feature):
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError(
+            'Pillow is not installed. '
+            'In order to install all image feature dependencies run '
+            'pip install ludwig[image]'
+        )
+
+    num_channels = feature['preprocessing']['num_channels']
+    width = feature['preprocessing']['width']
+    height = feature['preprocessing']['height']
+
+    shape = (height, width) if num_channels == 1 else (
+        height, width, num_channels)
+    img = np.random.randint(0, 256, shape, dtype=np.uint8)
+
+    # encoded in memory, like an image uploaded to the server
+    buffer = io.BytesIO()
+    Image.fromarray(img).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _vocabulary_tokens(idx2str):
+    tokens = [token for token in idx2str
+              if token not in (UNKNOWN_SYMBOL, PADDING_SYMBOL)]
+    return tokens if tokens else idx2str
+
+
+def _category_parameters(metadata):
+    return {'idx2str': _vocabulary_tokens(metadata['idx2str'])}
+
+
+def _numerical_parameters(metadata):
+    if 'mean' in metadata:
+        return {'min': metadata['mean'] - metadata['std'],
+                'max': metadata['mean'] + metadata['std']}
+    if 'min' in metadata:
+        return {'min': metadata['min'], 'max': metadata['max']}
+    return {}
+
+
+def _set_parameters(metadata):
+    return {'idx2str': _vocabulary_tokens(metadata['idx2str']),
+            'max_len': metadata['max_set_size']}
+
+
+def _sequence_parameters(metadata):
+    return {'idx2str': _vocabulary_tokens(metadata['idx2str']),
+            'min_len': 1,
+            'max_len': metadata['max_sequence_length']}
+
+
+def _text_parameters(metadata):
+    return {'idx2str': _vocabulary_tokens(metadata['word_idx2str']),
+            'min_len': 1,
+            'max_len': metadata['word_max_sequence_length']}
+
+
+def _timeseries_parameters(metadata):
+    return {'max_len': metadata['max_timeseries_length']}
+
+
+def _vector_parameters(metadata):
+    return {'vector_size': metadata['vector_size']}
+
+
+def _date_parameters(metadata):
+    datetime_format = metadata.get(PREPROCESSING, {}).get('datetime_format')
+    if datetime_format not in DATETIME_FORMATS:
+        datetime_format = '%Y-%m-%d'
+    return {'datetime_format': datetime_format}
+
+
+def _image_parameters(metadata):
+    return {'preprocessing': metadata[PREPROCESSING]}
+
+
+# the parameters of the generator of each feature type computed from the
+# training set metadata of a feature, and the generator.
+# Audio is missing, the sampling rate of the training set is not known
+metadata_generators_registry = {
+    'category': (_category_parameters, generate_category),
+    'text': (_text_parameters, generate_sequence),
+    'numerical': (_numerical_parameters, generate_numerical),
+    'binary': (lambda metadata: {}, generate_binary),
+    'set': (_set_parameters, generate_set),
+    'bag': (_set_parameters, generate_bag),
+    'sequence': (_sequence_parameters, generate_sequence),
+    'timeseries': (_timeseries_parameters, generate_timeseries),
+    'image': (_image_parameters, generate_image_bytes),
+    'h3': (lambda metadata: {}, generate_h3),
+    'date': (_date_parameters, generate_datetime),
+    VECTOR: (_vector_parameters, generate_vector)
+}
+
+
+def generate_entries_from_metadata(features, training_set_metadata,
+                                   num_entries):
+    """
+    Generates num_entries dicts of raw values of the features, with the
+    vocabularies, lengths, sizes and image shapes of their training set
+    metadata, like the entries a trained model is asked to predict.
+    Images are PNG bytes, nothing is written to disk.
+    """
+    generators = []
+    for feature in features:
+        build_parameters, generate = get_from_registry(
+            feature[TYPE],
+            metadata_generators_registry
+        )
+        generators.append((
+            feature[NAME],
+            build_parameters(training_set_metadata[feature[NAME]]),
+            generate
+        ))
+    return [
+        {name: generate(parameters)
+         for name, parameters, generate in generators}
+        for _ in range(num_entries)
+    ]
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         description='This script generates a synthetic dataset.')
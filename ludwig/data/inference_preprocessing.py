@@ -0,0 +1,341 @@
+#! /usr/bin/env python
+# coding=utf-8
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import logging
+from collections import Counter
+
+import numpy as np
+
+from ludwig.constants import *
+from ludwig.data.dataset import Dataset
+from ludwig.data.preprocessing import get_feature_preprocessing_parameters
+from ludwig.utils.defaults import default_preprocessing_parameters
+from ludwig.utils.math_utils import int_type
+from ludwig.utils.misc_utils import get_from_registry
+from ludwig.utils.misc_utils import merge_dict
+from ludwig.utils.strings_utils import UNKNOWN_SYMBOL
+from ludwig.utils.strings_utils import sequence_to_vector
+from ludwig.utils.strings_utils import str2bool
+from ludwig.utils.strings_utils import tokenizer_registry
+
+logger = logging.getLogger(__name__)
+
+# above this number of rows preprocess_for_prediction is faster,
+# pandas pays off when values are converted once per distinct value
+MAX_INFERENCE_PREPROCESSING_ROWS = 1024
+
+
+def _is_missing(value):
+    return value is None or (
+            isinstance(value, (float, np.floating)) and np.isnan(value)
+    )
+
+
+def _fill_missing(values, fill_value):
+    return [fill_value if _is_missing(value) else value for value in values]
+
+
+def _compile_numerical(feature, metadata, preprocessing_parameters):
+    fill_value = preprocessing_parameters['fill_value']
+    normalization = preprocessing_parameters['normalization']
+    shift, scale = 0, 1
+    if normalization == 'zscore':
+        shift, scale = metadata['mean'], metadata['std']
+    elif normalization == 'minmax':
+        shift, scale = metadata['min'], metadata['max'] - metadata['min']
+
+    def transform(values):
+        values = np.array(_fill_missing(values, fill_value), dtype=np.float32)
+        if normalization is not None:
+            values = (values - shift) / scale
+        return values
+
+    return transform
+
+
+def _compile_binary(feature, metadata, preprocessing_parameters):
+    fill_value = preprocessing_parameters['fill_value']
+
+    def transform(values):
+        values = _fill_missing(values, fill_value)
+        # like the object columns pandas makes of strings,
+        # every value is parsed as a string when any of them is one
+        if any(isinstance(value, str) for value in values):
+            return np.array([str2bool(value) for value in values],
+                            dtype=np.bool_)
+        return np.array(values, dtype=np.bool_)
+
+    return transform
+
+
+def _compile_category(feature, metadata, preprocessing_parameters):
+    fill_value = preprocessing_parameters['fill_value']
+    str2idx = metadata['str2idx']
+    unknown_idx = str2idx[UNKNOWN_SYMBOL]
+    dtype = int_type(metadata['vocab_size'])
+
+    def transform(values):
+        return np.array(
+            [str2idx.get(str(value).strip(), unknown_idx)
+             for value in _fill_missing(values, fill_value)],
+            dtype=dtype
+        )
+
+    return transform
+
+
+def _compile_tokens_to_idx(metadata, preprocessing_parameters):
+    fill_value = preprocessing_parameters['fill_value']
+    str2idx = metadata['str2idx']
+    unknown_idx = str2idx[UNKNOWN_SYMBOL]
+    tokenizer = get_from_registry(
+        preprocessing_parameters['tokenizer'],
+        tokenizer_registry
+    )()
+
+    def tokens_to_idx(values):
+        for value in _fill_missing(values, fill_value):
+            yield [str2idx.get(token, unknown_idx)
+                   for token in tokenizer(str(value))]
+
+    return tokens_to_idx
+
+
+def _compile_set(feature, metadata, preprocessing_parameters):
+    tokens_to_idx = _compile_tokens_to_idx(metadata, preprocessing_parameters)
+    vocab_size = len(metadata['str2idx'])
+
+    def transform(values):
+        set_matrix = np.zeros((len(values), vocab_size), dtype=np.bool_)
+        for i, token_indices in enumerate(tokens_to_idx(values)):
+            set_matrix[i, token_indices] = True
+        return set_matrix
+
+    return transform
+
+
+def _compile_bag(feature, metadata, preprocessing_parameters):
+    tokens_to_idx = _compile_tokens_to_idx(metadata, preprocessing_parameters)
+    vocab_size = len(metadata['str2idx'])
+
+    def transform(values):
+        bag_matrix = np.zeros((len(values), vocab_size), dtype=np.float32)
+        for i, token_indices in enumerate(tokens_to_idx(values)):
+            counts = Counter(token_indices)
+            bag_matrix[i, list(counts.keys())] = list(counts.values())
+        return bag_matrix
+
+    return transform
+
+
+def _compile_sequence_matrix(
+        fill_value,
+        str2idx,
+        tokenizer_type,
+        length_limit,
+        padding_symbol,
+        padding,
+        unknown_symbol,
+        lowercase,
+        vocab_file,
+        pretrained_model_name_or_path=None
+):
+    # tokenizers loading vocabularies or pretrained models
+    # are the most expensive part, they are created only once
+    tokenizer = get_from_registry(tokenizer_type, tokenizer_registry)(
+        vocab_file=vocab_file,
+        pretrained_model_name_or_path=pretrained_model_name_or_path,
+    )
+    dtype = int_type(len(str2idx) - 1)
+    padding_idx = str2idx[padding_symbol]
+
+    def transform(values):
+        sequence_matrix = np.full((len(values), length_limit), padding_idx,
+                                  dtype=dtype)
+        for i, value in enumerate(_fill_missing(values, fill_value)):
+            vector = sequence_to_vector(
+                str(value),
+                tokenizer,
+                tokenizer_type,
+                dtype,
+                str2idx,
+                lowercase=lowercase,
+                unknown_symbol=unknown_symbol
+            )
+            limit = min(len(vector), length_limit)
+            if padding == 'right':
+                sequence_matrix[i, :limit] = vector[:limit]
+            else:
+                sequence_matrix[i, length_limit - limit:] = vector[:limit]
+        return sequence_matrix
+
+    return transform
+
+
+def _compile_sequence(feature, metadata, preprocessing_parameters):
+    return _compile_sequence_matrix(
+        fill_value=preprocessing_parameters['fill_value'],
+        str2idx=metadata['str2idx'],
+        tokenizer_type=preprocessing_parameters['tokenizer'],
+        length_limit=metadata['max_sequence_length'],
+        padding_symbol=preprocessing_parameters['padding_symbol'],
+        padding=preprocessing_parameters['padding'],
+        unknown_symbol=preprocessing_parameters['unknown_symbol'],
+        lowercase=preprocessing_parameters['lowercase'],
+        vocab_file=preprocessing_parameters['vocab_file']
+    )
+
+
+def _compile_text(feature, metadata, preprocessing_parameters):
+    # only the level the model uses is computed
+    level = feature['level']
+    return _compile_sequence_matrix(
+        fill_value=preprocessing_parameters['fill_value'],
+        str2idx=metadata['{}_str2idx'.format(level)],
+        tokenizer_type=preprocessing_parameters['{}_tokenizer'.format(level)],
+        length_limit=metadata['{}_max_sequence_length'.format(level)],
+        padding_symbol=metadata['{}_pad_symbol'.format(level)],
+        padding=preprocessing_parameters['padding'],
+        unknown_symbol=metadata['{}_unk_symbol'.format(level)],
+        lowercase=preprocessing_parameters['lowercase'],
+        vocab_file=preprocessing_parameters['{}_vocab_file'.format(level)],
+        pretrained_model_name_or_path=preprocessing_parameters[
+            'pretrained_model_name_or_path'
+        ]
+    )
+
+
+def _compile_vector(feature, metadata, preprocessing_parameters):
+    fill_value = preprocessing_parameters['fill_value']
+
+    def transform(values):
+        vectors = [
+            value.split() if isinstance(value, str) else value
+            for value in _fill_missing(values, fill_value)
+        ]
+        sizes = {len(vector) for vector in vectors}
+        if len(sizes) > 1:
+            raise ValueError(
+                'Vectors of feature {} have different sizes: {}'.format(
+                    feature[NAME], sorted(sizes)
+                )
+            )
+        return np.array(vectors, dtype=np.float32)
+
+    return transform
+
+
+compiled_feature_registry = {
+    NUMERICAL: _compile_numerical,
+    BINARY: _compile_binary,
+    CATEGORY: _compile_category,
+    SET: _compile_set,
+    BAG: _compile_bag,
+    SEQUENCE: _compile_sequence,
+    TEXT: _compile_text,
+    VECTOR: _compile_vector,
+}
+
+
+def get_num_rows(dataset):
+    if isinstance(dataset, dict):
+        return len(next(iter(dataset.values()))) if dataset else 0
+    return len(dataset)
+
+
+class InferencePreprocessor:
+    """
+    Preprocesses a few rows of raw input values for prediction, without
+    building a DataFrame.
+
+    It is built once from the model definition and the training set
+    metadata: vocabularies, normalization statistics and tokenizers are
+    looked up ahead of time, so turning rows into model inputs takes little
+    more than dictionary lookups. Rows are given either as a list of dicts
+    or as a dict of columns, like the dict data format.
+
+    Only the feature types in compiled_feature_registry filling missing
+    values with a constant are supported, the other strategies depend on the
+    rest of the dataset. When any input feature is not supported,
+    `supported` is False and preprocess_for_prediction must be used instead.
+    """
+
+    def __init__(self, model_definition, training_set_metadata):
+        self.input_features = model_definition['input_features']
+        self.training_set_metadata = training_set_metadata
+        global_preprocessing_parameters = merge_dict(
+            default_preprocessing_parameters,
+            model_definition.get(PREPROCESSING, {})
+        )
+
+        self.unsupported_features = []
+        self._transforms = {}
+        for feature in self.input_features:
+            metadata = training_set_metadata[feature[NAME]]
+            preprocessing_parameters = metadata.get(PREPROCESSING)
+            if preprocessing_parameters is None:
+                preprocessing_parameters = \
+                    get_feature_preprocessing_parameters(
+                        feature,
+                        global_preprocessing_parameters
+                    )
+            compile_feature = compiled_feature_registry.get(feature[TYPE])
+            if (compile_feature is None or
+                    preprocessing_parameters['missing_value_strategy'] !=
+                    FILL_WITH_CONST):
+                self.unsupported_features.append(feature[NAME])
+                continue
+            self._transforms[feature[NAME]] = compile_feature(
+                feature,
+                metadata,
+                preprocessing_parameters
+            )
+
+        if self.unsupported_features:
+            logger.debug(
+                'Inference preprocessing not supported by features: '
+                '{}'.format(', '.join(self.unsupported_features))
+            )
+
+    @property
+    def supported(self):
+        return not self.unsupported_features
+
+    def preprocess(self, dataset):
+        """Returns a dict of the model inputs of each input feature."""
+        if not self.supported:
+            raise ValueError(
+                'Inference preprocessing not supported by features: '
+                '{}'.format(', '.join(self.unsupported_features))
+            )
+        preprocessed = {}
+        for name, transform in self._transforms.items():
+            if isinstance(dataset, dict):
+                values = list(dataset[name])
+            else:
+                # missing keys are missing values, like in a DataFrame
+                values = [row.get(name) for row in dataset]
+            preprocessed[name] = transform(values)
+        return preprocessed
+
+    def __call__(self, dataset):
+        return Dataset(
+            self.preprocess(dataset),
+            self.input_features,
+            [],
+            None,
+            self.training_set_metadata
+        )
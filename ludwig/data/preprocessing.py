@@ -16,6 +16,7 @@
 # ==============================================================================
 import argparse
 import logging
+from functools import partial
 
 import h5py
 import numpy as np
@@ -24,17 +25,19 @@ import yaml
 
 from ludwig.constants import *
 from ludwig.constants import TEXT
-from ludwig.data.concatenate_datasets import concatenate_csv
 from ludwig.data.concatenate_datasets import concatenate_df
+from ludwig.data.concatenate_datasets import concatenate_files
 from ludwig.data.dataset import Dataset
 from ludwig.features.feature_registries import base_type_registry, \
     input_type_registry
 from ludwig.utils import data_utils
 from ludwig.utils.data_utils import collapse_rare_labels, figure_data_format, \
-    DATA_TRAIN_HDF5_FP, DICT_FORMATS, DATAFRAME_FORMATS, CSV_FORMATS, \
-    HDF5_FORMATS, override_in_memory_flag
+    DATA_TRAIN_HDF5_FP, DICT_FORMATS, DATAFRAME_FORMATS, \
+    HDF5_FORMATS, FILE_FORMATS, override_in_memory_flag
 from ludwig.utils.data_utils import file_exists_with_diff_extension
-from ludwig.utils.data_utils import read_csv
+from ludwig.utils.data_utils import is_native_sequence_column
+from ludwig.utils.data_utils import iter_data_file_chunks
+from ludwig.utils.data_utils import read_data_file
 from ludwig.utils.data_utils import replace_file_extension
 from ludwig.utils.data_utils import split_dataset_ttv
 from ludwig.utils.data_utils import text_feature_data_field
@@ -55,9 +58,15 @@ def build_dataset_csv(
         global_preprocessing_parameters,
         training_set_metadata=None,
         random_seed=default_random_seed,
+        data_format='csv',
         **kwargs
 ):
-    dataset_df = read_csv(dataset_csv)
+    dataset_df = read_dataset_file(
+        dataset_csv,
+        data_format,
+        features,
+        global_preprocessing_parameters
+    )
     dataset_df.csv = dataset_csv
     return build_dataset_df(
         dataset_df,
@@ -69,6 +78,76 @@ def build_dataset_csv(
     )
 
 
+def read_dataset_file(
+        dataset_fp,
+        data_format,
+        features,
+        global_preprocessing_parameters
+):
+    """Reads a raw dataset file, only the columns of the features and the
+    ones used for splitting. CSV columns are parsed with the dtype of their
+    feature type instead of being inferred."""
+    optional_columns = [SPLIT]
+    stratify = global_preprocessing_parameters.get('stratify')
+    if stratify is not None:
+        optional_columns.append(stratify)
+    return read_data_file(
+        dataset_fp,
+        data_format,
+        columns=list(dict.fromkeys(feature[NAME] for feature in features)),
+        optional_columns=optional_columns,
+        dtype=get_column_dtypes(features),
+        csv_engine=global_preprocessing_parameters.get('csv_engine')
+    )
+
+
+def iter_dataset_file_chunks(
+        dataset_fp,
+        data_format,
+        features,
+        global_preprocessing_parameters,
+        chunk_size
+):
+    """Yields a raw dataset file in DataFrames of at most chunk_size rows,
+    reading the same columns and with the same dtypes as read_dataset_file.
+    Each DataFrame has the path of the file as csv attribute."""
+    optional_columns = [SPLIT]
+    stratify = global_preprocessing_parameters.get('stratify')
+    if stratify is not None:
+        optional_columns.append(stratify)
+    for chunk in iter_data_file_chunks(
+            dataset_fp,
+            data_format,
+            chunk_size,
+            columns=list(dict.fromkeys(feature[NAME] for feature in features)),
+            optional_columns=optional_columns,
+            dtype=get_column_dtypes(features),
+            csv_engine=global_preprocessing_parameters.get('csv_engine')
+    ):
+        chunk.csv = dataset_fp
+        yield chunk
+
+
+def get_column_dtypes(features):
+    """Returns the column_dtype of the feature type of each column, for the
+    columns whose features agree on a dtype."""
+    column_dtypes = {}
+    inferred_columns = set()
+    for feature in features:
+        column_dtype = get_from_registry(
+            feature[TYPE],
+            base_type_registry
+        ).column_dtype
+        if column_dtype is None:
+            inferred_columns.add(feature[NAME])
+        elif column_dtypes.setdefault(feature[NAME],
+                                      column_dtype) != column_dtype:
+            inferred_columns.add(feature[NAME])
+    return {column: column_dtype
+            for column, column_dtype in column_dtypes.items()
+            if column not in inferred_columns}
+
+
 def build_dataset_df(
         dataset_df,
         features,
@@ -82,6 +161,8 @@ def build_dataset_df(
         global_preprocessing_parameters
     )
 
+    join_native_sequences(dataset_df, features)
+
     if metadata is None:
         metadata = build_metadata(
             dataset_df,
@@ -109,33 +190,30 @@ def build_dataset_df(
     return dataset, metadata
 
 
-def build_metadata(dataset_df, features, global_preprocessing_parameters):
-    metadata = {}
+def join_native_sequences(dataset_df, features):
+    """
+    Converts the columns of lists, like the ones read from Parquet files, of
+    the feature types that tokenize strings into space separated strings.
+    Feature types parsing lists directly, like vectors and timeseries, keep
+    the lists.
+    """
     for feature in features:
-        if PREPROCESSING in feature:
-            preprocessing_parameters = merge_dict(
-                global_preprocessing_parameters[feature[TYPE]],
-                feature[PREPROCESSING]
+        feature_mixin = get_from_registry(feature[TYPE], base_type_registry)
+        column = dataset_df[feature[NAME]]
+        if (feature_mixin.tokenizes_strings and
+                is_native_sequence_column(column)):
+            dataset_df[feature[NAME]] = column.map(
+                lambda values: ' '.join(str(value) for value in values)
             )
-        else:
-            preprocessing_parameters = global_preprocessing_parameters[
-                feature[TYPE]
-            ]
 
-        # deal with encoders that have fixed preprocessing
-        if 'encoder' in feature:
-            encoders_registry = get_from_registry(
-                feature[TYPE],
-                input_type_registry
-            ).encoder_registry
-            encoder_class = encoders_registry[feature['encoder']]
-            if hasattr(encoder_class, 'fixed_preprocessing_parameters'):
-                encoder_fpp = encoder_class.fixed_preprocessing_parameters
-
-                preprocessing_parameters = merge_dict(
-                    preprocessing_parameters,
-                    resolve_pointers(encoder_fpp, feature, 'feature.')
-                )
+
+def build_metadata(dataset_df, features, global_preprocessing_parameters):
+    metadata = {}
+    for feature in features:
+        preprocessing_parameters = get_feature_preprocessing_parameters(
+            feature,
+            global_preprocessing_parameters
+        )
 
         handle_missing_values(
             dataset_df,
@@ -143,17 +221,71 @@ def build_metadata(dataset_df, features, global_preprocessing_parameters):
             preprocessing_parameters
         )
 
-        get_feature_meta = get_from_registry(
+        feature_mixin = get_from_registry(
             feature[TYPE],
             base_type_registry
-        ).get_feature_meta
-        metadata[feature[NAME]] = get_feature_meta(
-            dataset_df[feature[NAME]].astype(str),
+        )
+        metadata[feature[NAME]] = feature_mixin.get_feature_meta(
+            cast_column(
+                dataset_df[feature[NAME]],
+                feature_mixin.column_dtype
+            ),
             preprocessing_parameters
         )
     return metadata
 
 
+def get_feature_preprocessing_parameters(
+        feature,
+        global_preprocessing_parameters
+):
+    """Returns the preprocessing parameters of the type of the feature
+    overridden by the ones of the feature and by the ones its encoder
+    requires."""
+    if PREPROCESSING in feature:
+        preprocessing_parameters = merge_dict(
+            global_preprocessing_parameters[feature[TYPE]],
+            feature[PREPROCESSING]
+        )
+    else:
+        preprocessing_parameters = global_preprocessing_parameters[
+            feature[TYPE]
+        ]
+
+    # deal with encoders that have fixed preprocessing
+    if 'encoder' in feature:
+        encoders_registry = get_from_registry(
+            feature[TYPE],
+            input_type_registry
+        ).encoder_registry
+        encoder_class = encoders_registry[feature['encoder']]
+        if hasattr(encoder_class, 'fixed_preprocessing_parameters'):
+            encoder_fpp = encoder_class.fixed_preprocessing_parameters
+
+            preprocessing_parameters = merge_dict(
+                preprocessing_parameters,
+                resolve_pointers(encoder_fpp, feature, 'feature.')
+            )
+    return preprocessing_parameters
+
+
+def cast_column(column, dtype):
+    """Converts the column to the dtype a feature type needs for computing
+    its metadata, without copying it when it already has that dtype.
+    A dtype of None means the column is used as it is.
+    """
+    if dtype is None:
+        return column
+    if dtype is str:
+        if (column.dtype == object and
+                pd.api.types.infer_dtype(column, skipna=False) == 'string'):
+            return column
+        return column.astype(str)
+    if column.dtype == dtype:
+        return column
+    return column.astype(dtype)
+
+
 def build_data(
         dataset_df,
         features,
@@ -162,31 +294,10 @@ def build_data(
 ):
     dataset = {}
     for feature in features:
-        if PREPROCESSING in feature:
-            preprocessing_parameters = merge_dict(
-                global_preprocessing_parameters[feature[TYPE]],
-                feature[PREPROCESSING]
-            )
-        else:
-            preprocessing_parameters = global_preprocessing_parameters[
-                feature[TYPE]
-            ]
-
-        # deal with encoders that have fixed preprocessing
-        if 'encoder' in feature:
-            encoders_registry = get_from_registry(
-                feature[TYPE],
-                input_type_registry
-            ).encoder_registry
-
-            encoder_class = encoders_registry[feature['encoder']]
-            if hasattr(encoder_class, 'fixed_preprocessing_parameters'):
-                encoder_fpp = encoder_class.fixed_preprocessing_parameters
-
-                preprocessing_parameters = merge_dict(
-                    preprocessing_parameters,
-                    resolve_pointers(encoder_fpp, feature, 'feature.')
-                )
+        preprocessing_parameters = get_feature_preprocessing_parameters(
+            feature,
+            global_preprocessing_parameters
+        )
 
         handle_missing_values(
             dataset_df,
@@ -363,7 +474,7 @@ def preprocess_for_training(
     # in case data_format is csv,
     # check if there's a cached hdf5 file with hte same name,
     # and in case move on with the hdf5 branch
-    if data_format in CSV_FORMATS:
+    if data_format in FILE_FORMATS:
         if dataset:
             if (file_exists_with_diff_extension(dataset, 'hdf5') and
                     file_exists_with_diff_extension(dataset, 'json')):
@@ -424,7 +535,7 @@ def preprocess_for_training(
             random_seed=random_seed
         )
 
-    elif data_format in CSV_FORMATS:
+    elif data_format in FILE_FORMATS:
         (
             training_set,
             test_set,
@@ -439,7 +550,8 @@ def preprocess_for_training(
             training_set_metadata=training_set_metadata,
             skip_save_processed_input=skip_save_processed_input,
             preprocessing_params=preprocessing_params,
-            random_seed=random_seed
+            random_seed=random_seed,
+            data_format=data_format
         )
 
     elif data_format in HDF5_FORMATS:
@@ -543,7 +655,8 @@ def preprocess_for_training(
         training_set,
         model_definition['input_features'],
         model_definition['output_features'],
-        training_set_metadata.get(DATA_TRAIN_HDF5_FP)
+        training_set_metadata.get(DATA_TRAIN_HDF5_FP),
+        training_set_metadata
     )
 
     validation_dataset = None
@@ -552,7 +665,8 @@ def preprocess_for_training(
             validation_set,
             model_definition['input_features'],
             model_definition['output_features'],
-            training_set_metadata.get(DATA_TRAIN_HDF5_FP)
+            training_set_metadata.get(DATA_TRAIN_HDF5_FP),
+            training_set_metadata
         )
 
     test_dataset = None
@@ -561,7 +675,8 @@ def preprocess_for_training(
             test_set,
             model_definition['input_features'],
             model_definition['output_features'],
-            training_set_metadata.get(DATA_TRAIN_HDF5_FP)
+            training_set_metadata.get(DATA_TRAIN_HDF5_FP),
+            training_set_metadata
         )
 
     return (
@@ -581,7 +696,8 @@ def _preprocess_csv_for_training(
         training_set_metadata=None,
         skip_save_processed_input=False,
         preprocessing_params=default_preprocessing_parameters,
-        random_seed=default_random_seed
+        random_seed=default_random_seed,
+        data_format='csv'
 ):
     """
     Method to pre-process csv data
@@ -595,6 +711,7 @@ def _preprocess_csv_for_training(
     as .hdf5 files in the same location as the csvs with the same names.
     :param preprocessing_params: preprocessing parameters
     :param random_seed: random seed
+    :param data_format: format of the files, one of the FILE_FORMATS
     :return: training, test, validation datasets, training metadata
     """
     if dataset:
@@ -611,7 +728,8 @@ def _preprocess_csv_for_training(
             features,
             preprocessing_params,
             training_set_metadata=training_set_metadata,
-            random_seed=random_seed
+            random_seed=random_seed,
+            data_format=data_format
         )
 
         if is_on_master() and not skip_save_processed_input:
@@ -639,10 +757,16 @@ def _preprocess_csv_for_training(
         )
         logger.info('Building dataset (it may take a while)')
 
-        concatenated_df = concatenate_csv(
+        concatenated_df = concatenate_files(
             training_set,
             validation_set,
-            test_set
+            test_set,
+            partial(
+                read_dataset_file,
+                data_format=data_format,
+                features=features,
+                global_preprocessing_parameters=preprocessing_params
+            )
         )
         concatenated_df.csv = training_set
 
@@ -812,7 +936,7 @@ def preprocess_for_prediction(
     # in case data_format is csv,
     # check if there's a cached hdf5 file with hte same name,
     # and in case move on with the hdf5 branch
-    if data_format in CSV_FORMATS:
+    if data_format in FILE_FORMATS:
         if (file_exists_with_diff_extension(dataset, 'hdf5') and
                 file_exists_with_diff_extension(dataset, 'json')):
             logger.info(
@@ -831,12 +955,13 @@ def preprocess_for_prediction(
             metadata=training_set_metadata
         )
 
-    elif data_format in CSV_FORMATS:
+    elif data_format in FILE_FORMATS:
         dataset, training_set_metadata = build_dataset_csv(
             dataset,
             features,
             preprocessing_params,
-            training_set_metadata=training_set_metadata
+            training_set_metadata=training_set_metadata,
+            data_format=data_format
         )
 
     elif data_format in HDF5_FORMATS:
@@ -868,7 +993,8 @@ def preprocess_for_prediction(
         dataset,
         model_definition['input_features'],
         output_features,
-        hdf5_fp
+        hdf5_fp,
+        training_set_metadata
     )
 
     return dataset, training_set_metadata
@@ -90,7 +90,7 @@ def cli(sys_argv):
         '--data_format',
         help='format of the input data',
         default='auto',
-        choices=['auto', 'csv', 'hdf5']
+        choices=['auto', 'csv', 'hdf5', 'parquet', 'feather']
     )
 
     # ----------------
@@ -17,14 +17,19 @@
 import logging
 import os
 import sys
+from functools import partial
+from multiprocessing import Pool
 
+import h5py
 import numpy as np
 import tensorflow as tf
+from tqdm import tqdm
 
 from ludwig.constants import AUDIO, BACKFILL, TIED, TYPE, NAME
 from ludwig.encoders.sequence_encoders import StackedCNN, ParallelCNN, \
     StackedParallelCNN, StackedRNN, SequencePassthroughEncoder, StackedCNNRNN
 from ludwig.features.sequence_feature import SequenceInputFeature
+from ludwig.globals import is_progressbar_disabled
 from ludwig.utils.audio_utils import calculate_incr_mean
 from ludwig.utils.audio_utils import calculate_incr_var
 from ludwig.utils.audio_utils import get_fbank
@@ -34,20 +39,29 @@ from ludwig.utils.audio_utils import get_max_length_stft_based
 from ludwig.utils.audio_utils import get_non_symmetric_length
 from ludwig.utils.audio_utils import get_phase_stft_magnitude
 from ludwig.utils.audio_utils import get_stft_magnitude
+from ludwig.utils.audio_utils import merge_incr_stats
+from ludwig.utils.data_utils import file_or_path
 from ludwig.utils.data_utils import get_abs_path
+from ludwig.utils.data_utils import replace_file_extension
 from ludwig.utils.misc_utils import set_default_value
 from ludwig.utils.misc_utils import set_default_values
 
 logger = logging.getLogger(__name__)
 
+# number of bytes of audio features extracted before being stored at once
+AUDIO_WRITE_BLOCK_BYTES = 64 * 1024 * 1024
+
 
 class AudioFeatureMixin(object):
     type = AUDIO
+    column_dtype = None
+    tokenizes_strings = False
 
     preprocessing_defaults = {
         'audio_file_length_limit_in_s': 7.5,
         'missing_value_strategy': BACKFILL,
         'in_memory': True,
+        'num_processes': 1,
         'padding_value': 0,
         'norm': None,
         'audio_feature': {
@@ -69,7 +83,9 @@ class AudioFeatureMixin(object):
 
         audio_feature_dict = preprocessing_parameters['audio_feature']
         first_audio_file_path = column[0]
-        _, sampling_rate_in_hz = soundfile.read(first_audio_file_path)
+        _, sampling_rate_in_hz = soundfile.read(
+            file_or_path(first_audio_file_path)
+        )
 
         feature_dim = AudioFeatureMixin._get_feature_dim(audio_feature_dict,
                                                          sampling_rate_in_hz)
@@ -127,7 +143,7 @@ class AudioFeatureMixin(object):
             sys.exit(-1)
 
         feature_type = audio_feature_dict[TYPE]
-        audio, sampling_rate_in_hz = soundfile.read(filepath)
+        audio, sampling_rate_in_hz = soundfile.read(file_or_path(filepath))
         AudioFeatureMixin._update(audio_stats, audio, sampling_rate_in_hz)
 
         if feature_type == 'raw':
@@ -175,6 +191,129 @@ class AudioFeatureMixin(object):
         if audio_length_in_s > audio_stats['max_length_in_s']:
             audio_stats['cropped'] += 1
 
+    @staticmethod
+    def _new_audio_stats(audio_file_length_limit_in_s):
+        return {
+            'count': 0,
+            'mean': 0,
+            'var': 0,
+            'std': 0,
+            'max': 0,
+            'min': float('inf'),
+            'cropped': 0,
+            'max_length_in_s': audio_file_length_limit_in_s
+        }
+
+    @staticmethod
+    def _merge_audio_stats(audio_stats, other_audio_stats):
+        """
+        Adds to audio_stats the statistics of other_audio_stats, computed on
+        a different set of files, e.g. by another worker.
+        """
+        (
+            audio_stats['count'],
+            audio_stats['mean'],
+            audio_stats['var']
+        ) = merge_incr_stats(
+            audio_stats['count'], audio_stats['mean'], audio_stats['var'],
+            other_audio_stats['count'], other_audio_stats['mean'],
+            other_audio_stats['var']
+        )
+        audio_stats['max'] = max(audio_stats['max'], other_audio_stats['max'])
+        audio_stats['min'] = min(audio_stats['min'], other_audio_stats['min'])
+        audio_stats['cropped'] += other_audio_stats['cropped']
+
+    @staticmethod
+    def _read_audio_files(
+            filepaths,
+            audio_feature_dict,
+            feature_dim,
+            max_length,
+            padding_value,
+            normalization_type,
+            audio_file_length_limit_in_s
+    ):
+        """
+        Extracts the features of a list of audio files, returning them in a
+        (len(filepaths), max_length, feature_dim) array together with the
+        statistics of their lengths, to be merged with the other lists.
+        """
+        audio_stats = AudioFeatureMixin._new_audio_stats(
+            audio_file_length_limit_in_s
+        )
+        audio_features = np.empty(
+            (len(filepaths), max_length, feature_dim),
+            dtype=np.float32
+        )
+        for i, filepath in enumerate(filepaths):
+            audio_features[i] = (
+                AudioFeatureMixin._read_audio_and_transform_to_feature(
+                    filepath, audio_feature_dict, feature_dim, max_length,
+                    padding_value, normalization_type, audio_stats
+                )
+            )
+        return audio_features, audio_stats
+
+    @staticmethod
+    def _write_audio_features(
+            audio_features,
+            read_audio_files,
+            all_file_paths,
+            audio_stats,
+            pool=None,
+            num_processes=1
+    ):
+        """
+        Fills audio_features, a numpy array or an HDF5 dataset, with the
+        features of the files in all_file_paths and merges the statistics of
+        their lengths into audio_stats.
+
+        Files are processed in blocks of about AUDIO_WRITE_BLOCK_BYTES, each
+        split across the pool workers. The next block is extracted while the
+        current one is stored, so at most two blocks are in memory at once.
+        """
+        num_audio_files, max_length, feature_dim = audio_features.shape
+        block_size = max(
+            1, AUDIO_WRITE_BLOCK_BYTES // (max_length * feature_dim * 4)
+        )
+        if getattr(audio_features, 'chunks', None) is not None:
+            chunk_rows = audio_features.chunks[0]
+            block_size = max(1, block_size // chunk_rows) * chunk_rows
+
+        def read_block(start):
+            block_paths = all_file_paths[start:start + block_size]
+            if pool is None:
+                return [read_audio_files(block_paths)]
+            worker_size = -(-len(block_paths) // num_processes)
+            return pool.map_async(
+                read_audio_files,
+                [block_paths[i:i + worker_size]
+                 for i in range(0, len(block_paths), worker_size)]
+            )
+
+        progress_bar = tqdm(
+            desc='Audio',
+            total=num_audio_files,
+            file=sys.stdout,
+            disable=is_progressbar_disabled()
+        )
+        pending = read_block(0)
+        for start in range(0, num_audio_files, block_size):
+            end = min(start + block_size, num_audio_files)
+            results = pending if pool is None else pending.get()
+            if end < num_audio_files:
+                # submit the next block before storing this one
+                pending = read_block(end)
+            position = start
+            for block_features, block_stats in results:
+                audio_features[
+                    position:position + len(block_features)
+                ] = block_features
+                position += len(block_features)
+                AudioFeatureMixin._merge_audio_stats(audio_stats, block_stats)
+            progress_bar.update(end - start)
+        progress_bar.close()
+
     @staticmethod
     def _get_2D_feature(audio, feature_type, audio_feature_dict,
                         sampling_rate_in_hz):
@@ -231,6 +370,11 @@ class AudioFeatureMixin(object):
             'in_memory',
             preprocessing_parameters['in_memory']
         )
+        set_default_value(
+            feature['preprocessing'],
+            'num_processes',
+            preprocessing_parameters['num_processes']
+        )
 
         if not 'audio_feature' in preprocessing_parameters:
             raise ValueError(
@@ -248,7 +392,8 @@ class AudioFeatureMixin(object):
             break
         if hasattr(dataset_df, 'csv'):
             csv_path = os.path.dirname(os.path.abspath(dataset_df.csv))
-        if csv_path is None and not os.path.isabs(first_path):
+        if (csv_path is None and not isinstance(first_path, bytes) and
+                not os.path.isabs(first_path)):
             raise ValueError(
                 'Audio file paths must be absolute'
             )
@@ -267,51 +412,77 @@ class AudioFeatureMixin(object):
         if num_audio_utterances == 0:
             raise ValueError(
                 'There are no audio files in the dataset provided.')
-        audio_stats = {
-            'count': 0,
-            'mean': 0,
-            'var': 0,
-            'std': 0,
-            'max': 0,
-            'min': float('inf'),
-            'cropped': 0,
-            'max_length_in_s': audio_file_length_limit_in_s
-        }
+        audio_stats = AudioFeatureMixin._new_audio_stats(
+            audio_file_length_limit_in_s
+        )
 
-        if feature['preprocessing']['in_memory']:
-            dataset[feature[NAME]] = np.empty(
-                (num_audio_utterances, max_length, feature_dim),
-                dtype=np.float32
-            )
-            for i, path in enumerate(dataset_df[feature[NAME]]):
-                filepath = get_abs_path(
-                    csv_path,
-                    path
-                )
-                audio_feature = AudioFeatureMixin._read_audio_and_transform_to_feature(
-                    filepath, audio_feature_dict, feature_dim, max_length,
-                    padding_value, normalization_type, audio_stats
+        num_processes = feature['preprocessing']['num_processes']
+        all_file_paths = [get_abs_path(csv_path, path)
+                          for path in dataset_df[feature[NAME]]]
+        read_audio_files = partial(
+            AudioFeatureMixin._read_audio_files,
+            audio_feature_dict=audio_feature_dict,
+            feature_dim=feature_dim,
+            max_length=max_length,
+            padding_value=padding_value,
+            normalization_type=normalization_type,
+            audio_file_length_limit_in_s=audio_file_length_limit_in_s
+        )
+        shape = (num_audio_utterances, max_length, feature_dim)
+
+        def write_audio_features(audio_features):
+            if num_processes > 1:
+                with Pool(num_processes) as pool:
+                    logger.debug(
+                        'Using {} processes for preprocessing '
+                        'audio'.format(num_processes)
+                    )
+                    AudioFeatureMixin._write_audio_features(
+                        audio_features, read_audio_files, all_file_paths,
+                        audio_stats, pool, num_processes
+                    )
+            else:
+                AudioFeatureMixin._write_audio_features(
+                    audio_features, read_audio_files, all_file_paths,
+                    audio_stats
                 )
 
-                dataset[feature[NAME]][i, :, :] = audio_feature
-
-            audio_stats['std'] = np.sqrt(
-                audio_stats['var'] / float(audio_stats['count']))
-            print_statistics = (
-                "{} audio files loaded.\n"
-                "Statistics of audio file lengths:\n"
-                "- mean: {:.4f}\n"
-                "- std: {:.4f}\n"
-                "- max: {:.4f}\n"
-                "- min: {:.4f}\n"
-                "- cropped audio_files: {}\n"
-                "Max length was given as {}s"
-            ).format(
-                audio_stats['count'], audio_stats['mean'],
-                audio_stats['std'], audio_stats['max'],
-                audio_stats['min'], audio_stats['cropped'],
-                audio_stats['max_length_in_s'])
-            logger.debug(print_statistics)
+        if feature['preprocessing']['in_memory']:
+            dataset[feature[NAME]] = np.empty(shape, dtype=np.float32)
+            write_audio_features(dataset[feature[NAME]])
+        else:
+            data_fp = replace_file_extension(dataset_df.csv, 'hdf5')
+            mode = 'w'
+            if os.path.isfile(data_fp):
+                mode = 'r+'
+
+            with h5py.File(data_fp, mode) as h5_file:
+                write_audio_features(h5_file.create_dataset(
+                    feature[NAME] + '_data',
+                    shape,
+                    dtype=np.float32
+                ))
+                h5_file.flush()
+
+            dataset[feature[NAME]] = np.arange(num_audio_utterances)
+
+        audio_stats['std'] = np.sqrt(
+            audio_stats['var'] / float(audio_stats['count']))
+        print_statistics = (
+            "{} audio files loaded.\n"
+            "Statistics of audio file lengths:\n"
+            "- mean: {:.4f}\n"
+            "- std: {:.4f}\n"
+            "- max: {:.4f}\n"
+            "- min: {:.4f}\n"
+            "- cropped audio_files: {}\n"
+            "Max length was given as {}s"
+        ).format(
+            audio_stats['count'], audio_stats['mean'],
+            audio_stats['std'], audio_stats['max'],
+            audio_stats['min'], audio_stats['cropped'],
+            audio_stats['max_length_in_s'])
+        logger.debug(print_statistics)
 
     @staticmethod
     def _get_max_length_feature(
@@ -32,6 +32,8 @@ logger = logging.getLogger(__name__)
 
 class BagFeatureMixin(object):
     type = BAG
+    column_dtype = str
+    tokenizes_strings = True
 
     preprocessing_defaults = {
         'tokenizer': 'space',
@@ -18,6 +18,7 @@ import logging
 import os
 
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 from tensorflow.keras.metrics import Accuracy as BinaryAccuracy
 
@@ -44,6 +45,8 @@ logger = logging.getLogger(__name__)
 
 class BinaryFeatureMixin(object):
     type = BINARY
+    column_dtype = None
+    tokenizes_strings = False
     preprocessing_defaults = {
         'missing_value_strategy': FILL_WITH_CONST,
         'fill_value': 0
@@ -63,8 +66,16 @@ class BinaryFeatureMixin(object):
     ):
         column = dataset_df[feature[NAME]]
         if column.dtype == object:
-            column = column.map(str2bool)
-        dataset[feature[NAME]] = column.astype(np.bool_).values
+            # convert only the distinct values, missing values (code -1)
+            # map to the last element, False, like str2bool('nan')
+            codes, uniques = pd.factorize(column)
+            lookup = np.array(
+                [str2bool(value) for value in uniques] + [False],
+                dtype=np.bool_
+            )
+            dataset[feature[NAME]] = lookup[codes]
+        else:
+            dataset[feature[NAME]] = column.astype(np.bool_).values
 
 
 class BinaryInputFeature(BinaryFeatureMixin, InputFeature):
@@ -285,7 +296,7 @@ class BinaryOutputFeature(BinaryFeatureMixin, OutputFeature):
             skip_save_unprocessed_output = True
 
         if PREDICTIONS in result and len(result[PREDICTIONS]) > 0:
-            postprocessed[PREDICTIONS] = result[PREDICTIONS].numpy()
+            postprocessed[PREDICTIONS] = np.asarray(result[PREDICTIONS])
             if not skip_save_unprocessed_output:
                 np.save(
                     npy_filename.format(name, PREDICTIONS),
@@ -294,7 +305,7 @@ class BinaryOutputFeature(BinaryFeatureMixin, OutputFeature):
             del result[PREDICTIONS]
 
         if PROBABILITIES in result and len(result[PROBABILITIES]) > 0:
-            postprocessed[PROBABILITIES] = result[PROBABILITIES].numpy()
+            postprocessed[PROBABILITIES] = np.asarray(result[PROBABILITIES])
             if not skip_save_unprocessed_output:
                 np.save(
                     npy_filename.format(name, PROBABILITIES),
@@ -39,13 +39,16 @@ from ludwig.utils.metrics_utils import ConfusionMatrix
 from ludwig.utils.misc_utils import set_default_value
 from ludwig.utils.misc_utils import set_default_values
 from ludwig.utils.strings_utils import UNKNOWN_SYMBOL
-from ludwig.utils.strings_utils import create_vocabulary
+from ludwig.utils.strings_utils import create_stripped_vocabulary
+from ludwig.utils.strings_utils import map_stripped_to_idx
 
 logger = logging.getLogger(__name__)
 
 
 class CategoryFeatureMixin(object):
     type = CATEGORY
+    column_dtype = None
+    tokenizes_strings = False
     preprocessing_defaults = {
         'most_common': 10000,
         'lowercase': False,
@@ -55,8 +58,8 @@ class CategoryFeatureMixin(object):
 
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters):
-        idx2str, str2idx, str2freq, _, _, _, _ = create_vocabulary(
-            column, 'stripped',
+        idx2str, str2idx, str2freq = create_stripped_vocabulary(
+            column,
             num_most_frequent=preprocessing_parameters['most_common'],
             lowercase=preprocessing_parameters['lowercase'],
             add_padding=False
@@ -70,15 +73,10 @@ class CategoryFeatureMixin(object):
 
     @staticmethod
     def feature_data(column, metadata):
-        return np.array(
-            column.map(
-                lambda x: (
-                    metadata['str2idx'][x.strip()]
-                    if x.strip() in metadata['str2idx']
-                    else metadata['str2idx'][UNKNOWN_SYMBOL]
-                )
-            ),
-            dtype=int_type(metadata['vocab_size'])
+        return map_stripped_to_idx(
+            column,
+            metadata['str2idx'],
+            int_type(metadata['vocab_size'])
         )
 
     @staticmethod
@@ -89,8 +87,10 @@ class CategoryFeatureMixin(object):
             metadata,
             preprocessing_parameters=None
     ):
+        # no astype(str): integer coded categories are factorized as they
+        # are and only their distinct values are converted to strings
         dataset[feature[NAME]] = CategoryFeatureMixin.feature_data(
-            dataset_df[feature[NAME]].astype(str),
+            dataset_df[feature[NAME]],
             metadata[feature[NAME]]
         )
 
@@ -419,7 +419,7 @@ class CategoryOutputFeature(CategoryFeatureMixin, OutputFeature):
 
         if PROBABILITIES in predictions and len(
                 predictions[PROBABILITIES]) > 0:
-            probs = predictions[PROBABILITIES].numpy()
+            probs = np.asarray(predictions[PROBABILITIES])
             prob = np.amax(probs, axis=1)
             postprocessed[PROBABILITIES] = probs
             postprocessed[PROBABILITY] = prob
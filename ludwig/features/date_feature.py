@@ -19,6 +19,7 @@ from datetime import date
 from datetime import datetime
 
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 from dateutil.parser import parse
 
@@ -31,9 +32,22 @@ logger = logging.getLogger(__name__)
 
 DATE_VECTOR_LENGTH = 9
 
+# pandas >= 2 infers the format from the first value by default and
+# deprecates infer_datetime_format
+_INFER_DATETIME_FORMAT = (
+    {} if int(pd.__version__.split('.')[0]) >= 2
+    else {'infer_datetime_format': True}
+)
+
+# pd.to_datetime takes numbers for epoch nanoseconds,
+# date_to_list parses only strings
+_DATETIME_INFERRED_DTYPES = {'string', 'datetime', 'datetime64', 'date'}
+
 
 class DateFeatureMixin(object):
     type = DATE
+    column_dtype = None
+    tokenizes_strings = False
     preprocessing_defaults = {
         'missing_value_strategy': FILL_WITH_CONST,
         'fill_value': '',
@@ -92,6 +106,54 @@ class DateFeatureMixin(object):
             second_of_day
         ]
 
+    @staticmethod
+    def dates_to_matrix(column, datetime_format, preprocessing_parameters):
+        """Parses the whole column at once with pd.to_datetime and extracts
+        the date components as NumPy columns. Rows that pd.to_datetime can't
+        parse go through date_to_list, that uses dateutil and the fill value.
+        Columns of other values than strings and dates, e.g. numbers, all
+        go through date_to_list.
+        """
+        matrix = np.empty((len(column), DATE_VECTOR_LENGTH), dtype=np.int16)
+        if (pd.api.types.infer_dtype(column, skipna=True) not in
+                _DATETIME_INFERRED_DTYPES):
+            datetimes = None
+        elif datetime_format is not None:
+            datetimes = pd.to_datetime(
+                column, format=datetime_format, errors='coerce'
+            )
+        else:
+            datetimes = pd.to_datetime(
+                column, errors='coerce', **_INFER_DATETIME_FORMAT
+            )
+
+        if (datetimes is None or
+                not pd.api.types.is_datetime64_any_dtype(datetimes)):
+            # e.g. mixed timezones, pandas returns objects
+            unparsed = np.ones(len(column), dtype=np.bool_)
+        else:
+            unparsed = datetimes.isna().values
+            dt = datetimes.dt
+            hour = dt.hour.values
+            minute = dt.minute.values
+            second = dt.second.values
+            # assignments wrap around int16 like np.array(..., dtype=int16)
+            matrix[:, 0] = dt.year.values
+            matrix[:, 1] = dt.month.values
+            matrix[:, 2] = dt.day.values
+            matrix[:, 3] = dt.weekday.values
+            matrix[:, 4] = dt.dayofyear.values
+            matrix[:, 5] = hour
+            matrix[:, 6] = minute
+            matrix[:, 7] = second
+            matrix[:, 8] = hour * 3600 + minute * 60 + second
+
+        for i in np.flatnonzero(unparsed):
+            matrix[i] = np.array(DateFeatureMixin.date_to_list(
+                column.iloc[i], datetime_format, preprocessing_parameters
+            ))
+        return matrix
+
     @staticmethod
     def add_feature_data(
             feature,
@@ -100,14 +162,11 @@ class DateFeatureMixin(object):
             metadata,
             preprocessing_parameters=None
     ):
-        datetime_format = preprocessing_parameters['datetime_format']
-        dates_to_lists = [
-            np.array(DateFeatureMixin.date_to_list(
-                row, datetime_format, preprocessing_parameters
-            ))
-            for row in dataset_df[feature[NAME]]
-        ]
-        dataset[feature[NAME]] = np.array(dates_to_lists, dtype=np.int16)
+        dataset[feature[NAME]] = DateFeatureMixin.dates_to_matrix(
+            dataset_df[feature[NAME]],
+            preprocessing_parameters['datetime_format'],
+            preprocessing_parameters
+        )
 
 
 class DateInputFeature(DateFeatureMixin, InputFeature):
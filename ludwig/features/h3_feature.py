@@ -16,13 +16,13 @@
 # ==============================================================================
 import logging
 
-import numpy as np
 import tensorflow as tf
 
 from ludwig.constants import *
 from ludwig.encoders.h3_encoders import H3Embed, H3WeightedSum, H3RNN
 from ludwig.features.base_feature import InputFeature
 from ludwig.utils.h3_util import h3_to_components
+from ludwig.utils.h3_util import h3_to_components_matrix
 from ludwig.utils.misc_utils import set_default_value
 
 logger = logging.getLogger(__name__)
@@ -34,6 +34,8 @@ H3_PADDING_VALUE = 7
 
 class H3FeatureMixin(object):
     type = H3
+    column_dtype = None
+    tokenizes_strings = False
     preprocessing_defaults = {
         'missing_value_strategy': FILL_WITH_CONST,
         'fill_value': 576495936675512319
@@ -69,8 +71,11 @@ class H3FeatureMixin(object):
         column = dataset_df[feature[NAME]]
         if column.dtype == object:
             column = column.map(int)
-        column = column.map(H3FeatureMixin.h3_to_list)
-        dataset[feature[NAME]] = np.array(column.tolist(), dtype=np.uint8)
+        dataset[feature[NAME]] = h3_to_components_matrix(
+            column.values,
+            max_resolution=MAX_H3_RESOLUTION,
+            padding_value=H3_PADDING_VALUE
+        )
 
 
 class H3InputFeature(H3FeatureMixin, InputFeature):
@@ -17,31 +17,55 @@
 import logging
 import os
 import sys
+import weakref
 from functools import partial
 from multiprocessing import Pool
 
 import h5py
 import numpy as np
 import tensorflow as tf
+from tqdm import tqdm
 
 from ludwig.constants import *
 from ludwig.encoders.image_encoders import Stacked2DCNN, ResNetEncoder
 from ludwig.features.base_feature import InputFeature
+from ludwig.globals import is_progressbar_disabled
 from ludwig.utils.data_utils import get_abs_path
+from ludwig.utils.data_utils import replace_file_extension
+from ludwig.utils.image_utils import CachedImageReader
+from ludwig.utils.image_utils import DiskImageCache
+from ludwig.utils.image_utils import ImageLoader
 from ludwig.utils.image_utils import greyscale
 from ludwig.utils.image_utils import num_channels_in_image
+from ludwig.utils.image_utils import read_image
 from ludwig.utils.image_utils import resize_image
 from ludwig.utils.misc_utils import set_default_value
 
 logger = logging.getLogger(__name__)
 
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:
+    # python < 3.8
+    SharedMemory = None
+
+# number of bytes of decoded images written to HDF5 at once
+IMAGE_WRITE_BLOCK_BYTES = 64 * 1024 * 1024
+
 
 class ImageFeatureMixin(object):
     type = IMAGE
+    column_dtype = None
+    tokenizes_strings = False
     preprocessing_defaults = {
         'missing_value_strategy': BACKFILL,
         'in_memory': True,
+        'lazy_load': False,
+        'lazy_load_cache_size': 0,
         'resize_method': 'interpolate',
+        'image_backend': None,
+        'image_cache_dir': None,
+        'image_cache_size_mb': 10240,
         'scaling': 'pixel_normalization',
         'num_processes': 1
     }
@@ -60,7 +84,8 @@ class ImageFeatureMixin(object):
             should_resize,
             num_channels,
             resize_method,
-            user_specified_num_channels
+            user_specified_num_channels,
+            backend=None
     ):
         """
         :param filepath: path to the image
@@ -70,6 +95,7 @@ class ImageFeatureMixin(object):
         :param resize_method: type of resizing method
         :param num_channels: expected number of channels in the first image
         :param user_specified_num_channels: did the user specify num channels?
+        :param backend: library used to decode and resize the image
         :return: image object
 
         Helper method to read and resize an image according to model defn.
@@ -81,23 +107,21 @@ class ImageFeatureMixin(object):
         If the user specifies a number of channels, we try to convert all the
         images to the specifications by dropping channels/padding 0 channels
         """
-        try:
-            from skimage.io import imread
-        except ImportError:
-            logger.error(
-                ' scikit-image is not installed. '
-                'In order to install all image feature dependencies run '
-                'pip install ludwig[image]'
-            )
-            sys.exit(-1)
+        # only interpolation can start from a reduced resolution decoding,
+        # cropping and padding need the original pixels
+        min_size = None
+        if should_resize and resize_method == INTERPOLATE:
+            min_size = (img_height, img_width)
 
-        img = imread(filepath)
+        img = read_image(filepath, backend=backend, min_size=min_size)
         img_num_channels = num_channels_in_image(img)
         if img_num_channels == 1:
             img = img.reshape((img.shape[0], img.shape[1], 1))
 
         if should_resize:
-            img = resize_image(img, (img_height, img_width), resize_method)
+            img = resize_image(
+                img, (img_height, img_width), resize_method, backend=backend
+            )
 
         if user_specified_num_channels is True:
 
@@ -160,17 +184,10 @@ class ImageFeatureMixin(object):
         the same number of channels
         """
         # Read the first image in the dataset
-        try:
-            from skimage.io import imread
-        except ImportError:
-            logger.error(
-                ' scikit-image is not installed. '
-                'In order to install all image feature dependencies run '
-                'pip install ludwig[image]'
-            )
-            sys.exit(-1)
-
-        first_image = imread(first_image_path)
+        first_image = read_image(
+            first_image_path,
+            backend=preprocessing_parameters['image_backend']
+        )
         first_img_height = first_image.shape[0]
         first_img_width = first_image.shape[1]
         first_img_num_channels = num_channels_in_image(first_image)
@@ -248,7 +265,8 @@ class ImageFeatureMixin(object):
 
         first_path = next(iter(dataset_df[feature[NAME]]))
 
-        if csv_path is None and not os.path.isabs(first_path):
+        if (csv_path is None and not isinstance(first_path, bytes) and
+                not os.path.isabs(first_path)):
             raise ValueError('Image file paths must be absolute')
 
         first_path = get_abs_path(csv_path, first_path)
@@ -276,63 +294,343 @@ class ImageFeatureMixin(object):
             should_resize=should_resize,
             num_channels=num_channels,
             resize_method=preprocessing_parameters['resize_method'],
-            user_specified_num_channels=user_specified_num_channels
+            user_specified_num_channels=user_specified_num_channels,
+            backend=preprocessing_parameters['image_backend']
         )
+        image_cache = ImageFeatureMixin._create_image_cache(
+            preprocessing_parameters,
+            (height, width, num_channels, should_resize,
+             user_specified_num_channels)
+        )
+        if image_cache is not None:
+            read_image_and_resize = CachedImageReader(
+                read_image_and_resize, image_cache
+            )
         all_file_paths = [get_abs_path(csv_path, file_path)
                           for file_path in dataset_df[feature[NAME]]]
 
-        if feature['preprocessing']['in_memory']:
+        # images held in memory as bytes, e.g. uploaded to the server,
+        # are decoded right away, only paths can be loaded lazily
+        if (preprocessing_parameters['lazy_load'] and
+                not isinstance(first_path, bytes)):
+            # only the paths are stored, the images are decoded at batch
+            # time by the loader created from these parameters
+            metadata[feature[NAME]]['preprocessing'][
+                'should_resize'] = should_resize
+            metadata[feature[NAME]]['preprocessing'][
+                'user_specified_num_channels'] = user_specified_num_channels
+            dataset[feature[NAME]] = np.char.encode(
+                np.array(all_file_paths, dtype=str), 'utf-8'
+            )
+        elif feature['preprocessing']['in_memory']:
             # Number of processes to run in parallel for preprocessing
             num_processes = feature['preprocessing']['num_processes']
             metadata[feature[NAME]]['preprocessing'][
                 'num_processes'] = num_processes
 
-            dataset[feature[NAME]] = np.empty(
-                (num_images, height, width, num_channels),
-                dtype=np.uint8
+            # images appearing more than once are decoded only once
+            first_rows, inverse = ImageFeatureMixin._unique_file_paths(
+                all_file_paths
             )
-            # Split the dataset into pools only if we have an explicit request to use
-            # multiple processes. In case we have multiple input images use the
-            # standard code anyway.
-            if num_processes > 1 or num_images > 1:
+            indexed_file_paths = [(row, all_file_paths[row])
+                                  for row in first_rows]
+
+            shape = (num_images, height, width, num_channels)
+            if num_processes > 1 and SharedMemory is not None:
+                # workers write the images straight into shared memory,
+                # nothing is pickled back and the array is not copied
+                logger.debug(
+                    'Using {} processes for preprocessing images'.format(
+                        num_processes
+                    )
+                )
+                dataset[feature[NAME]] = (
+                    ImageFeatureMixin._read_images_into_shared_memory(
+                        read_image_and_resize,
+                        indexed_file_paths,
+                        shape,
+                        num_processes
+                    )
+                )
+            elif num_processes > 1:
+                # python < 3.8, no shared_memory module
+                images = np.empty(shape, dtype=np.uint8)
                 with Pool(num_processes) as pool:
                     logger.debug(
                         'Using {} processes for preprocessing images'.format(
                             num_processes
                         )
                     )
-                    dataset[feature[NAME]] = np.array(
-                        pool.map(read_image_and_resize, all_file_paths)
-                    )
-
+                    for row, img in zip(first_rows, pool.imap(
+                            read_image_and_resize,
+                            [path for _, path in indexed_file_paths],
+                            chunksize=_image_tasks_chunksize(
+                                len(first_rows), num_processes
+                            )
+                    )):
+                        images[row] = img
+                dataset[feature[NAME]] = images
             else:
-                # If we're not running multiple processes and we are only processing one
-                # image just use this faster shortcut, bypassing multiprocessing.Pool.map
                 logger.debug(
-                    'No process pool initialized. Using one process for preprocessing images'
+                    'No process pool initialized. '
+                    'Using one process for preprocessing images'
                 )
-                img = read_image_and_resize(all_file_paths[0])
-                dataset[feature[NAME]] = np.array([img])
+                images = np.empty(shape, dtype=np.uint8)
+                for row, filepath in indexed_file_paths:
+                    images[row] = read_image_and_resize(filepath)
+                dataset[feature[NAME]] = images
+
+            if len(first_rows) < num_images:
+                images = dataset[feature[NAME]]
+                source_rows = first_rows[inverse]
+                duplicate_rows = np.flatnonzero(
+                    source_rows != np.arange(num_images)
+                )
+                images[duplicate_rows] = images[source_rows[duplicate_rows]]
         else:
-            data_fp = os.path.splitext(dataset_df.csv)[0] + '.hdf5'
+            num_processes = feature['preprocessing']['num_processes']
+            metadata[feature[NAME]]['preprocessing'][
+                'num_processes'] = num_processes
+
+            data_fp = replace_file_extension(dataset_df.csv, 'hdf5')
             mode = 'w'
             if os.path.isfile(data_fp):
                 mode = 'r+'
 
+            # only distinct images are stored, each row of the dataset
+            # is the index of its image in the HDF5 dataset
+            first_rows, inverse = ImageFeatureMixin._unique_file_paths(
+                all_file_paths
+            )
+            unique_file_paths = [all_file_paths[row] for row in first_rows]
+
             with h5py.File(data_fp, mode) as h5_file:
-                # todo future add multiprocessing/multithreading
                 image_dataset = h5_file.create_dataset(
                     feature[NAME] + '_data',
-                    (num_images, height, width, num_channels),
+                    (len(unique_file_paths), height, width, num_channels),
                     dtype=np.uint8
                 )
-                for i, filepath in enumerate(all_file_paths):
-                    image_dataset[i, :height, :width, :] = (
-                        read_image_and_resize(filepath)
+                if num_processes > 1:
+                    with Pool(num_processes) as pool:
+                        logger.debug(
+                            'Using {} processes for preprocessing '
+                            'images'.format(num_processes)
+                        )
+                        ImageFeatureMixin._write_images_to_hdf5(
+                            image_dataset,
+                            read_image_and_resize,
+                            unique_file_paths,
+                            pool
+                        )
+                else:
+                    ImageFeatureMixin._write_images_to_hdf5(
+                        image_dataset,
+                        read_image_and_resize,
+                        unique_file_paths
                     )
                 h5_file.flush()
 
-            dataset[feature[NAME]] = np.arange(num_images)
+            dataset[feature[NAME]] = inverse
+
+        if image_cache is not None:
+            image_cache.evict()
+
+    @staticmethod
+    def create_image_loader(preprocessing_parameters):
+        """
+        Creates the ImageLoader that decodes the images of a feature
+        preprocessed with lazy_load, from its preprocessing metadata.
+        """
+        height = preprocessing_parameters[HEIGHT]
+        width = preprocessing_parameters[WIDTH]
+        num_channels = preprocessing_parameters[NUM_CHANNELS]
+        read_image_and_resize = partial(
+            ImageFeatureMixin._read_image_and_resize,
+            img_width=width,
+            img_height=height,
+            should_resize=preprocessing_parameters['should_resize'],
+            num_channels=num_channels,
+            resize_method=preprocessing_parameters['resize_method'],
+            user_specified_num_channels=preprocessing_parameters[
+                'user_specified_num_channels'
+            ],
+            backend=preprocessing_parameters.get('image_backend')
+        )
+        image_cache = ImageFeatureMixin._create_image_cache(
+            preprocessing_parameters,
+            (height, width, num_channels,
+             preprocessing_parameters['should_resize'],
+             preprocessing_parameters['user_specified_num_channels'])
+        )
+        if image_cache is not None:
+            read_image_and_resize = CachedImageReader(
+                read_image_and_resize, image_cache
+            )
+        return ImageLoader(
+            read_image_and_resize,
+            (height, width, num_channels),
+            num_workers=preprocessing_parameters['num_processes'],
+            cache_size=preprocessing_parameters['lazy_load_cache_size']
+        )
+
+    @staticmethod
+    def _create_image_cache(preprocessing_parameters, image_params):
+        """
+        Returns the DiskImageCache of the decoded images if image_cache_dir
+        is set, None otherwise. image_params are the resolved parameters
+        determining the decoded array, that are part of the cache key
+        together with the resize method and the backend.
+        """
+        cache_dir = preprocessing_parameters.get('image_cache_dir')
+        if cache_dir is None:
+            return None
+        return DiskImageCache(
+            cache_dir,
+            int(preprocessing_parameters.get('image_cache_size_mb', 10240) *
+                1024 * 1024),
+            key_params=tuple(image_params) + (
+                preprocessing_parameters['resize_method'],
+                preprocessing_parameters.get('image_backend')
+            )
+        )
+
+    @staticmethod
+    def _unique_file_paths(all_file_paths):
+        """
+        Returns the rows of the first occurrence of each distinct path, in
+        order, and for each row the position of its path among them.
+        """
+        if len(all_file_paths) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        # fixed width bytes would pad every image held in memory
+        # to the size of the largest one
+        dtype = object if isinstance(all_file_paths[0], bytes) else None
+        _, first_rows, inverse = np.unique(
+            np.array(all_file_paths, dtype=dtype),
+            return_index=True,
+            return_inverse=True
+        )
+        order = np.argsort(first_rows)
+        position = np.empty_like(order)
+        position[order] = np.arange(len(order))
+        return first_rows[order], position[inverse.ravel()]
+
+    @staticmethod
+    def _read_images_into_shared_memory(
+            read_image_and_resize,
+            indexed_file_paths,
+            shape,
+            num_processes
+    ):
+        """
+        Decodes the (index, path) pairs of indexed_file_paths with a pool of
+        workers that write each image at its index of a uint8 array in shared
+        memory, so peak memory is the final array plus the images being
+        decoded. Rows without a path are left uninitialized. The returned
+        array is backed by the shared memory block, which is released when
+        the array is garbage collected.
+        """
+        shared_memory = SharedMemory(
+            create=True,
+            size=max(1, int(np.prod(shape)))
+        )
+        try:
+            with Pool(
+                    num_processes,
+                    initializer=_init_shared_images_worker,
+                    initargs=(shared_memory.name, shape, read_image_and_resize)
+            ) as pool:
+                for _ in pool.imap_unordered(
+                        _read_image_into_shared_images,
+                        indexed_file_paths,
+                        chunksize=_image_tasks_chunksize(
+                            len(indexed_file_paths), num_processes
+                        )
+                ):
+                    pass
+        except BaseException:
+            shared_memory.close()
+            shared_memory.unlink()
+            raise
+
+        # the name is not needed anymore, the memory stays mapped
+        # until the array is released
+        shared_memory.unlink()
+        images = np.ndarray(shape, dtype=np.uint8, buffer=shared_memory.buf)
+        weakref.finalize(images, shared_memory.close).atexit = False
+        return images
+
+    @staticmethod
+    def _write_images_to_hdf5(
+            image_dataset,
+            read_image_and_resize,
+            all_file_paths,
+            pool=None
+    ):
+        """
+        Fills image_dataset with the images in all_file_paths.
+
+        The pool workers decode and resize the images of the next block
+        while the calling process, the only one writing to the HDF5 file,
+        stores the current block, so at most two blocks of images are in
+        memory at any time. Blocks are multiples of the HDF5 chunk size when
+        the dataset is chunked, so each chunk is written only once.
+        """
+        num_images, height, width, num_channels = image_dataset.shape
+        block_size = max(
+            1, IMAGE_WRITE_BLOCK_BYTES // (height * width * num_channels)
+        )
+        if image_dataset.chunks is not None:
+            chunk_rows = image_dataset.chunks[0]
+            block_size = max(1, block_size // chunk_rows) * chunk_rows
+
+        def read_block(start):
+            block_paths = all_file_paths[start:start + block_size]
+            if pool is None:
+                return [read_image_and_resize(path) for path in block_paths]
+            return pool.map_async(read_image_and_resize, block_paths)
+
+        progress_bar = tqdm(
+            desc='Images {0: <5.5}'.format(image_dataset.name.split('/')[-1]),
+            total=num_images,
+            file=sys.stdout,
+            disable=is_progressbar_disabled()
+        )
+        pending = read_block(0)
+        for start in range(0, num_images, block_size):
+            end = min(start + block_size, num_images)
+            images = pending if pool is None else pending.get()
+            if end < num_images:
+                # submit the next block before writing this one
+                pending = read_block(end)
+            image_dataset[start:end] = np.stack(images)
+            progress_bar.update(end - start)
+        progress_bar.close()
+
+
+def _image_tasks_chunksize(num_images, num_processes):
+    # a few chunks per worker to balance the load,
+    # capped so progress is steady on large datasets
+    return max(1, min(64, num_images // (num_processes * 4)))
+
+
+_shared_images_memory = None
+_shared_images = None
+_shared_images_read_fn = None
+
+
+def _init_shared_images_worker(shared_memory_name, shape, read_image_fn):
+    global _shared_images_memory, _shared_images, _shared_images_read_fn
+    _shared_images_memory = SharedMemory(name=shared_memory_name)
+    _shared_images = np.ndarray(
+        shape, dtype=np.uint8, buffer=_shared_images_memory.buf
+    )
+    _shared_images_read_fn = read_image_fn
+
+
+def _read_image_into_shared_images(index_and_filepath):
+    index, filepath = index_and_filepath
+    _shared_images[index] = _shared_images_read_fn(filepath)
 
 
 class ImageInputFeature(ImageFeatureMixin, InputFeature):
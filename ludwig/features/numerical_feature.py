@@ -41,6 +41,8 @@ logger = logging.getLogger(__name__)
 
 class NumericalFeatureMixin(object):
     type = NUMERICAL
+    column_dtype = np.float32
+    tokenizes_strings = False
     preprocessing_defaults = {
         'missing_value_strategy': FILL_WITH_CONST,
         'fill_value': 0,
@@ -50,15 +52,16 @@ class NumericalFeatureMixin(object):
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters):
         if preprocessing_parameters['normalization'] is not None:
+            column = column.astype(np.float32, copy=False)
             if preprocessing_parameters['normalization'] == 'zscore':
                 return {
-                    'mean': column.astype(np.float32).mean(),
-                    'std': column.astype(np.float32).std()
+                    'mean': column.mean(),
+                    'std': column.std()
                 }
             elif preprocessing_parameters['normalization'] == 'minmax':
                 return {
-                    'min': column.astype(np.float32).min(),
-                    'max': column.astype(np.float32).max()
+                    'min': column.min(),
+                    'max': column.max()
                 }
             else:
                 logger.info(
@@ -265,7 +268,7 @@ class NumericalOutputFeature(NumericalFeatureMixin, OutputFeature):
             skip_save_unprocessed_output = True
 
         if PREDICTIONS in predictions and len(predictions[PREDICTIONS]) > 0:
-            postprocessed[PREDICTIONS] = predictions[PREDICTIONS].numpy()
+            postprocessed[PREDICTIONS] = np.asarray(predictions[PREDICTIONS])
             if not skip_save_unprocessed_output:
                 np.save(
                     npy_filename.format(name, PREDICTIONS),
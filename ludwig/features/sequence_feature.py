@@ -53,6 +53,8 @@ logger = logging.getLogger(__name__)
 
 class SequenceFeatureMixin(object):
     type = SEQUENCE
+    column_dtype = str
+    tokenizes_strings = True
 
     preprocessing_defaults = {
         'sequence_length_limit': 256,
@@ -440,7 +442,7 @@ class SequenceOutputFeature(SequenceFeatureMixin, OutputFeature):
             del result[LAST_PREDICTIONS]
 
         if PROBABILITIES in result and len(result[PROBABILITIES]) > 0:
-            probs = result[PROBABILITIES].numpy()
+            probs = np.asarray(result[PROBABILITIES])
             if probs is not None:
 
                 if len(probs) > 0 and isinstance(probs[0], list):
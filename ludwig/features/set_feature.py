@@ -38,6 +38,8 @@ logger = logging.getLogger(__name__)
 
 class SetFeatureMixin(object):
     type = SET
+    column_dtype = str
+    tokenizes_strings = True
     preprocessing_defaults = {
         'tokenizer': 'space',
         'most_common': 10000,
@@ -266,7 +268,7 @@ class SetOutputFeature(SetFeatureMixin, OutputFeature):
             del result[PREDICTIONS]
 
         if PROBABILITIES in result and len(result[PROBABILITIES]) > 0:
-            probs = result[PROBABILITIES].numpy()
+            probs = np.asarray(result[PROBABILITIES])
             prob = [[prob for prob in prob_set if
                      prob >= self.threshold] for prob_set in
                     probs]
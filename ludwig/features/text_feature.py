@@ -38,6 +38,8 @@ logger = logging.getLogger(__name__)
 
 class TextFeatureMixin(object):
     type = TEXT
+    column_dtype = str
+    tokenizes_strings = True
 
     preprocessing_defaults = {
         'char_tokenizer': 'characters',
@@ -23,6 +23,9 @@ from ludwig.constants import *
 from ludwig.encoders.sequence_encoders import StackedCNN, ParallelCNN, \
     StackedParallelCNN, StackedRNN, StackedCNNRNN, SequencePassthroughEncoder
 from ludwig.features.sequence_feature import SequenceInputFeature
+from ludwig.utils.data_utils import is_native_sequence_column
+from ludwig.utils.data_utils import number_sequence_lengths
+from ludwig.utils.data_utils import parse_number_sequences
 from ludwig.utils.misc_utils import get_from_registry, set_default_values
 from ludwig.utils.strings_utils import tokenizer_registry
 
@@ -31,6 +34,8 @@ logger = logging.getLogger(__name__)
 
 class TimeseriesFeatureMixin(object):
     type = TIMESERIES
+    column_dtype = str
+    tokenizes_strings = False
 
     preprocessing_defaults = {
         'timeseries_length_limit': 256,
@@ -43,20 +48,29 @@ class TimeseriesFeatureMixin(object):
 
     @staticmethod
     def get_feature_meta(column, preprocessing_parameters):
-        tokenizer = get_from_registry(
-            preprocessing_parameters['tokenizer'],
-            tokenizer_registry
-        )()
-        max_length = 0
-        for timeseries in column:
-            processed_line = tokenizer(timeseries)
-            max_length = max(max_length, len(processed_line))
+        if is_native_sequence_column(column):
+            lengths = number_sequence_lengths(column)
+        elif preprocessing_parameters['tokenizer'] == 'space':
+            # the space tokenizer returns [''] for empty strings
+            lengths = np.maximum(
+                number_sequence_lengths(column.astype(str)), 1
+            )
+        else:
+            tokenizer = get_from_registry(
+                preprocessing_parameters['tokenizer'],
+                tokenizer_registry
+            )()
+            lengths = [
+                len(tokenizer(timeseries))
+                for timeseries in column.astype(str)
+            ]
+        max_length = np.max(lengths, initial=0)
         max_length = min(
             preprocessing_parameters['timeseries_length_limit'],
             max_length
         )
 
-        return {'max_timeseries_length': max_length}
+        return {'max_timeseries_length': int(max_length)}
 
     @staticmethod
     def build_matrix(
@@ -66,6 +80,21 @@ class TimeseriesFeatureMixin(object):
             padding_value,
             padding='right'
     ):
+        native = is_native_sequence_column(timeseries)
+        if native or tokenizer_name == 'space':
+            parsed = parse_number_sequences(timeseries)
+            # empty strings are not valid timeseries, the per row parser
+            # below raises the error for them
+            if parsed is not None and (native or parsed[1].all()):
+                values, lengths = parsed
+                return TimeseriesFeatureMixin.pad_values(
+                    values,
+                    lengths,
+                    length_limit,
+                    padding_value,
+                    padding
+                )
+
         tokenizer = get_from_registry(
             tokenizer_name,
             tokenizer_registry
@@ -100,6 +129,32 @@ class TimeseriesFeatureMixin(object):
                 timeseries_matrix[i, max_length - limit:] = vector[:limit]
         return timeseries_matrix
 
+    @staticmethod
+    def pad_values(values, lengths, length_limit, padding_value,
+                   padding='right'):
+        """Builds the padded timeseries matrix from the flat values of all
+        the rows and the length of each row, truncating rows longer than
+        length_limit, with a single fancy indexing assignment.
+        """
+        num_rows = len(lengths)
+        timeseries_matrix = np.full(
+            (num_rows, length_limit),
+            padding_value,
+            dtype=np.float32
+        )
+        limits = np.minimum(lengths, length_limit)
+        rows = np.repeat(np.arange(num_rows), limits)
+        # position of each kept value within its row
+        positions = (np.arange(limits.sum()) -
+                     np.repeat(np.cumsum(limits) - limits, limits))
+        sources = np.repeat(np.cumsum(lengths) - lengths, limits) + positions
+        if padding == 'right':
+            columns = positions
+        else:  # if padding == 'left
+            columns = length_limit - np.repeat(limits, limits) + positions
+        timeseries_matrix[rows, columns] = values[sources]
+        return timeseries_matrix
+
     @staticmethod
     def feature_data(column, metadata, preprocessing_parameters):
         timeseries_data = TimeseriesFeatureMixin.build_matrix(
@@ -118,8 +173,11 @@ class TimeseriesFeatureMixin(object):
             metadata,
             preprocessing_parameters
     ):
+        column = dataset_df[feature[NAME]]
+        if not is_native_sequence_column(column):
+            column = column.astype(str)
         dataset[feature[NAME]] = TimeseriesFeatureMixin.feature_data(
-            dataset_df[feature[NAME]].astype(str),
+            column,
             metadata[feature[NAME]],
             preprocessing_parameters
         )
@@ -34,6 +34,7 @@ from ludwig.modules.loss_modules import SoftmaxCrossEntropyLoss, MSELoss, \
 from ludwig.modules.metric_modules import ErrorScore, \
     SoftmaxCrossEntropyMetric, MSEMetric, MAEMetric
 from ludwig.modules.metric_modules import R2Score
+from ludwig.utils.data_utils import parse_number_sequences
 from ludwig.utils.horovod_utils import is_on_master
 from ludwig.utils.misc_utils import set_default_value
 
@@ -42,6 +43,8 @@ logger = logging.getLogger(__name__)
 
 class VectorFeatureMixin(object):
     type = VECTOR
+    column_dtype = None
+    tokenizes_strings = False
     preprocessing_defaults = {
         'missing_value_strategy': FILL_WITH_CONST,
         'fill_value': ""
@@ -63,17 +66,28 @@ class VectorFeatureMixin(object):
     ):
         """
                 Expects all the vectors to be of the same size. The vectors need to be
-                whitespace delimited strings. Missing values are not handled.
+                whitespace delimited strings or lists/arrays of numbers.
+                Missing values are not handled.
                 """
         if len(dataset_df) == 0:
             raise ValueError("There are no vectors in the dataset provided")
 
         # Convert the string of features into a numpy array
+        column = dataset_df[feature[NAME]]
         try:
-            dataset[feature[NAME]] = np.array(
-                [x.split() for x in dataset_df[feature[NAME]]],
-                dtype=np.float32
-            )
+            parsed = parse_number_sequences(column)
+            if parsed is not None:
+                values, lengths = parsed
+                if (lengths != lengths[0]).any():
+                    raise ValueError('Vectors have different sizes')
+                dataset[feature[NAME]] = values.reshape(
+                    len(column), lengths[0]
+                )
+            else:
+                dataset[feature[NAME]] = np.array(
+                    [x.split() for x in column],
+                    dtype=np.float32
+                )
         except ValueError:
             logger.error(
                 'Unable to read the vector data. Make sure that all the vectors'
@@ -255,7 +269,7 @@ class VectorOutputFeature(VectorFeatureMixin, OutputFeature):
             skip_save_unprocessed_output = True
 
         if PREDICTIONS in result and len(result[PREDICTIONS]) > 0:
-            postprocessed[PREDICTIONS] = result[PREDICTIONS].numpy()
+            postprocessed[PREDICTIONS] = np.asarray(result[PREDICTIONS])
             if not skip_save_unprocessed_output:
                 np.save(
                     npy_filename.format(name, PREDICTIONS),
@@ -1,6 +1,7 @@
 import copy
 import logging
 from collections import OrderedDict
+from functools import partial
 
 import tensorflow as tf
 
@@ -49,6 +50,22 @@ class ECD(tf.keras.Model):
         # ================ Combined loss metric ================
         self.eval_loss_metric = tf.keras.metrics.Mean()
 
+        # ================ Step functions ================
+        # traced once for any batch size thanks to their input signatures,
+        # each trace counted, every retrace stalls for seconds
+        self.trace_counts = {
+            'train_step': 0,
+            'evaluation_step': 0,
+            'predict_step': 0
+        }
+        self._train_step_function = None
+        # the optimizer is not stored, it would become part of checkpoints
+        self._train_step_optimizer_id = None
+        self._evaluation_step_function = None
+        # one for each subset of output features predicted, not tracked by
+        # Keras, checkpoints can't have their None and tuple keys
+        object.__setattr__(self, '_predict_step_functions', {})
+
         # After constructing all layers, clear the cache to free up memory
         clear_data_cache()
 
@@ -78,12 +95,14 @@ class ECD(tf.keras.Model):
         keras_model = self.get_connected_model(training=False)
         keras_model.save(save_path)
 
-    def call(self, inputs, training=None, mask=None):
+    def call(self, inputs, training=None, mask=None, output_features=None):
         # parameter inputs is a dict feature_name -> tensor / ndarray
         # or
         # parameter (inputs, targets) where
         #   inputs is a dict feature_name -> tensor/ndarray
         #   targets is dict feature_name -> tensor/ndarray
+        # parameter output_features, if not None, names the output features
+        #   to compute, decoders not needed by them are skipped
 
         if isinstance(inputs, tuple):
             inputs, targets = inputs
@@ -100,9 +119,18 @@ class ECD(tf.keras.Model):
 
         combiner_outputs = self.combiner(encoder_outputs)
 
+        required_output_features = None
+        if output_features is not None:
+            required_output_features = self.get_required_output_features(
+                output_features
+            )
+
         output_logits = {}
         output_last_hidden = {}
         for output_feature_name, decoder in self.output_features.items():
+            if (required_output_features is not None and
+                    output_feature_name not in required_output_features):
+                continue
             # use presence or absence of targets
             # to signal training or prediction
             decoder_inputs = (combiner_outputs, copy.copy(output_last_hidden))
@@ -122,39 +150,49 @@ class ECD(tf.keras.Model):
 
         return output_logits
 
-    def predictions(self, inputs, output_features=None):
-        # check validity of output_features
-        if output_features is None:
-            of_list = self.output_features
-        elif isinstance(output_features, str):
-            if output_features == 'all':
-                of_list = set(self.output_features.keys())
-            elif output_features in self.output_features:
-                of_list = [output_features]
-            else:
-                raise ValueError(
-                    "'output_features' {} is not a valid for this model. "
-                    "Available ones are: {}".format(
-                        output_features, set(self.output_features.keys())
-                    )
-                )
-        elif isinstance(output_features, list or set):
-            if output_features.issubset(self.output_features):
-                of_list = output_features
-            else:
-                raise ValueError(
-                    "'output_features' {} must be a subset of "
-                    "available features {}".format(
-                        output_features, set(self.output_features.keys())
-                    )
-                )
-        else:
+    def get_output_feature_names(self, output_features=None):
+        """Returns the names of the output features requested, all of them
+        if None or 'all', in the order they are computed in."""
+        if output_features is None or output_features == 'all':
+            return list(self.output_features.keys())
+        if isinstance(output_features, str):
+            output_features = [output_features]
+        elif not isinstance(output_features, (list, tuple, set)):
             raise ValueError(
                 "'output_features' must be None or a string or a list "
                 "of output features"
             )
+        if not set(output_features).issubset(self.output_features):
+            raise ValueError(
+                "'output_features' {} must be a subset of "
+                "available features {}".format(
+                    output_features, set(self.output_features.keys())
+                )
+            )
+        return [of_name for of_name in self.output_features
+                if of_name in output_features]
+
+    def get_required_output_features(self, output_features):
+        """Returns the names of output_features and of the output features
+        their decoders depend on, through their last hidden layers."""
+        required_output_features = set()
+        to_visit = list(output_features)
+        while to_visit:
+            of_name = to_visit.pop()
+            if of_name not in required_output_features:
+                required_output_features.add(of_name)
+                to_visit.extend(self.output_features[of_name].dependencies)
+        return required_output_features
 
-        outputs = self.call(inputs, training=False)
+    def predictions(self, inputs, output_features=None):
+        of_list = self.get_output_feature_names(output_features)
+
+        outputs = self.call(
+            inputs,
+            training=False,
+            output_features=(of_list if output_features is not None
+                             else None)
+        )
 
         predictions = {}
         for of_name in of_list:
@@ -165,9 +203,79 @@ class ECD(tf.keras.Model):
 
         return predictions
 
-    @tf.function
+    def get_input_signature(self):
+        return {
+            input_feature_name: _batch_tensor_spec(
+                input_feature.get_input_shape(),
+                input_feature.get_input_dtype()
+            )
+            for input_feature_name, input_feature in
+            self.input_features.items()
+        }
+
+    def get_target_signature(self):
+        return {
+            output_feature_name: _batch_tensor_spec(
+                output_feature.get_output_shape(),
+                output_feature.get_output_dtype()
+            )
+            for output_feature_name, output_feature in
+            self.output_features.items()
+        }
+
     def train_step(self, optimizer, inputs, targets,
                    regularization_lambda=0.0):
+        if (self._train_step_function is None or
+                self._train_step_optimizer_id != id(optimizer)):
+            self._train_step_optimizer_id = id(optimizer)
+            self._train_step_function = tf.function(
+                partial(self._train_step, optimizer),
+                input_signature=[
+                    self.get_input_signature(),
+                    self.get_target_signature(),
+                    tf.TensorSpec((), tf.float32)
+                ]
+            )
+        return self._train_step_function(
+            _cast_to_signature(inputs, self.get_input_signature()),
+            _cast_to_signature(targets, self.get_target_signature()),
+            float(regularization_lambda)
+        )
+
+    def evaluation_step(self, inputs, targets):
+        if self._evaluation_step_function is None:
+            self._evaluation_step_function = tf.function(
+                self._evaluation_step,
+                input_signature=[
+                    self.get_input_signature(),
+                    self.get_target_signature()
+                ]
+            )
+        return self._evaluation_step_function(
+            _cast_to_signature(inputs, self.get_input_signature()),
+            _cast_to_signature(targets, self.get_target_signature())
+        )
+
+    def predict_step(self, inputs, output_features=None):
+        if output_features is not None:
+            output_features = tuple(
+                self.get_output_feature_names(output_features)
+            )
+            if len(output_features) == len(self.output_features):
+                output_features = None
+        if output_features not in self._predict_step_functions:
+            self._predict_step_functions[output_features] = tf.function(
+                partial(self._predict_step, output_features=output_features),
+                input_signature=[self.get_input_signature()]
+            )
+        return self._predict_step_functions[output_features](
+            _cast_to_signature(inputs, self.get_input_signature())
+        )
+
+    def _train_step(self, optimizer, inputs, targets,
+                    regularization_lambda=0.0):
+        # python code runs only while tracing
+        self.trace_counts['train_step'] += 1
         with tf.GradientTape() as tape:
             model_outputs = self((inputs, targets), training=True)
             loss, all_losses = self.train_loss(
@@ -180,15 +288,19 @@ class ECD(tf.keras.Model):
         # optimizer.apply_gradients(zip(grads, model.trainable_weights))
         return loss, all_losses
 
-    @tf.function
-    def evaluation_step(self, inputs, targets):
+    def _evaluation_step(self, inputs, targets):
+        self.trace_counts['evaluation_step'] += 1
         predictions = self.predictions(inputs, output_features=None)
         self.update_metrics(targets, predictions)
         return predictions
 
-    @tf.function
-    def predict_step(self, inputs):
-        return self.predictions(inputs, output_features=None)
+    def _predict_step(self, inputs, output_features=None):
+        self.trace_counts['predict_step'] += 1
+        return self.predictions(
+            inputs,
+            output_features=(list(output_features)
+                             if output_features is not None else None)
+        )
 
     def train_loss(self, targets, predictions, regularization_lambda=0.0):
         train_loss = 0
@@ -268,6 +380,21 @@ class ECD(tf.keras.Model):
         return weights
 
 
+def _batch_tensor_spec(shape, dtype):
+    # any batch size, dimensions of variable size like the length of
+    # sequences are declared None by the features themselves
+    return tf.TensorSpec((None,) + tuple(shape), dtype)
+
+
+def _cast_to_signature(values, signature):
+    # e.g. category indices are stored with the smallest integer type
+    # fitting their vocabulary, the signature has the one of the feature
+    return {
+        name: tf.cast(values[name], spec.dtype)
+        for name, spec in signature.items()
+    }
+
+
 def build_inputs(
         input_features_def,
         **kwargs
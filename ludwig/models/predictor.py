@@ -4,10 +4,11 @@ import sys
 from collections import OrderedDict
 from pprint import pformat
 
+import numpy as np
 import tensorflow as tf
 from tqdm import tqdm
 
-from ludwig.constants import COMBINED, LOGITS
+from ludwig.constants import COMBINED, LOGITS, PROBABILITIES
 from ludwig.globals import is_progressbar_disabled
 from ludwig.utils.batcher import initialize_batcher
 from ludwig.utils.data_utils import save_csv, save_json
@@ -41,8 +42,14 @@ class Predictor:
             self,
             model,
             dataset,
-            dataset_name=None
+            dataset_name=None,
+            output_features=None,
+            skip_probabilities=False
     ):
+        # output_features: names of the output features to predict,
+        # the decoders the other ones need alone are not run
+        # skip_probabilities: probabilities are not collected, for callers
+        # wanting only predictions of e.g. large vocabularies
         batcher = initialize_batcher(
             dataset, self._batch_size,
             should_shuffle=False,
@@ -59,7 +66,10 @@ class Predictor:
                 disable=is_progressbar_disabled()
             )
 
-        predictions = {}
+        exclude = EXCLUE_PRED_SET
+        if skip_probabilities:
+            exclude = exclude | {PROBABILITIES}
+        accumulator = PredictionsAccumulator(batcher.total_size, exclude)
         while not batcher.last_batch():
             batch = batcher.next_batch()
 
@@ -68,18 +78,10 @@ class Predictor:
                 for i_feat in model.input_features.values()
             }
 
-            preds = model.predict_step(inputs)
+            preds = model.predict_step(inputs, output_features)
 
             # accumulate predictions from batch for each output feature
-            for of_name, of_preds in preds.items():
-                if of_name not in predictions:
-                    predictions[of_name] = {}
-                for pred_name, pred_values in of_preds.items():
-                    if pred_name not in EXCLUE_PRED_SET:
-                        if pred_name not in predictions[of_name]:
-                            predictions[of_name][pred_name] = [pred_values]
-                        else:
-                            predictions[of_name][pred_name].append(pred_values)
+            accumulator.add(preds)
 
             if is_on_master():
                 progress_bar.update(1)
@@ -87,20 +89,15 @@ class Predictor:
         if is_on_master():
             progress_bar.close()
 
-        # consolidate predictions from each batch to a single tensor
-        for of_name, of_predictions in predictions.items():
-            for pred_name, pred_value_list in of_predictions.items():
-                predictions[of_name][pred_name] = tf.concat(pred_value_list,
-                                                            axis=0)
-
-        return predictions
+        return accumulator.result()
 
     def batch_evaluation(
             self,
             model,
             dataset,
             collect_predictions=False,
-            dataset_name=None
+            dataset_name=None,
+            skip_probabilities=False
     ):
         batcher = initialize_batcher(
             dataset, self._batch_size,
@@ -118,7 +115,10 @@ class Predictor:
                 disable=is_progressbar_disabled()
             )
 
-        predictions = {}
+        exclude = EXCLUE_PRED_SET
+        if skip_probabilities:
+            exclude = exclude | {PROBABILITIES}
+        accumulator = PredictionsAccumulator(batcher.total_size, exclude)
         while not batcher.last_batch():
             batch = batcher.next_batch()
 
@@ -137,16 +137,7 @@ class Predictor:
 
             # accumulate predictions from batch for each output feature
             if collect_predictions:
-                for of_name, of_preds in preds.items():
-                    if of_name not in predictions:
-                        predictions[of_name] = {}
-                    for pred_name, pred_values in of_preds.items():
-                        if pred_name not in EXCLUE_PRED_SET and pred_values is not None:
-                            if pred_name not in predictions[of_name]:
-                                predictions[of_name][pred_name] = [pred_values]
-                            else:
-                                predictions[of_name][pred_name].append(
-                                    pred_values)
+                accumulator.add(preds)
 
             if is_on_master():
                 progress_bar.update(1)
@@ -154,13 +145,7 @@ class Predictor:
         if is_on_master():
             progress_bar.close()
 
-        # consolidate predictions from each batch to a single tensor
-        if collect_predictions:
-            for of_name, of_predictions in predictions.items():
-                for pred_name, pred_value_list in of_predictions.items():
-                    predictions[of_name][pred_name] = tf.concat(
-                        pred_value_list, axis=0
-                    )
+        predictions = accumulator.result() if collect_predictions else {}
 
         metrics = model.get_metrics()
         metrics = self.merge_workers_metrics(metrics)
@@ -253,6 +238,83 @@ class Predictor:
         return merged_output_metrics
 
 
+class PredictionsAccumulator:
+    """
+    Collects the predictions of the batches of a dataset of num_rows rows
+    as NumPy arrays, leaving out the ones named in exclude.
+
+    The array of each prediction is allocated for all the rows at the first
+    batch and every batch is written into its slice, so predictions are not
+    held twice, as batches and concatenated. When a batch has a different
+    shape, e.g. sequences of another length, the prediction falls back to a
+    list of the arrays of its batches, concatenated at the end, padded with
+    zeros to the largest shape.
+    """
+
+    def __init__(self, num_rows, exclude=EXCLUE_PRED_SET):
+        self.num_rows = num_rows
+        self.exclude = exclude
+        self.offset = 0
+        # (output feature name, prediction name) -> array or list of arrays
+        self._outputs = {}
+
+    def add(self, predictions):
+        batch_size = None
+        for of_name, of_predictions in predictions.items():
+            for pred_name, pred_values in of_predictions.items():
+                if pred_name in self.exclude or pred_values is None:
+                    continue
+                pred_values = np.asarray(pred_values)
+                batch_size = len(pred_values)
+                key = (of_name, pred_name)
+                output = self._outputs.get(key)
+                if output is None:
+                    output = np.empty(
+                        (self.num_rows,) + pred_values.shape[1:],
+                        dtype=pred_values.dtype
+                    )
+                    self._outputs[key] = output
+
+                if isinstance(output, list):
+                    output.append(pred_values)
+                elif (output.shape[1:] == pred_values.shape[1:] and
+                      output.dtype == pred_values.dtype and
+                      self.offset + batch_size <= self.num_rows):
+                    output[self.offset:self.offset + batch_size] = pred_values
+                else:
+                    self._outputs[key] = [output[:self.offset], pred_values]
+        if batch_size is not None:
+            self.offset += batch_size
+
+    def result(self):
+        predictions = {}
+        for (of_name, pred_name), output in self._outputs.items():
+            if isinstance(output, list):
+                output = _concatenate_padded(output)
+            else:
+                output = output[:self.offset]
+            predictions.setdefault(of_name, {})[pred_name] = output
+        return predictions
+
+
+def _concatenate_padded(arrays):
+    shape = tuple(
+        max(sizes) for sizes in zip(*(array.shape[1:] for array in arrays))
+    )
+    concatenated = np.zeros(
+        (sum(len(array) for array in arrays),) + shape,
+        dtype=np.result_type(*arrays)
+    )
+    offset = 0
+    for array in arrays:
+        concatenated[
+            (slice(offset, offset + len(array)),) +
+            tuple(slice(0, size) for size in array.shape[1:])
+            ] = array
+        offset += len(array)
+    return concatenated
+
+
 def calculate_overall_stats(
         output_features,
         predictions,
@@ -16,6 +16,7 @@
 # ==============================================================================
 import argparse
 import logging
+import os
 import sys
 
 from ludwig.api import LudwigModel
@@ -36,6 +37,8 @@ def predict_cli(
         skip_save_unprocessed_output=False,
         skip_save_predictions=False,
         output_directory='results',
+        chunk_size=None,
+        output_format='csv',
         gpus=None,
         gpu_memory_limit=None,
         allow_parallel_threads=True,
@@ -52,6 +55,23 @@ def predict_cli(
         gpu_memory_limit=gpu_memory_limit,
         allow_parallel_threads=allow_parallel_threads
     )
+    if chunk_size is not None:
+        # predictions of each chunk are appended to a single file,
+        # nothing else is saved
+        model.predict_to_file(
+            dataset=dataset,
+            output_path=os.path.join(
+                output_directory,
+                'predictions.{}'.format(output_format)
+            ),
+            data_format=data_format,
+            output_format=output_format,
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            debug=debug,
+        )
+        return
+
     model.predict(
         dataset=dataset,
         data_format=data_format,
@@ -84,7 +104,7 @@ def cli(sys_argv):
         '--data_format',
         help='format of the input data',
         default='auto',
-        choices=['auto', 'csv', 'hdf5']
+        choices=['auto', 'csv', 'hdf5', 'parquet', 'feather']
     )
 
     # ----------------
@@ -119,6 +139,22 @@ def cli(sys_argv):
         help='skips saving predictions CSV files',
         action='store_true', default=False
     )
+    parser.add_argument(
+        '-cs',
+        '--chunk_size',
+        type=int,
+        default=None,
+        help='predicts the dataset this many rows at a time, appending the '
+             'predictions to a single file in the output directory, '
+             'so memory does not grow with the size of the dataset'
+    )
+    parser.add_argument(
+        '-of',
+        '--output_format',
+        default='csv',
+        choices=['csv', 'parquet'],
+        help='format of the predictions file when using --chunk_size'
+    )
 
     # ------------------
     # Generic parameters
@@ -15,16 +15,29 @@
 # limitations under the License.
 # ==============================================================================
 import argparse
+import asyncio
+import io
+import json
 import logging
 import os
 import sys
-import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
 
 from ludwig.api import LudwigModel
 from ludwig.constants import NAME
 from ludwig.contrib import contrib_command, contrib_import
 from ludwig.globals import LUDWIG_VERSION
+from ludwig.globals import MODEL_HYPERPARAMETERS_FILE_NAME
 from ludwig.utils.print_utils import logging_level_registry, print_ludwig
+from ludwig.utils.server_utils import MicroBatcher
+from ludwig.utils.server_utils import ModelCache
+from ludwig.utils.server_utils import QueueFullError
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +46,7 @@ try:
     from fastapi import FastAPI
     from starlette.datastructures import UploadFile
     from starlette.requests import Request
-    from starlette.responses import JSONResponse
+    from starlette.responses import JSONResponse, Response
 except ImportError as e:
     logger.error(e)
     logger.error(
@@ -44,71 +57,674 @@ except ImportError as e:
     )
     sys.exit(-1)
 
+# optional, faster JSON serialization and Arrow requests and responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+JSON_MEDIA_TYPE = 'application/json'
+CSV_MEDIA_TYPE = 'text/csv'
+ARROW_STREAM_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+# formats of the responses of /batch_predict
+RECORDS = 'records'
+COLUMNS = 'columns'
+ARROW = 'arrow'
+BATCH_RESPONSE_FORMATS = (RECORDS, COLUMNS, ARROW)
+
 ALL_FEATURES_PRESENT_ERROR = {"error": "entry must contain all input features"}
 
 COULD_NOT_RUN_INFERENCE_ERROR = {
     "error": "Unexpected Error: could not run inference on model"}
 
+SERVER_OVERLOADED_ERROR = {
+    "error": "Server overloaded: too many pending requests, retry later"}
+
+UNSUPPORTED_MEDIA_TYPE_ERROR = {
+    "error": "Content-Type must be one of {}, {} or {}".format(
+        JSON_MEDIA_TYPE, CSV_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE)}
+
+INVALID_BATCH_ERROR = {"error": "could not read the batch of entries"}
 
-def server(model):
+UNSUPPORTED_RESPONSE_FORMAT_ERROR = {
+    "error": "format must be one of {}".format(
+        ', '.join(BATCH_RESPONSE_FORMATS))}
+
+WARMING_UP_ERROR = {"error": "Server warming up, retry later"}
+
+INVALID_OUTPUT_FEATURES_ERROR = {
+    "error": "output_features must be output features of the model, "
+             "separated by commas"}
+
+MODEL_NOT_FOUND_ERROR = {"error": "no model with this name"}
+
+COULD_NOT_LOAD_MODEL_ERROR = {
+    "error": "Unexpected Error: could not load the model"}
+
+PYARROW_NOT_INSTALLED_ERROR = {
+    "error": "Arrow requests and responses need pyarrow installed"}
+
+
+def server(
+        model,
+        max_batch_size=32,
+        max_latency_ms=5,
+        max_concurrency=1,
+        max_queue_size=1024,
+        retry_after_s=1,
+        warm_up_batch_sizes=()
+):
     app = FastAPI()
 
-    input_features = {
-        f[NAME] for f in model.model_definition['input_features']
-    }
+    input_features = get_input_features(model)
+    output_features = get_output_features(model)
+
+    # built before the first request, which would wait for it otherwise
+    inference_preprocessor = model.get_inference_preprocessor()
+    if not inference_preprocessor.supported:
+        logger.info(
+            'Requests are preprocessed with pandas because of input features: '
+            '{}'.format(', '.join(inference_preprocessor.unsupported_features))
+        )
+
+    # concurrent requests are predicted together, in threads
+    # so the event loop keeps answering while the model runs
+    executor = ThreadPoolExecutor(
+        max_workers=max_concurrency,
+        thread_name_prefix='ludwig_predict'
+    )
+    batcher = MicroBatcher(
+        predict_batch,
+        max_batch_size=max_batch_size,
+        max_latency_ms=max_latency_ms,
+        executor=executor,
+        max_concurrency=max_concurrency,
+        max_queue_size=max_queue_size
+    )
+
+    # not ready until the model predicted a batch of each size once
+    warmed_up = threading.Event()
+    if not warm_up_batch_sizes:
+        warmed_up.set()
+
+    def warm_up():
+        start = time.perf_counter()
+        try:
+            model.warm_up(warm_up_batch_sizes)
+            logger.info('Warm-up done in {:.3f} s'.format(
+                time.perf_counter() - start
+            ))
+        except Exception as e:
+            # actual requests will tell if the model cannot predict
+            logger.error('Warm-up failed: {}'.format(str(e)))
+        finally:
+            warmed_up.set()
+
+    @app.on_event('startup')
+    async def start_warm_up():
+        if not warmed_up.is_set():
+            # in the background, so the server answers health checks
+            asyncio.get_event_loop().run_in_executor(executor, warm_up)
+
+    @app.on_event('shutdown')
+    async def stop_batcher():
+        await batcher.close()
+        executor.shutdown(wait=False)
 
     @app.get('/')
     def check_health():
         return JSONResponse({"message": "Ludwig server is up"})
 
+    @app.get('/ready')
+    async def check_ready():
+        # cheap enough to be polled by load balancers,
+        # not ready while warming up or rejecting requests
+        if not warmed_up.is_set():
+            return JSONResponse(
+                WARMING_UP_ERROR,
+                status_code=503,
+                headers={'Retry-After': str(retry_after_s)}
+            )
+        if batcher.is_full():
+            return overloaded_response(retry_after_s)
+        return JSONResponse({"ready": True})
+
+    @app.get('/metrics')
+    def metrics():
+        metrics = {
+            **batcher.metrics(),
+            # more than one trace of a step means predictions stalled
+            # while it was traced again
+            'traces': dict(model.model.trace_counts)
+        }
+        if model.prediction_cache is not None:
+            metrics['prediction_cache'] = model.prediction_cache.metrics()
+        return JSONResponse(metrics)
+
     @app.post('/predict')
     async def predict(request: Request):
-        form = await request.form()
-        files, entry = convert_input(form)
+        return await predict_request(
+            request,
+            model,
+            batcher,
+            input_features,
+            output_features,
+            retry_after_s
+        )
+
+    @app.post('/batch_predict')
+    async def batch_predict(request: Request):
+        return await batch_predict_request(
+            request,
+            batcher,
+            input_features,
+            output_features,
+            partial(predict_entries, model),
+            executor,
+            retry_after_s
+        )
+
+    return app
+
+
+def multi_model_server(
+        models_path,
+        max_memory_mb=None,
+        reload_check_interval_s=1,
+        max_batch_size=32,
+        max_latency_ms=5,
+        max_concurrency=1,
+        max_queue_size=1024,
+        retry_after_s=1,
+        warm_up_batch_sizes=(),
+        prediction_cache_size=None,
+        prediction_cache_ttl_s=None
+):
+    """Serves the models in the subdirectories of models_path, each one
+    under /models/{name}, name being the one of its directory.
+
+    Models are loaded the first time they are requested and the least
+    recently used ones are unloaded when the memory of their weights adds up
+    to more than max_memory_mb. A model whose files change is loaded again
+    and replaces the old one once ready, requests in flight finish with the
+    old one.
+    """
+    app = FastAPI()
+
+    def load_model(name):
+        model = LudwigModel.load(
+            os.path.join(models_path, name),
+            warm_up_batch_sizes=warm_up_batch_sizes
+        )
+        if prediction_cache_size:
+            # a reloaded model starts with an empty cache
+            model.enable_prediction_cache(
+                max_size=prediction_cache_size,
+                ttl_s=prediction_cache_ttl_s
+            )
+        return model
 
+    cache = ModelCache(
+        load_model,
+        partial(get_model_version, models_path),
+        get_model_size,
+        max_size=(max_memory_mb * 1024 * 1024
+                  if max_memory_mb is not None else None),
+        reload_check_interval_s=reload_check_interval_s
+    )
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_concurrency,
+        thread_name_prefix='ludwig_predict'
+    )
+    # models are loaded in a thread of their own, loading one does not
+    # block the predictions of the loaded ones
+    loader = ThreadPoolExecutor(
+        max_workers=1,
+        thread_name_prefix='ludwig_load'
+    )
+    batchers = {}
+
+    def get_batcher(name):
+        if name not in batchers:
+            # requests carry the model they got, which stays usable
+            # when it is evicted or reloaded before the batch runs
+            batchers[name] = MicroBatcher(
+                predict_batch,
+                max_batch_size=max_batch_size,
+                max_latency_ms=max_latency_ms,
+                executor=executor,
+                max_concurrency=max_concurrency,
+                max_queue_size=max_queue_size
+            )
+        return batchers[name]
+
+    async def get_model(name):
+        """The model and its batcher, None when there is no such model."""
+        if not is_model_dir(models_path, name):
+            return None, None
+        model, check = cache.lookup(name)
+        if model is None:
+            model = await asyncio.get_event_loop().run_in_executor(
+                loader, cache.get, name
+            )
+        elif check:
+            # reloaded in the background, the loaded model
+            # serves the requests until the new one is ready
+            asyncio.get_event_loop().run_in_executor(
+                loader, reload_model, name
+            )
+        return model, get_batcher(name)
+
+    def reload_model(name):
         try:
-            if (entry.keys() & input_features) != input_features:
-                return JSONResponse(ALL_FEATURES_PRESENT_ERROR,
-                                    status_code=400)
-            try:
-                resp, _ = model.predict(
-                    dataset=[entry], data_format=dict
-                )
-                return JSONResponse(resp.to_dict('records')[0])
-            except Exception as e:
-                logger.error("Error: {}".format(str(e)))
-                return JSONResponse(COULD_NOT_RUN_INFERENCE_ERROR,
-                                    status_code=500)
-        finally:
-            for f in files:
-                os.remove(f.name)
+            cache.get(name)
+        except Exception as e:
+            logger.error('Could not reload model {}: {}'.format(name, str(e)))
+
+    @app.on_event('shutdown')
+    async def stop_batchers():
+        for batcher in batchers.values():
+            await batcher.close()
+        executor.shutdown(wait=False)
+        loader.shutdown(wait=False)
+
+    @app.get('/')
+    def check_health():
+        return JSONResponse({"message": "Ludwig server is up"})
+
+    @app.get('/ready')
+    async def check_ready():
+        return JSONResponse({"ready": True})
+
+    @app.get('/models')
+    def list_models():
+        return JSONResponse({
+            'models': [name for name in sorted(os.listdir(models_path))
+                       if is_model_dir(models_path, name)],
+            'loaded': cache.keys()
+        })
+
+    @app.get('/metrics')
+    def metrics():
+        return JSONResponse({
+            'models': cache.metrics(),
+            'batchers': {name: batcher.metrics()
+                         for name, batcher in batchers.items()}
+        })
+
+    @app.post('/models/{name}/predict')
+    async def predict(name: str, request: Request):
+        try:
+            model, batcher = await get_model(name)
+        except Exception as e:
+            logger.error("Error: {}".format(str(e)))
+            return JSONResponse(COULD_NOT_LOAD_MODEL_ERROR, status_code=500)
+        if model is None:
+            return JSONResponse(MODEL_NOT_FOUND_ERROR, status_code=404)
+        return await predict_request(
+            request,
+            model,
+            batcher,
+            get_input_features(model),
+            get_output_features(model),
+            retry_after_s
+        )
+
+    @app.post('/models/{name}/batch_predict')
+    async def batch_predict(name: str, request: Request):
+        try:
+            model, batcher = await get_model(name)
+        except Exception as e:
+            logger.error("Error: {}".format(str(e)))
+            return serialize_json(COULD_NOT_LOAD_MODEL_ERROR,
+                                  status_code=500)
+        if model is None:
+            return serialize_json(MODEL_NOT_FOUND_ERROR, status_code=404)
+        return await batch_predict_request(
+            request,
+            batcher,
+            get_input_features(model),
+            get_output_features(model),
+            partial(predict_entries, model),
+            executor,
+            retry_after_s
+        )
 
     return app
 
 
+def get_input_features(model):
+    return {f[NAME] for f in model.model_definition['input_features']}
+
+
+def get_output_features(model):
+    return {f[NAME] for f in model.model_definition['output_features']}
+
+
+def predict_batch(requests):
+    """Predicts the entries of (model, entry, output_features) requests,
+    the ones of the same model asking for the same output features
+    together."""
+    groups = {}
+    for position, (model, _, output_features) in enumerate(requests):
+        groups.setdefault(
+            (id(model), output_features), (model, output_features, [])
+        )[2].append(position)
+
+    results = [None] * len(requests)
+    for model, output_features, positions in groups.values():
+        resp, _ = model.predict(
+            dataset=[requests[position][1] for position in positions],
+            data_format=dict,
+            output_features=output_features
+        )
+        for position, result in zip(positions, resp.to_dict('records')):
+            results[position] = result
+    return results
+
+
+def predict_entries(model, entries, output_features=None):
+    data_format = 'df' if isinstance(entries, pd.DataFrame) else dict
+    predictions, _ = model.predict(
+        dataset=entries,
+        data_format=data_format,
+        output_features=output_features
+    )
+    return predictions
+
+
+def overloaded_response(retry_after_s):
+    return JSONResponse(
+        SERVER_OVERLOADED_ERROR,
+        status_code=503,
+        headers={'Retry-After': str(retry_after_s)}
+    )
+
+
+async def predict_request(
+        request,
+        model,
+        batcher,
+        input_features,
+        output_features,
+        retry_after_s
+):
+    if batcher.is_full():
+        return overloaded_response(retry_after_s)
+    try:
+        requested_output_features = get_requested_output_features(
+            request, output_features
+        )
+    except ValueError:
+        return JSONResponse(INVALID_OUTPUT_FEATURES_ERROR, status_code=400)
+    form = await request.form()
+    entry = convert_input(form)
+
+    if (entry.keys() & input_features) != input_features:
+        return JSONResponse(ALL_FEATURES_PRESENT_ERROR,
+                            status_code=400)
+    try:
+        return serialize_json(
+            await batcher.predict(
+                (model, entry, requested_output_features)
+            )
+        )
+    except QueueFullError:
+        return overloaded_response(retry_after_s)
+    except Exception as e:
+        logger.error("Error: {}".format(str(e)))
+        return JSONResponse(COULD_NOT_RUN_INFERENCE_ERROR,
+                            status_code=500)
+
+
+async def batch_predict_request(
+        request,
+        batcher,
+        input_features,
+        output_features,
+        predict_entries_fn,
+        executor,
+        retry_after_s
+):
+    if batcher.is_full():
+        return overloaded_response(retry_after_s)
+    response_format = get_batch_response_format(request)
+    if response_format not in BATCH_RESPONSE_FORMATS:
+        return serialize_json(UNSUPPORTED_RESPONSE_FORMAT_ERROR,
+                              status_code=400)
+    try:
+        requested_output_features = get_requested_output_features(
+            request, output_features
+        )
+    except ValueError:
+        return serialize_json(INVALID_OUTPUT_FEATURES_ERROR, status_code=400)
+
+    media_type = request.headers.get('content-type', JSON_MEDIA_TYPE)
+    media_type = media_type.split(';')[0].strip().lower()
+    if media_type not in (JSON_MEDIA_TYPE, CSV_MEDIA_TYPE,
+                          ARROW_STREAM_MEDIA_TYPE):
+        return serialize_json(UNSUPPORTED_MEDIA_TYPE_ERROR,
+                              status_code=415)
+    if pyarrow is None and (media_type == ARROW_STREAM_MEDIA_TYPE or
+                            response_format == ARROW):
+        return serialize_json(PYARROW_NOT_INSTALLED_ERROR,
+                              status_code=415)
+
+    try:
+        entries = read_batch(await request.body(), media_type)
+    except Exception as e:
+        logger.error("Error: {}".format(str(e)))
+        return serialize_json(INVALID_BATCH_ERROR, status_code=400)
+    if (get_batch_columns(entries) & input_features) != input_features:
+        return serialize_json(ALL_FEATURES_PRESENT_ERROR,
+                              status_code=400)
+
+    # the whole batch is predicted at once, sharing the executor
+    # of the single entries so the concurrency stays bounded
+    try:
+        predictions = await asyncio.get_event_loop().run_in_executor(
+            executor, predict_entries_fn, entries, requested_output_features
+        )
+    except Exception as e:
+        logger.error("Error: {}".format(str(e)))
+        return serialize_json(COULD_NOT_RUN_INFERENCE_ERROR,
+                              status_code=500)
+    return serialize_predictions(predictions, response_format)
+
+
+def is_model_dir(models_path, name):
+    # names are single directories, never paths out of models_path
+    return (
+            name not in ('', '.', '..') and
+            os.path.basename(name) == name and
+            os.path.isfile(os.path.join(
+                models_path, name, MODEL_HYPERPARAMETERS_FILE_NAME
+            ))
+    )
+
+
+def get_model_version(models_path, name):
+    """Changes whenever a file of the model is written."""
+    model_dir = os.path.join(models_path, name)
+    version = []
+    for file_name in sorted(os.listdir(model_dir)):
+        stat = os.stat(os.path.join(model_dir, file_name))
+        version.append((file_name, stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+
+def get_model_size(model):
+    """Bytes taken by the weights of the model."""
+    return sum(
+        int(np.prod(variable.shape)) * variable.dtype.size
+        for variable in model.model.variables
+    )
+
+
 def convert_input(form):
-    """Returns a new input and a list of files to be cleaned up"""
+    """Returns a new input, uploaded files are kept in memory as bytes"""
     new_input = {}
-    files = []
     for k, v in form.multi_items():
         if type(v) == UploadFile:
-            # Convert UploadFile to a NamedTemporaryFile to ensure it's on the disk
-            suffix = os.path.splitext(v.filename)[1]
-            named_file = tempfile.NamedTemporaryFile(
-                delete=False, suffix=suffix)
-            files.append(named_file)
-            named_file.write(v.file.read())
-            named_file.close()
-            new_input[k] = named_file.name
+            new_input[k] = v.file.read()
         else:
             new_input[k] = v
 
-    return files, new_input
+    return new_input
+
+
+def get_requested_output_features(request, output_features):
+    """The output features named in the comma separated output_features
+    query parameter, sorted, or None when all of them are requested."""
+    requested = request.query_params.get('output_features')
+    if not requested:
+        return None
+    requested = {name.strip() for name in requested.split(',')}
+    if not requested.issubset(output_features):
+        raise ValueError('Unknown output features: {}'.format(
+            ', '.join(sorted(requested - output_features))
+        ))
+    return tuple(sorted(requested))
+
+
+def get_batch_response_format(request):
+    """The format query parameter, otherwise Arrow when the Accept header
+    asks for it and JSON records by default."""
+    response_format = request.query_params.get('format')
+    if response_format is not None:
+        return response_format.lower()
+    if ARROW_STREAM_MEDIA_TYPE in request.headers.get('accept', ''):
+        return ARROW
+    return RECORDS
+
 
+def read_batch(body, media_type):
+    """Returns the entries of a /batch_predict request: a list of entries
+    or a dict of columns for JSON, a DataFrame for CSV and Arrow."""
+    if media_type == CSV_MEDIA_TYPE:
+        return pd.read_csv(io.BytesIO(body))
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        return pyarrow.ipc.open_stream(body).read_all().to_pandas()
+    entries = orjson.loads(body) if orjson is not None else json.loads(body)
+    if not isinstance(entries, (list, dict)):
+        raise ValueError('JSON batches must be arrays of entries or '
+                         'objects of columns')
+    return entries
 
-def run_server(model_path, host, port):
+
+def get_batch_columns(entries):
+    if isinstance(entries, list):
+        return set().union(*entries)
+    if isinstance(entries, dict):
+        return set(entries.keys())
+    return set(entries.columns)
+
+
+def serialize_json(content, status_code=200):
+    if orjson is None:
+        return JSONResponse(content, status_code=status_code)
+    return Response(
+        orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ),
+        status_code=status_code,
+        media_type=JSON_MEDIA_TYPE
+    )
+
+
+def serialize_predictions(predictions, response_format):
+    if response_format == ARROW:
+        table = pyarrow.Table.from_pandas(predictions, preserve_index=False)
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(sink.getvalue().to_pybytes(),
+                        media_type=ARROW_STREAM_MEDIA_TYPE)
+    if response_format == COLUMNS:
+        return serialize_json({
+            # orjson serializes numeric arrays without converting
+            # every value to a python object first
+            column: (values.values
+                     if orjson is not None and values.dtype.kind in 'biuf'
+                     else values.tolist())
+            for column, values in predictions.items()
+        })
+    return serialize_json(predictions.to_dict('records'))
+
+
+def run_server(
+        model_path,
+        host,
+        port,
+        max_batch_size=32,
+        max_latency_ms=5,
+        max_concurrency=1,
+        max_queue_size=1024,
+        retry_after_s=1,
+        warm_up_batch_sizes=None,
+        prediction_cache_size=None,
+        prediction_cache_ttl_s=None
+):
+    if warm_up_batch_sizes is None:
+        # the sizes of the batches of single and of concurrent requests
+        warm_up_batch_sizes = sorted({1, max_batch_size})
     model = LudwigModel.load(model_path)
-    app = server(model)
+    if prediction_cache_size:
+        model.enable_prediction_cache(
+            max_size=prediction_cache_size,
+            ttl_s=prediction_cache_ttl_s
+        )
+    app = server(
+        model,
+        max_batch_size=max_batch_size,
+        max_latency_ms=max_latency_ms,
+        max_concurrency=max_concurrency,
+        max_queue_size=max_queue_size,
+        retry_after_s=retry_after_s,
+        warm_up_batch_sizes=warm_up_batch_sizes
+    )
+    uvicorn.run(app, host=host, port=port)
+
+
+def run_multi_model_server(
+        models_path,
+        host,
+        port,
+        max_memory_mb=None,
+        reload_check_interval_s=1,
+        max_batch_size=32,
+        max_latency_ms=5,
+        max_concurrency=1,
+        max_queue_size=1024,
+        retry_after_s=1,
+        warm_up_batch_sizes=None,
+        prediction_cache_size=None,
+        prediction_cache_ttl_s=None
+):
+    if warm_up_batch_sizes is None:
+        warm_up_batch_sizes = sorted({1, max_batch_size})
+    app = multi_model_server(
+        models_path,
+        max_memory_mb=max_memory_mb,
+        reload_check_interval_s=reload_check_interval_s,
+        max_batch_size=max_batch_size,
+        max_latency_ms=max_latency_ms,
+        max_concurrency=max_concurrency,
+        max_queue_size=max_queue_size,
+        retry_after_s=retry_after_s,
+        warm_up_batch_sizes=warm_up_batch_sizes,
+        prediction_cache_size=prediction_cache_size,
+        prediction_cache_ttl_s=prediction_cache_ttl_s
+    )
     uvicorn.run(app, host=host, port=port)
 
 
@@ -122,11 +738,36 @@ def cli(sys_argv):
     # ----------------
     # Model parameters
     # ----------------
-    parser.add_argument(
+    model_group = parser.add_mutually_exclusive_group(required=True)
+    model_group.add_argument(
         '-m',
         '--model_path',
-        help='model to load',
-        required=True
+        help='model to load'
+    )
+    model_group.add_argument(
+        '-mp',
+        '--models_path',
+        help='directory of models to serve, each subdirectory is a model '
+             'served under /models/{name}, name being the subdirectory one'
+    )
+
+    parser.add_argument(
+        '-mmm',
+        '--max_memory_mb',
+        help='with --models_path, maximum memory in megabytes taken by the '
+             'weights of the loaded models, the least recently used ones '
+             'are unloaded beyond it (default: no limit)',
+        default=None,
+        type=float,
+    )
+
+    parser.add_argument(
+        '-rci',
+        '--reload_check_interval_s',
+        help='with --models_path, seconds between checks of the files of a '
+             'model, which is loaded again when they change (default: 1)',
+        default=1,
+        type=float,
     )
 
     parser.add_argument(
@@ -155,6 +796,80 @@ def cli(sys_argv):
         default='0.0.0.0'
     )
 
+    parser.add_argument(
+        '-mbs',
+        '--max_batch_size',
+        help='maximum number of concurrent requests predicted together '
+             '(default: 32)',
+        default=32,
+        type=int,
+    )
+
+    parser.add_argument(
+        '-mlms',
+        '--max_latency_ms',
+        help='maximum time in milliseconds a request waits for others '
+             'to be batched with (default: 5)',
+        default=5,
+        type=float,
+    )
+
+    parser.add_argument(
+        '-mc',
+        '--max_concurrency',
+        help='maximum number of batches predicted at the same time '
+             '(default: 1)',
+        default=1,
+        type=int,
+    )
+
+    parser.add_argument(
+        '-mqs',
+        '--max_queue_size',
+        help='maximum number of requests waiting to be predicted, further '
+             'ones get a 503 response (default: 1024)',
+        default=1024,
+        type=int,
+    )
+
+    parser.add_argument(
+        '-ra',
+        '--retry_after_s',
+        help='seconds clients are told to wait in the Retry-After header of '
+             '503 responses (default: 1)',
+        default=1,
+        type=int,
+    )
+
+    parser.add_argument(
+        '-wbs',
+        '--warm_up_batch_sizes',
+        help='batch sizes the model predicts synthetic entries with before '
+             'the server reports ready, none to skip the warm-up '
+             '(default: 1 and max_batch_size)',
+        default=None,
+        type=int,
+        nargs='*',
+    )
+
+    parser.add_argument(
+        '-pcs',
+        '--prediction_cache_size',
+        help='number of distinct entries whose predictions are cached, '
+             'repeated entries are not predicted again (default: 0, no '
+             'cache)',
+        default=0,
+        type=int,
+    )
+
+    parser.add_argument(
+        '-pct',
+        '--prediction_cache_ttl_s',
+        help='seconds a cached prediction is kept (default: no limit)',
+        default=None,
+        type=float,
+    )
+
     args = parser.parse_args(sys_argv)
 
     args.logging_level = logging_level_registry[args.logging_level]
@@ -166,7 +881,37 @@ def cli(sys_argv):
 
     print_ludwig('Serve', LUDWIG_VERSION)
 
-    run_server(args.model_path, args.host, args.port)
+    if args.models_path is not None:
+        run_multi_model_server(
+            args.models_path,
+            args.host,
+            args.port,
+            max_memory_mb=args.max_memory_mb,
+            reload_check_interval_s=args.reload_check_interval_s,
+            max_batch_size=args.max_batch_size,
+            max_latency_ms=args.max_latency_ms,
+            max_concurrency=args.max_concurrency,
+            max_queue_size=args.max_queue_size,
+            retry_after_s=args.retry_after_s,
+            warm_up_batch_sizes=args.warm_up_batch_sizes,
+            prediction_cache_size=args.prediction_cache_size,
+            prediction_cache_ttl_s=args.prediction_cache_ttl_s
+        )
+        return
+
+    run_server(
+        args.model_path,
+        args.host,
+        args.port,
+        max_batch_size=args.max_batch_size,
+        max_latency_ms=args.max_latency_ms,
+        max_concurrency=args.max_concurrency,
+        max_queue_size=args.max_queue_size,
+        retry_after_s=args.retry_after_s,
+        warm_up_batch_sizes=args.warm_up_batch_sizes,
+        prediction_cache_size=args.prediction_cache_size,
+        prediction_cache_ttl_s=args.prediction_cache_ttl_s
+    )
 
 
 if __name__ == '__main__':
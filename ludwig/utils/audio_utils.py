@@ -14,7 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+from functools import lru_cache
+
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 from scipy.signal import lfilter
 from scipy.signal.windows import get_window
 
@@ -29,6 +32,12 @@ def get_length_in_samp(sampling_rate_in_hz, length_in_s):
     return int(sampling_rate_in_hz * length_in_s)
 
 
+# All the get_* feature functions accept either a single clip of shape
+# (num_samples,) or a batch of clips of the same length of shape
+# (num_clips, num_samples), processed with one call to rfft, and return
+# features of shape (..., feature_dim, num_frames).
+
+
 def get_group_delay(raw_data, sampling_rate_in_hz, window_length_in_s,
                     window_shift_in_s, num_fft_points, window_type):
     X_stft_transform = _get_stft(raw_data, sampling_rate_in_hz,
@@ -49,7 +58,7 @@ def get_group_delay(raw_data, sampling_rate_in_hz, window_length_in_s,
     group_delay = np.divide(nominator, denominator + 1e-10)
     assert not np.isnan(
         group_delay).any(), 'There are NaN values in group delay'
-    return np.transpose(group_delay)
+    return np.swapaxes(group_delay, -1, -2)
 
 
 def get_phase_stft_magnitude(raw_data, sampling_rate_in_hz, window_length_in_s,
@@ -59,8 +68,8 @@ def get_phase_stft_magnitude(raw_data, sampling_rate_in_hz, window_length_in_s,
                      window_type=window_type)
     abs_stft = np.abs(stft)
     phase = np.angle(stft)
-    stft_phase = np.concatenate((phase, abs_stft), axis=1)
-    return np.transpose(stft_phase)
+    stft_phase = np.concatenate((phase, abs_stft), axis=-1)
+    return np.swapaxes(stft_phase, -1, -2)
 
 
 def get_stft_magnitude(raw_data, sampling_rate_in_hz, window_length_in_s,
@@ -69,7 +78,7 @@ def get_stft_magnitude(raw_data, sampling_rate_in_hz, window_length_in_s,
                      window_shift_in_s, num_fft_points,
                      window_type=window_type)
     stft_magnitude = np.abs(stft)
-    return np.transpose(stft_magnitude)
+    return np.swapaxes(stft_magnitude, -1, -2)
 
 
 ################################################################################
@@ -85,6 +94,17 @@ def get_fbank(raw_data, sampling_rate_in_hz, window_length_in_s,
                      window_type=window_type,
                      zero_mean_offset=True)
     stft_power = np.abs(stft) ** 2
+    mel_fbank_matrix = _get_cached_mel_fbank_matrix(sampling_rate_in_hz,
+                                                    num_fft_points,
+                                                    num_filter_bands)
+    mel_fbank_feature = np.dot(stft_power, np.transpose(mel_fbank_matrix))
+    log_mel_fbank_feature = np.log(mel_fbank_feature + 1.0e-10)
+    return np.swapaxes(log_mel_fbank_feature, -1, -2)
+
+
+@lru_cache(maxsize=32)
+def _get_cached_mel_fbank_matrix(sampling_rate_in_hz, num_fft_points,
+                                 num_filter_bands):
     upper_limit_freq = int(sampling_rate_in_hz / 2)
     upper_limit_mel = _convert_hz_to_mel(upper_limit_freq)
     lower_limit_mel = 0
@@ -93,9 +113,9 @@ def get_fbank(raw_data, sampling_rate_in_hz, window_length_in_s,
     mel_fbank_matrix = _get_mel_fbank_matrix(list_mel_points, num_filter_bands,
                                              num_fft_points,
                                              sampling_rate_in_hz)
-    mel_fbank_feature = np.dot(stft_power, np.transpose(mel_fbank_matrix))
-    log_mel_fbank_feature = np.log(mel_fbank_feature + 1.0e-10)
-    return np.transpose(log_mel_fbank_feature)
+    # shared by all the callers
+    mel_fbank_matrix.flags.writeable = False
+    return mel_fbank_matrix
 
 
 def _get_mel_fbank_matrix(list_mel_points, num_filter_bands, num_fft_points,
@@ -146,8 +166,7 @@ def _get_stft(raw_data, sampling_rate_in_hz, window_length_in_s,
                                          window_length_in_s, window_shift_in_s,
                                          num_fft_points, window_type,
                                          data_transformation, zero_mean_offset)
-    non_symmetric_stft = get_non_symmetric_data(stft)
-    return non_symmetric_stft
+    return stft
 
 
 def _short_time_fourier_transform(data, sampling_rate_in_hz,
@@ -168,28 +187,49 @@ def _short_time_fourier_transform(data, sampling_rate_in_hz,
         window_type,
         data_transformation=data_transformation
     )
-    fft = np.fft.fft(weighted_data_matrix, n=num_fft_points)
+    # only the non symmetric half of the spectrum is used
+    fft = np.fft.rfft(weighted_data_matrix, n=num_fft_points)
     return fft
 
 
 def _preprocess_to_padded_matrix(data, window_length_in_samp,
                                  window_shift_in_samp, zero_mean_offset=False):
-    num_input = data.shape[0]
+    """
+    Splits the last axis of data in frames of window_length_in_samp samples
+    every window_shift_in_samp samples, the last one padded with zeros.
+    Frames are a strided view of the data padded once, not copies.
+    """
+    num_input = data.shape[-1]
     num_output = get_num_output_padded_to_fit_input(num_input,
                                                     window_length_in_samp,
                                                     window_shift_in_samp)
-    zero_padded_matrix = np.zeros((num_output, window_length_in_samp),
-                                  dtype=np.float)
-    for num_output_idx in range(num_output):
-        start_idx = window_shift_in_samp * num_output_idx
-        is_last_output = num_output_idx == num_output - 1
-        end_idx = start_idx + window_length_in_samp if not is_last_output else num_input
-        end_padded_idx = window_length_in_samp if not is_last_output else end_idx - start_idx
-        window_data = data[start_idx:end_idx]
-        if zero_mean_offset:
-            window_data = window_data - np.mean(window_data)
-        zero_padded_matrix[num_output_idx, :end_padded_idx] = window_data
-    return zero_padded_matrix
+    if num_output <= 0:
+        # clips not longer than window_length_in_samp - window_shift_in_samp
+        return np.zeros(data.shape[:-1] + (0, window_length_in_samp),
+                        dtype=np.float64)
+    last_start_idx = window_shift_in_samp * (num_output - 1)
+    padded_data = np.zeros(
+        data.shape[:-1] + (last_start_idx + window_length_in_samp,),
+        dtype=np.float64
+    )
+    padded_data[..., :num_input] = data
+    sample_stride = padded_data.strides[-1]
+    frames = as_strided(
+        padded_data,
+        shape=data.shape[:-1] + (num_output, window_length_in_samp),
+        strides=padded_data.strides[:-1] + (
+            window_shift_in_samp * sample_stride, sample_stride
+        ),
+        writeable=False
+    )
+    if zero_mean_offset:
+        # the last frame is centered on the mean of its samples,
+        # its padding stays zero
+        means = frames.mean(axis=-1)
+        means[..., -1] = data[..., last_start_idx:].mean(axis=-1)
+        frames = frames - means[..., np.newaxis]
+        frames[..., -1, num_input - last_start_idx:] = 0
+    return frames
 
 
 def get_num_output_padded_to_fit_input(num_input, window_length_in_samp,
@@ -200,11 +240,21 @@ def get_num_output_padded_to_fit_input(num_input, window_length_in_samp,
 
 
 def _weight_data_matrix(data_matrix, window_type, data_transformation=None):
-    window_length_in_samp = data_matrix[0].shape[0]
+    window_length_in_samp = data_matrix.shape[-1]
+    window = _get_cached_window(window_type, window_length_in_samp,
+                                data_transformation)
+    return data_matrix * window
+
+
+@lru_cache(maxsize=32)
+def _get_cached_window(window_type, window_length_in_samp,
+                       data_transformation=None):
     window = get_window(window_type, window_length_in_samp, fftbins=False)
     if (data_transformation == 'group_delay'):
         window *= np.arange(window_length_in_samp)
-    return data_matrix * window
+    # shared by all the callers
+    window.flags.writeable = False
+    return window
 
 
 def get_non_symmetric_length(symmetric_length):
@@ -214,7 +264,7 @@ def get_non_symmetric_length(symmetric_length):
 def get_non_symmetric_data(data):
     num_fft_points = data.shape[-1]
     num_ess_fft_points = get_non_symmetric_length(num_fft_points)
-    return data[:, :num_ess_fft_points]
+    return data[..., :num_ess_fft_points]
 
 
 def get_max_length_stft_based(length_in_samp, window_length_in_s,
@@ -234,3 +284,18 @@ def calculate_incr_var(var_prev, mean_prev, mean, length):
 
 def calculate_incr_mean(count, mean, length):
     return mean + (length - mean) / float(count)
+
+
+def merge_incr_stats(count_a, mean_a, var_a, count_b, mean_b, var_b):
+    """
+    Merges the count, mean and var, the sum of squared differences from the
+    mean as accumulated by calculate_incr_var, of two disjoint sets of
+    values, as if all the values were accumulated one after the other.
+    """
+    count = count_a + count_b
+    if count == 0:
+        return 0, 0, 0
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / float(count)
+    var = var_a + var_b + delta ** 2 * count_a * count_b / float(count)
+    return count, mean, var
@@ -60,6 +60,15 @@ class Batcher(object):
 
         self.index += self.batch_size
         self.step += 1
+        if not self.last_batch():
+            self.dataset.prefetch(range(
+                self.index,
+                min(self.index + self.batch_size, self.total_size)
+            ))
+        else:
+            # the pass is over, the loading threads are not needed
+            # until the next one
+            self.dataset.close()
         return sub_batch
 
     def last_batch(self):
@@ -212,6 +221,15 @@ class DistributedBatcher(object):
 
         self.index += self.batch_size
         self.step += 1
+        if not self.last_batch():
+            self.dataset.prefetch(range(
+                self.index,
+                min(self.index + self.batch_size, self.max_index)
+            ))
+        else:
+            # the pass is over, the loading threads are not needed
+            # until the next one
+            self.dataset.close()
         return sub_batch
 
     def last_batch(self):
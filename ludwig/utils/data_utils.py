@@ -14,15 +14,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import bz2
 import collections
+import contextlib
 import csv
 import functools
+import gzip
+import io
 import json
 import logging
+import lzma
 import os.path
 import pickle
 import random
 import re
+import sys
+import warnings
+import zipfile
 
 import h5py
 import numpy as np
@@ -41,15 +49,31 @@ DICT_FORMATS = {'dict', 'dictionary', dict}
 DATAFRAME_FORMATS = {'dataframe', 'df', pd.DataFrame}
 CSV_FORMATS = {'csv'}
 HDF5_FORMATS = {'hdf5', 'h5'}
+PARQUET_FORMATS = {'parquet'}
+FEATHER_FORMATS = {'feather', 'arrow'}
+# raw datasets stored in a file, read into a DataFrame and preprocessed
+FILE_FORMATS = CSV_FORMATS | PARQUET_FORMATS | FEATHER_FORMATS
+# CSV files can be read compressed, pandas infers the codec from these
+COMPRESSION_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zip')
 
 
 def get_abs_path(data_csv_path, file_path):
-    if data_csv_path is not None:
+    # file contents held in memory as bytes, e.g. uploaded to the server,
+    # have no path
+    if data_csv_path is not None and not isinstance(file_path, bytes):
         return os.path.join(data_csv_path, file_path)
     else:
         return file_path
 
 
+def file_or_path(file_path):
+    """Wraps file contents held in memory as bytes in a file object, so
+    they can be read by the libraries expecting a path or a file."""
+    if isinstance(file_path, bytes):
+        return io.BytesIO(file_path)
+    return file_path
+
+
 def load_csv(data_fp):
     data = []
     with open(data_fp, 'rb') as f:
@@ -57,40 +81,336 @@ def load_csv(data_fp):
     return data
 
 
-def read_csv(data_fp, header=0, nrows=None, skiprows=None):
+@contextlib.contextmanager
+def _open_csv_text(data_fp):
+    """Opens a possibly compressed CSV file as text."""
+    extension = os.path.splitext(data_fp)[1].lower()
+    if extension == '.gz':
+        f = gzip.open(data_fp, 'rt', encoding='utf8')
+    elif extension == '.bz2':
+        f = bz2.open(data_fp, 'rt', encoding='utf8')
+    elif extension == '.xz':
+        f = lzma.open(data_fp, 'rt', encoding='utf8')
+    elif extension == '.zip':
+        with zipfile.ZipFile(data_fp) as zip_file:
+            # like pandas, the archive must contain a single file
+            with zip_file.open(zip_file.namelist()[0]) as member:
+                yield io.TextIOWrapper(member, encoding='utf8')
+        return
+    else:
+        f = open(data_fp, 'r', encoding='utf8')
+    with f:
+        yield f
+
+
+def sniff_csv_separator(data_fp):
+    separator = ','
+    with _open_csv_text(data_fp) as csvfile:
+        try:
+            dialect = csv.Sniffer().sniff(csvfile.read(1024 * 100),
+                                          delimiters=[',', '\t', '|'])
+            separator = dialect.delimiter
+        except csv.Error:
+            # Could not conclude the delimiter, defaulting to comma
+            pass
+    return separator
+
+
+def read_csv(data_fp, header=0, nrows=None, skiprows=None, usecols=None,
+             dtype=None, engine=None, sep=None):
     """
     Helper method to read a csv file. Wraps around pd.read_csv to handle some
     exceptions. Can extend to cover cases as necessary
-    :param data_fp: path to the csv file
+    :param data_fp: path to the csv file, possibly compressed
     :param header: header argument for pandas to read the csv
     :param nrows: number of rows to read from the csv, None means all
     :param skiprows: number of rows to skip from the csv, None means no skips
+    :param usecols: columns to read, None means all
+    :param dtype: dtype of each column, None means inferred
+    :param engine: pandas parser engine, 'pyarrow' falls back to the
+           default one when not available
+    :param sep: separator, None means sniffed from the beginning of the file
     :return: Pandas dataframe with the data
     """
+    separator = sep if sep is not None else sniff_csv_separator(data_fp)
+    kwargs = dict(sep=separator, header=header, nrows=nrows,
+                  skiprows=skiprows, usecols=usecols, dtype=dtype)
 
-    separator = ','
-    with open(data_fp, 'r', encoding="utf8") as csvfile:
+    if engine == 'pyarrow':
         try:
-            dialect = csv.Sniffer().sniff(csvfile.read(1024 * 100),
-                                          delimiters=[',', '\t', '|'])
-            separator = dialect.delimiter
-        except csv.Error:
-            # Could not conclude the delimiter, defaulting to comma
-            pass
+            return pd.read_csv(data_fp, engine='pyarrow', **kwargs)
+        except (ImportError, ValueError) as e:
+            logger.warning('Failed to parse the CSV with the pyarrow engine'
+                           ' ({}), using the default one.'.format(e))
 
     try:
-        df = pd.read_csv(data_fp, sep=separator, header=header,
-                         nrows=nrows, skiprows=skiprows)
+        df = pd.read_csv(data_fp, **kwargs)
     except ParserError:
         logger.warning('Failed to parse the CSV with pandas default way,'
                        ' trying \\ as escape character.')
-        df = pd.read_csv(data_fp, sep=separator, header=header,
-                         escapechar='\\',
-                         nrows=nrows, skiprows=skiprows)
+        df = pd.read_csv(data_fp, escapechar='\\', **kwargs)
 
     return df
 
 
+def iter_csv_chunks(data_fp, chunk_size, usecols=None, dtype=None,
+                    engine=None, sep=None):
+    """
+    Reads a csv file in DataFrames of at most chunk_size rows, with the same
+    options and the same \\ escape character fallback as read_csv.
+    The pyarrow engine can't read in chunks, the default one is used instead.
+    """
+    separator = sep if sep is not None else sniff_csv_separator(data_fp)
+    kwargs = dict(sep=separator, usecols=usecols, dtype=dtype,
+                  chunksize=chunk_size)
+    if engine is not None and engine != 'pyarrow':
+        kwargs['engine'] = engine
+
+    # the chunked parser doesn't raise on rows with too many fields, so
+    # the escape character is decided once for the whole file beforehand
+    if _csv_has_extra_fields(data_fp, separator):
+        logger.warning('Failed to parse the CSV with pandas default way,'
+                       ' trying \\ as escape character.')
+        kwargs['escapechar'] = '\\'
+
+    with contextlib.closing(pd.read_csv(data_fp, **kwargs)) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def _csv_has_extra_fields(data_fp, separator):
+    """Returns True if a row of a csv file has more fields than its header,
+    e.g. because of separators escaped with \\. The file is tokenized one
+    row at a time, without keeping it in memory."""
+    with _open_csv_text(data_fp) as csvfile:
+        reader = csv.reader(csvfile, delimiter=separator)
+        try:
+            num_fields = len(next(reader, []))
+            return any(len(row) > num_fields for row in reader)
+        except csv.Error:
+            # e.g. fields larger than the csv module limit,
+            # left to pandas
+            return False
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        logger.error(
+            ' pyarrow is not installed. '
+            'In order to read Parquet and Feather datasets run '
+            'pip install pyarrow'
+        )
+        sys.exit(-1)
+    return pyarrow
+
+
+def _projected_columns(available_columns, columns, optional_columns=()):
+    """Returns the columns to read, in file order, or None for all of
+    them. optional_columns are read only if present in the file."""
+    if columns is None:
+        return None
+    requested = set(columns) | (set(optional_columns) &
+                                set(available_columns))
+    missing = set(columns) - set(available_columns)
+    if missing:
+        raise ValueError(
+            'Columns {} are not present in the dataset'.format(
+                sorted(missing)
+            )
+        )
+    return [column for column in available_columns if column in requested]
+
+
+def read_parquet(data_fp, columns=None, optional_columns=()):
+    """
+    Reads a Parquet file into a DataFrame keeping the native types of the
+    columns, numbers stay numbers and lists stay lists.
+    :param data_fp: path to the parquet file
+    :param columns: columns to read, None means all
+    :param optional_columns: columns read only if they are in the file
+    :return: Pandas dataframe with the data
+    """
+    _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(data_fp)
+    columns = _projected_columns(
+        parquet_file.schema_arrow.names, columns, optional_columns
+    )
+    return parquet_file.read(columns=columns).to_pandas()
+
+
+def read_parquet_row_groups(data_fp, columns=None, optional_columns=()):
+    """
+    Yields the row groups of a Parquet file as DataFrames, so that files
+    larger than memory can be processed in chunks.
+    """
+    _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(data_fp)
+    columns = _projected_columns(
+        parquet_file.schema_arrow.names, columns, optional_columns
+    )
+    for i in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(i, columns=columns).to_pandas()
+
+
+def read_feather(data_fp, columns=None, optional_columns=()):
+    """
+    Reads a Feather / Arrow IPC file into a DataFrame keeping the native
+    types of the columns. Uncompressed files are memory mapped.
+    :param data_fp: path to the feather file
+    :param columns: columns to read, None means all
+    :param optional_columns: columns read only if they are in the file
+    :return: Pandas dataframe with the data
+    """
+    return _read_feather_table(data_fp, columns, optional_columns).to_pandas()
+
+
+def _read_feather_table(data_fp, columns=None, optional_columns=()):
+    pyarrow = _import_pyarrow()
+    import pyarrow.feather as feather
+    import pyarrow.ipc
+
+    try:
+        # only the schema, compressed columns are not decompressed
+        with pyarrow.memory_map(data_fp) as source:
+            column_names = pyarrow.ipc.open_file(source).schema.names
+    except pyarrow.ArrowInvalid:
+        # Feather V1 files are not IPC files, they are never compressed
+        # and reading them memory mapped costs little
+        column_names = feather.read_table(
+            data_fp, memory_map=True
+        ).column_names
+    columns = _projected_columns(column_names, columns, optional_columns)
+    return feather.read_table(data_fp, columns=columns, memory_map=True)
+
+
+def read_data_file(data_fp, data_format, columns=None, optional_columns=(),
+                   dtype=None, csv_engine=None):
+    """
+    Reads a raw dataset file in one of the FILE_FORMATS into a DataFrame,
+    only the requested columns. dtype hints the types of CSV columns,
+    columnar formats keep the types they are stored with.
+    """
+    if data_format in CSV_FORMATS:
+        separator = sniff_csv_separator(data_fp)
+        usecols = _projected_columns(
+            read_csv(data_fp, nrows=0, sep=separator).columns,
+            columns,
+            optional_columns
+        )
+        if dtype is not None and usecols is not None:
+            dtype = {column: column_dtype
+                     for column, column_dtype in dtype.items()
+                     if column in usecols}
+        return read_csv(data_fp, usecols=usecols, dtype=dtype,
+                        engine=csv_engine, sep=separator)
+    elif data_format in PARQUET_FORMATS:
+        return read_parquet(data_fp, columns, optional_columns)
+    elif data_format in FEATHER_FORMATS:
+        return read_feather(data_fp, columns, optional_columns)
+    raise ValueError('{} is not a valid file data format.'.format(
+        data_format
+    ))
+
+
+def iter_data_file_chunks(data_fp, data_format, chunk_size, columns=None,
+                          optional_columns=(), dtype=None, csv_engine=None):
+    """
+    Yields a raw dataset file in one of the FILE_FORMATS as DataFrames of
+    at most chunk_size rows, reading only the requested columns, so that
+    files larger than memory can be processed.
+    """
+    if data_format in CSV_FORMATS:
+        separator = sniff_csv_separator(data_fp)
+        usecols = _projected_columns(
+            read_csv(data_fp, nrows=0, sep=separator).columns,
+            columns,
+            optional_columns
+        )
+        if dtype is not None and usecols is not None:
+            dtype = {column: column_dtype
+                     for column, column_dtype in dtype.items()
+                     if column in usecols}
+        for chunk in iter_csv_chunks(data_fp, chunk_size, usecols=usecols,
+                                     dtype=dtype, engine=csv_engine,
+                                     sep=separator):
+            yield chunk
+    elif data_format in PARQUET_FORMATS:
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(data_fp)
+        if not hasattr(parquet_file, 'iter_batches'):
+            # pyarrow < 3, row groups are the smallest unit that can be read
+            for chunk in read_parquet_row_groups(data_fp, columns,
+                                                 optional_columns):
+                yield chunk
+            return
+        columns = _projected_columns(
+            parquet_file.schema_arrow.names, columns, optional_columns
+        )
+        for batch in parquet_file.iter_batches(batch_size=chunk_size,
+                                               columns=columns):
+            yield batch.to_pandas()
+    elif data_format in FEATHER_FORMATS:
+        # memory mapped, slices are converted one at a time
+        table = _read_feather_table(data_fp, columns, optional_columns)
+        for start in range(0, table.num_rows, chunk_size):
+            yield table.slice(start, chunk_size).to_pandas()
+    else:
+        raise ValueError('{} is not a valid file data format.'.format(
+            data_format
+        ))
+
+
+def save_data_chunks(chunks, data_fp, data_format=None):
+    """
+    Writes DataFrames to a CSV or Parquet file as they are produced, so only
+    one of them is in memory at a time. The format is figured out from the
+    file extension if not provided.
+    :return: number of rows written
+    """
+    if data_format is None:
+        data_format = figure_data_format_dataset(data_fp)
+
+    num_rows = 0
+    if data_format in CSV_FORMATS:
+        with open(data_fp, 'w', encoding='utf-8', newline='') as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, header=i == 0, index=False)
+                num_rows += len(chunk)
+    elif data_format in PARQUET_FORMATS:
+        pyarrow = _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(data_fp, table.schema)
+                else:
+                    # e.g. columns that were all missing in the first chunk
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+                num_rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        raise ValueError(
+            'Chunks can be saved only as csv or parquet, not {}'.format(
+                data_format
+            )
+        )
+    return num_rows
+
+
 def save_csv(data_fp, data):
     with open(data_fp, 'w', encoding='utf-8') as csv_file:
         writer = csv.writer(csv_file)
@@ -181,6 +501,64 @@ def save_array(data_fp, array):
             output_file.write(str(x) + '\n')
 
 
+def is_native_sequence_column(column):
+    """Returns True if the column holds lists or arrays, for instance when
+    it comes from a DataFrame or Parquet file, instead of strings."""
+    return (len(column) > 0 and
+            isinstance(column.iloc[0], (list, tuple, np.ndarray)))
+
+
+def number_sequence_lengths(column):
+    """Returns the number of whitespace separated values in each row of a
+    column of strings, or the length of each row of a native list column."""
+    if is_native_sequence_column(column):
+        return column.map(len).values
+    return column.str.count(r'\S+').values
+
+
+def parse_number_sequences(column):
+    """Parses a column of whitespace separated numbers, or of native lists
+    or arrays of numbers, without splitting each row into Python strings.
+    The string rows are joined and parsed with a single np.fromstring call.
+
+    :param column: pandas Series
+    :return: flat float32 array with the values of all the rows and the
+             number of values of each row, or None if the column can't be
+             parsed in bulk and the caller should fall back to a per row
+             parser to get the appropriate error.
+    """
+    if is_native_sequence_column(column):
+        try:
+            lengths = column.map(len).values
+            values = np.concatenate(
+                [np.ravel(np.asarray(x, dtype=np.float32)) for x in column]
+            )
+        except (TypeError, ValueError):
+            return None
+        if len(values) != lengths.sum():
+            return None
+        return values, lengths
+
+    if (column.dtype != object or
+            pd.api.types.infer_dtype(column, skipna=False) != 'string'):
+        return None
+
+    lengths = number_sequence_lengths(column)
+    with warnings.catch_warnings():
+        # numpy warns instead of raising when it can't parse a token
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = np.fromstring(
+                ' '.join(column), dtype=np.float64, sep=' '
+            )
+        except (DeprecationWarning, ValueError):
+            return None
+    # a token parsed as more than one number, e.g. 1-2, is not valid
+    if len(values) != lengths.sum():
+        return None
+    return values.astype(np.float32), lengths
+
+
 def load_pretrained_embeddings(embeddings_path, vocab):
     embeddings = load_glove(embeddings_path)
 
@@ -377,7 +755,11 @@ def replace_file_extension(file_path, extension):
         # Handle the case if the user calls with '.hdf5' instead of 'hdf5'
         extension = extension.replace('.', '').strip()
 
-    return os.path.splitext(file_path)[0] + '.' + extension
+    file_path, file_extension = os.path.splitext(file_path)
+    if file_extension.lower() in COMPRESSION_EXTENSIONS:
+        # a.csv.gz, hdf5 -> a.hdf5
+        file_path = os.path.splitext(file_path)[0]
+    return file_path + '.' + extension
 
 
 def file_exists_with_diff_extension(file_path, extension):
@@ -490,10 +872,16 @@ def figure_data_format_dataset(dataset):
         return dict
     elif isinstance(dataset, str):
         dataset = dataset.lower()
+        if dataset.endswith(COMPRESSION_EXTENSIONS):
+            dataset = os.path.splitext(dataset)[0]
         if dataset.endswith('.csv'):
             return 'csv'
         elif dataset.endswith('.h5') or dataset.endswith('.hdf5'):
             return 'hdf5'
+        elif dataset.endswith('.parquet') or dataset.endswith('.pq'):
+            return 'parquet'
+        elif dataset.endswith('.feather') or dataset.endswith('.arrow'):
+            return 'feather'
         else:
             raise ValueError(
                 "Dataset path string {} "
@@ -14,6 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import numpy as np
+
+
 def set_bit(v, index, x):
     """Set the index:th bit of v to 1 if x is truthy, else to 0, and return the new value."""
     mask = 1 << index  # Compute mask, an integer with just bit 'index' set.
@@ -95,6 +98,36 @@ def h3_to_components(h3_value):
     }
 
 
+def bitslice_array(x, start_bit, slice_length):
+    ones_mask = np.uint64(2 ** slice_length - 1)
+    return (x >> np.uint64(start_bit)) & ones_mask
+
+
+def h3_to_components_matrix(h3_values, max_resolution=15, padding_value=7):
+    '''
+    Vectorized version of h3_to_components for an array of H3 values.
+    Returns a uint8 matrix with one row per value laid out as
+    [mode, edge, resolution, base_cell, cells...], where the cells beyond
+    the resolution of each value are filled with padding_value.
+    '''
+    # int64 values are reinterpreted, so the bits are the same
+    # python sees when slicing them
+    h3_values = np.asarray(h3_values).astype(np.uint64)
+
+    matrix = np.empty((len(h3_values), max_resolution + 4), dtype=np.uint8)
+    matrix[:, 0] = bitslice_array(h3_values, 64 - 5, 4)
+    matrix[:, 1] = bitslice_array(h3_values, 64 - 8, 3)
+    matrix[:, 2] = bitslice_array(h3_values, 64 - 12, 4)
+    matrix[:, 3] = bitslice_array(h3_values, 64 - 19, 7)
+    for i in range(1, max_resolution + 1):
+        matrix[:, 3 + i] = bitslice_array(h3_values, 64 - 19 - 3 * i, 3)
+
+    cell_indices = np.arange(1, max_resolution + 1)
+    padding_mask = cell_indices[np.newaxis, :] > matrix[:, 2:3]
+    matrix[:, 4:][padding_mask] = padding_value
+    return matrix
+
+
 if __name__ == '__main__':
     value = 622236723497533439
     components = h3_to_components(value)
@@ -14,16 +14,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import hashlib
 import logging
+import os
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from math import floor, ceil
 
 import numpy as np
 
 from ludwig.constants import CROP_OR_PAD, INTERPOLATE
+from ludwig.utils.data_utils import file_or_path
 
 logger = logging.getLogger(__name__)
 
+PILLOW = 'pillow'
+SKIMAGE = 'skimage'
+IMAGE_BACKENDS = (PILLOW, SKIMAGE)
+
 
 def pad(img, size, axis):
     old_size = img.shape[axis]
@@ -58,10 +68,48 @@ def crop_or_pad(img, new_size_tuple):
     return img
 
 
-def resize_image(img, new_size_typle, resize_method):
+def get_image_backend(backend=None):
+    """Returns the backend used to decode and resize images, None selects
+    the fastest one installed."""
+    if backend is None:
+        return PILLOW if _is_pillow_installed() else SKIMAGE
+    if backend not in IMAGE_BACKENDS:
+        raise ValueError(
+            'Invalid image backend: {}. Valid backends are {}'.format(
+                backend, IMAGE_BACKENDS
+            )
+        )
+    return backend
+
+
+def _is_pillow_installed():
     try:
-        from skimage import img_as_ubyte
-        from skimage.transform import resize
+        import PIL
+        return True
+    except ImportError:
+        return False
+
+
+def read_image(filepath, backend=None, min_size=None):
+    """
+    Decodes the image at filepath into a uint8 array.
+
+    :param filepath: path to the image, or its contents as bytes
+    :param backend: image backend, see get_image_backend
+    :param min_size: (height, width) the image is going to be resized to.
+           When provided the pillow backend decodes JPEGs directly at the
+           smallest reduced resolution (1/2, 1/4 or 1/8, computed in the DCT
+           domain) that is still at least min_size, skipping most of the
+           decoding work for large photos.
+    :return: array of shape (height, width) or (height, width, channels)
+    """
+    if get_image_backend(backend) == PILLOW:
+        img = _read_image_pillow(file_or_path(filepath), min_size)
+        if img is not None:
+            return img
+
+    try:
+        from skimage.io import imread
     except ImportError:
         logger.error(
             ' scikit-image is not installed. '
@@ -70,16 +118,79 @@ def resize_image(img, new_size_typle, resize_method):
         )
         sys.exit(-1)
 
+    return imread(file_or_path(filepath))
+
+
+def _read_image_pillow(filepath, min_size=None):
+    from PIL import Image
+
+    with Image.open(filepath) as pil_img:
+        if min_size is not None and pil_img.format == 'JPEG':
+            pil_img.draft(pil_img.mode, (min_size[1], min_size[0]))
+
+        # same conversions skimage.io.imread applies, with imageio palette
+        # images are RGB even with a transparent color
+        if pil_img.mode == 'P':
+            pil_img = pil_img.convert('RGB')
+        elif pil_img.mode == '1':
+            pil_img = pil_img.convert('L')
+        elif pil_img.mode in ('CMYK', 'YCbCr'):
+            pil_img = pil_img.convert('RGB')
+        elif pil_img.mode not in ('L', 'LA', 'RGB', 'RGBA'):
+            # e.g. 16 bit images, left to skimage
+            return None
+
+        return np.array(pil_img)
+
+
+def resize_image(img, new_size_typle, resize_method, backend=None):
     if tuple(img.shape[:2]) != new_size_typle:
         if resize_method == CROP_OR_PAD:
             return crop_or_pad(img, new_size_typle)
         elif resize_method == INTERPOLATE:
-            return img_as_ubyte(resize(img, new_size_typle))
+            if (get_image_backend(backend) == PILLOW and
+                    img.dtype == np.uint8):
+                return _resize_image_pillow(img, new_size_typle)
+            return _resize_image_skimage(img, new_size_typle)
         raise ValueError(
             'Invalid image resize method: {}'.format(resize_method))
     return img
 
 
+def _resize_image_pillow(img, new_size_tuple):
+    # resizes in the uint8 domain, without the conversion to float
+    from PIL import Image
+
+    pil_size = (new_size_tuple[1], new_size_tuple[0])
+    if img.shape[2] == 3:
+        return np.asarray(
+            Image.fromarray(img).resize(pil_size, Image.BILINEAR)
+        )
+    # channels are resized one by one as grayscale images, so alpha is not
+    # premultiplied and any number of channels is supported
+    return np.stack(
+        [np.asarray(Image.fromarray(np.ascontiguousarray(img[:, :, c]))
+                    .resize(pil_size, Image.BILINEAR))
+         for c in range(img.shape[2])],
+        axis=2
+    )
+
+
+def _resize_image_skimage(img, new_size_tuple):
+    try:
+        from skimage import img_as_ubyte
+        from skimage.transform import resize
+    except ImportError:
+        logger.error(
+            ' scikit-image is not installed. '
+            'In order to install all image feature dependencies run '
+            'pip install ludwig[image]'
+        )
+        sys.exit(-1)
+
+    return img_as_ubyte(resize(img, new_size_tuple))
+
+
 def greyscale(img):
     try:
         from skimage import img_as_ubyte
@@ -103,3 +214,211 @@ def num_channels_in_image(img):
         return 1
     else:
         return img.shape[2]
+
+
+class ImageLoader:
+    """
+    Decodes images from their file paths at batch time, for image features
+    preprocessed with lazy_load, where the dataset only holds the paths.
+
+    Images are decoded by a pool of threads, the decoding libraries release
+    the GIL, so the decoded arrays don't need to be pickled between
+    processes. The images of the next batch can be prefetched while the
+    current one is used and up to cache_size decoded images are kept in a
+    least recently used cache.
+
+    The threads are started by the first load or prefetch and stopped by
+    close, e.g. once a pass over the dataset is done. The loader can still
+    be used after close, it starts them again.
+    """
+
+    def __init__(self, read_image_fn, image_shape, num_workers=1,
+                 cache_size=0):
+        self._read_image_fn = read_image_fn
+        self._image_shape = tuple(image_shape)
+        self._num_workers = max(1, num_workers)
+        self._executor = None
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._prefetched = set()
+        self._lock = threading.Lock()
+
+    def load(self, file_paths):
+        file_paths = [_decode_path(path) for path in file_paths]
+        self._submit(file_paths)
+        images = np.empty(
+            (len(file_paths),) + self._image_shape,
+            dtype=np.uint8
+        )
+        loaded = {}
+        for i, path in enumerate(file_paths):
+            if path not in loaded:
+                loaded[path] = self._get(path)
+            images[i] = loaded[path]
+        return images
+
+    def prefetch(self, file_paths):
+        """Starts decoding file_paths in the background. Images prefetched
+        earlier and never loaded are cancelled if still queued."""
+        with self._lock:
+            for path in self._prefetched:
+                future = self._pending.get(path)
+                if future is not None and future.cancel():
+                    del self._pending[path]
+        file_paths = [_decode_path(path) for path in file_paths]
+        submitted = self._submit(file_paths)
+        with self._lock:
+            self._prefetched = set(submitted)
+
+    def _submit(self, file_paths):
+        submitted = []
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._num_workers
+                )
+            for path in file_paths:
+                if path not in self._cache and path not in self._pending:
+                    self._pending[path] = self._executor.submit(
+                        self._read_image_fn, path
+                    )
+                    submitted.append(path)
+        return submitted
+
+    def _get(self, path):
+        with self._lock:
+            if path in self._cache:
+                self._cache.move_to_end(path)
+                return self._cache[path]
+            future = self._pending.get(path)
+        if future is None:
+            # cancelled by a prefetch in the meantime
+            img = self._read_image_fn(path)
+        else:
+            img = future.result()
+        with self._lock:
+            self._pending.pop(path, None)
+            self._prefetched.discard(path)
+            if self._cache_size > 0:
+                self._cache[path] = img
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return img
+
+    def close(self):
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._prefetched = set()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+def _decode_path(path):
+    # paths saved to hdf5 are read back as bytes
+    if isinstance(path, bytes):
+        return path.decode('utf-8')
+    return path
+
+
+class DiskImageCache:
+    """
+    On disk cache of decoded and resized images shared across preprocessing
+    runs and processes. Each image is stored as a .npy file, that can be
+    memory mapped, named after a hash of the absolute path, modification time
+    and size of the source file and of the parameters that determine the
+    decoded array, so changing the file or the parameters is a cache miss.
+
+    Files are written atomically, so concurrent workers can share the cache.
+    Hits refresh the modification time of the entry, and evict() removes the
+    least recently used entries until the cache fits in max_size bytes.
+    """
+
+    def __init__(self, cache_dir, max_size, key_params=()):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.key_params = tuple(key_params)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, filepath):
+        stat = os.stat(filepath)
+        key = repr((
+            os.path.abspath(filepath),
+            stat.st_mtime_ns,
+            stat.st_size
+        ) + self.key_params)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + '.npy')
+
+    def get(self, filepath):
+        entry_path = self._entry_path(filepath)
+        try:
+            img = np.load(entry_path, mmap_mode='r')
+        except (OSError, ValueError):
+            # missing or partially evicted
+            return None
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return img
+
+    def put(self, filepath, img):
+        entry_path = self._entry_path(filepath)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        tmp_path = '{}.{}.tmp'.format(entry_path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            np.save(f, img)
+        os.replace(tmp_path, entry_path)
+
+    def evict(self):
+        entries = []
+        total_size = 0
+        for root, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                if not file_name.endswith('.npy'):
+                    continue
+                entry_path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(entry_path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+                total_size += stat.st_size
+
+        if total_size <= self.max_size:
+            return
+        entries.sort()
+        for _, size, entry_path in entries:
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+        logger.debug('Image cache {} evicted to {} bytes'.format(
+            self.cache_dir, total_size
+        ))
+
+
+class CachedImageReader:
+    """Wraps a function reading an image from its path with a
+    DiskImageCache. Picklable, so it can be used by worker processes."""
+
+    def __init__(self, read_image_fn, cache):
+        self.read_image_fn = read_image_fn
+        self.cache = cache
+
+    def __call__(self, filepath):
+        if isinstance(filepath, bytes):
+            # contents held in memory, there is no file to key them by
+            return self.read_image_fn(filepath)
+        img = self.cache.get(filepath)
+        if img is None:
+            img = self.read_image_fn(filepath)
+            self.cache.put(filepath, img)
+        return img
@@ -20,6 +20,9 @@ logger = logging.getLogger(__name__)
 class LudwigNeuropodModelWrapper:
     def __init__(self, data_root):
         self.ludwig_model = LudwigModel.load(data_root)
+        # small inputs are preprocessed without pandas,
+        # with lookup tables and tokenizers built here once
+        self.ludwig_model.get_inference_preprocessor()
 
     def __call__(self, **kwargs):
         data_dict = kwargs
@@ -0,0 +1,171 @@
+#! /usr/bin/env python
+# coding=utf-8
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# missing values, None or NaN, are the same input
+_MISSING = b'\x00'
+
+
+def _update_hash(hash_, value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        hash_.update(_MISSING)
+    elif isinstance(value, (bytes, bytearray)):
+        # uploaded images and audio
+        hash_.update(b'\x01%d:' % len(value))
+        hash_.update(value)
+    elif isinstance(value, np.ndarray):
+        header = '{}{}:'.format(value.dtype.str, value.shape).encode()
+        hash_.update(b'\x02' + header)
+        hash_.update(np.ascontiguousarray(value).tobytes())
+    else:
+        # repr tells apart values that preprocess differently,
+        # like 1 and '1' or 1 and 1.0 for categories
+        representation = repr(value).encode()
+        hash_.update(b'\x03%d:' % len(representation))
+        hash_.update(representation)
+
+
+def hash_row(values, model_version):
+    """Returns a digest identifying the predictions of a row with these
+    input feature values by the given version of a model."""
+    hash_ = hashlib.blake2b(str(model_version).encode(), digest_size=16)
+    for value in values:
+        _update_hash(hash_, value)
+    return hash_.digest()
+
+
+def get_row_keys(dataset, feature_names, model_version):
+    """Returns the hash_row key of each row of dataset, a DataFrame, a dict
+    of columns or a list of dicts."""
+    if isinstance(dataset, list):
+        rows = ([row.get(name) for name in feature_names] for row in dataset)
+    else:
+        rows = zip(*[dataset[name] for name in feature_names])
+    return [hash_row(values, model_version) for values in rows]
+
+
+def take_rows(dataset, positions):
+    """Returns the rows of dataset at positions, in the same format."""
+    if isinstance(dataset, list):
+        return [dataset[position] for position in positions]
+    if isinstance(dataset, dict):
+        return {name: [values[position] for position in positions]
+                for name, values in dataset.items()}
+    rows = dataset.iloc[positions].reset_index(drop=True)
+    if hasattr(dataset, 'csv'):
+        # relative paths of image and audio files
+        rows.csv = dataset.csv
+    return rows
+
+
+class PredictionCache:
+    """
+    Keeps the predictions of the last max_size distinct rows predicted,
+    each one for at most ttl_s seconds if given.
+
+    Keys are the digests of get_row_keys, which include the model version,
+    and values the postprocessed predictions of a row as a dict. Predictions
+    of an older version of a model are never returned, they just age out.
+    """
+
+    def __init__(self, max_size=10000, ttl_s=None):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.num_hits = 0
+        self.num_misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expiration_time, prediction = entry
+                if expiration_time is None or \
+                        time.monotonic() < expiration_time:
+                    self._entries.move_to_end(key)
+                    self.num_hits += 1
+                    return prediction
+                del self._entries[key]
+            self.num_misses += 1
+            return None
+
+    def put(self, key, prediction):
+        expiration_time = (time.monotonic() + self.ttl_s
+                           if self.ttl_s is not None else None)
+        with self._lock:
+            self._entries[key] = (expiration_time, prediction)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def predict(self, dataset, feature_names, model_version, predict_fn):
+        """Returns the predictions of the rows of dataset as a DataFrame.
+
+        Rows are looked up in the cache and the ones missing, each distinct
+        one once, are predicted with predict_fn, which takes them in the
+        format of dataset and returns a DataFrame of their predictions.
+        The predictions are then scattered back to the position of every
+        row of dataset.
+        """
+        keys = get_row_keys(dataset, feature_names, model_version)
+        predictions = {}
+        missing_positions = []
+        for position, key in enumerate(keys):
+            if key not in predictions:
+                predictions[key] = self.get(key)
+                if predictions[key] is None:
+                    missing_positions.append(position)
+
+        columns = None
+        if missing_positions:
+            predicted = predict_fn(take_rows(dataset, missing_positions))
+            columns = list(predicted.columns)
+            for position, prediction in zip(missing_positions,
+                                            predicted.to_dict('records')):
+                predictions[keys[position]] = prediction
+                self.put(keys[position], prediction)
+
+        return pd.DataFrame.from_records(
+            [predictions[key] for key in keys],
+            columns=columns
+        )
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.num_hits,
+                'misses': self.num_misses
+            }
@@ -0,0 +1,349 @@
+#! /usr/bin/env python
+# coding=utf-8
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+LATENCY_MS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    """
+    Counts observed values in buckets, like a Prometheus histogram: the
+    count of a bucket is the number of values less than or equal to its
+    upper bound.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+
+    def to_dict(self):
+        with self._lock:
+            buckets = {}
+            cumulative_count = 0
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative_count += count
+                buckets[str(bound)] = cumulative_count
+            buckets['+Inf'] = self.count
+            return {
+                'buckets': buckets,
+                'count': self.count,
+                'sum': self.sum
+            }
+
+
+class QueueFullError(Exception):
+    """Raised when a prediction is requested while max_queue_size entries
+    are already waiting."""
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single entry predictions into batches.
+
+    Entries are queued and a background task takes the first one waiting,
+    then collects more until there are max_batch_size of them or
+    max_latency_ms have passed since the first one was queued, runs
+    predict_fn on the list of entries and gives each caller its result.
+    predict_fn must return one result per entry. It runs in executor so the
+    event loop is never blocked, with at most max_concurrency batches
+    being predicted at the same time. When max_queue_size entries are
+    waiting, new ones are rejected right away with QueueFullError.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_latency_ms=5,
+                 executor=None, max_concurrency=1, max_queue_size=None):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency_s = max_latency_ms / 1000
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms_histogram = Histogram(LATENCY_MS_BUCKETS)
+        self.num_rejected = 0
+        self._loop = None
+        self._queue = None
+        self._task = None
+        self._slots = None
+
+    async def predict(self, entry):
+        self._ensure_started()
+        if self.is_full():
+            self.num_rejected += 1
+            raise QueueFullError()
+        future = self._loop.create_future()
+        self._queue.put_nowait((entry, future, time.perf_counter()))
+        return await future
+
+    def is_full(self):
+        return (self.max_queue_size is not None and
+                self._queue is not None and
+                self._queue.qsize() >= self.max_queue_size)
+
+    def _ensure_started(self):
+        # the queue and the task belong to the event loop they were
+        # created in, which may change, e.g. across test clients
+        loop = asyncio.get_event_loop()
+        if self._loop is not loop or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._task = loop.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._loop = None
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self.max_latency_s
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                # take what is already queued without waiting
+                if self._queue.empty():
+                    break
+                batch.append(self._queue.get_nowait())
+                continue
+            try:
+                batch.append(
+                    await asyncio.wait_for(self._queue.get(), timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            # entries keep queueing up while all the slots are busy,
+            # so the next batch is as large as possible
+            await self._slots.acquire()
+            try:
+                batch = await self._next_batch()
+            except BaseException:
+                self._slots.release()
+                raise
+            self._loop.create_task(self._predict_batch(batch))
+
+    async def _predict_batch(self, batch):
+        try:
+            start = time.perf_counter()
+            self.batch_size_histogram.observe(len(batch))
+            for _, _, queued_time in batch:
+                self.queue_wait_ms_histogram.observe(
+                    1000 * (start - queued_time)
+                )
+
+            entries = [entry for entry, _, _ in batch]
+            try:
+                results = await self._loop.run_in_executor(
+                    self.executor, self.predict_fn, entries
+                )
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, future, _), result in zip(batch, results):
+                # the caller may have gone away
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+    def metrics(self):
+        return {
+            'batch_size': self.batch_size_histogram.to_dict(),
+            'queue_wait_ms': self.queue_wait_ms_histogram.to_dict(),
+            'queue_size': self._queue.qsize() if self._queue else 0,
+            'rejected': self.num_rejected
+        }
+
+
+class _CachedModel:
+    def __init__(self, model, version, size):
+        self.model = model
+        self.version = version
+        self.size = size
+        self.checked_time = time.monotonic()
+        # a check of its files was handed out by lookup
+        self.checking = False
+
+
+class ModelCache:
+    """
+    Keeps the most recently used models loaded within a memory budget.
+
+    Models are identified by a key, e.g. a name, and loaded the first time
+    they are requested with load_fn(key). size_fn(model) estimates the memory
+    a loaded model takes: when the sizes add up to more than max_size the
+    least recently used models are evicted, except the one just requested.
+
+    version_fn(key) tells when the files of a model changed, it is checked
+    at most every reload_check_interval_s seconds. A changed model is loaded
+    again and replaces the old one only once loaded: callers keep using the
+    model they got, so requests in flight are never dropped, and when the
+    new version cannot be loaded, e.g. while its files are being written,
+    the old one keeps being used.
+
+    get may load models and block for a while, it is meant to run in a
+    worker thread. A model is loaded by one thread at a time, the others
+    requesting it wait for it. lookup never blocks: it returns the loaded
+    model, if any, and tells when its files are due for a check, which the
+    caller runs calling get in the background while it keeps using the
+    model it got.
+    """
+
+    def __init__(self, load_fn, version_fn, size_fn, max_size=None,
+                 reload_check_interval_s=1):
+        self.load_fn = load_fn
+        self.version_fn = version_fn
+        self.size_fn = size_fn
+        self.max_size = max_size
+        self.reload_check_interval_s = reload_check_interval_s
+        self.num_loads = 0
+        self.num_reloads = 0
+        self.num_evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def lookup(self, key):
+        """Returns the loaded model, None if not loaded, and whether the
+        caller should check its files calling get. A check is handed out to
+        one caller at a time."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(key)
+            check = (not entry.checking and
+                     time.monotonic() - entry.checked_time >=
+                     self.reload_check_interval_s)
+            if check:
+                entry.checking = True
+            return entry.model, check
+
+    def get(self, key, check_reload=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if not check_reload or (
+                        time.monotonic() - entry.checked_time <
+                        self.reload_check_interval_s
+                ):
+                    return entry.model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # another thread may have loaded it while this one waited
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and (
+                    time.monotonic() - entry.checked_time <
+                    self.reload_check_interval_s
+            ):
+                return entry.model
+
+            try:
+                version = self.version_fn(key)
+                if entry is not None and entry.version == version:
+                    return entry.model
+                model = self.load_fn(key)
+            except Exception as e:
+                if entry is None:
+                    raise
+                logger.error(
+                    'Could not reload model {}, keeping the loaded one: '
+                    '{}'.format(key, str(e))
+                )
+                return entry.model
+            finally:
+                if entry is not None:
+                    entry.checked_time = time.monotonic()
+                    entry.checking = False
+
+            new_entry = _CachedModel(model, version, self.size_fn(model))
+            with self._lock:
+                if entry is None:
+                    self.num_loads += 1
+                else:
+                    self.num_reloads += 1
+                self._entries[key] = new_entry
+                self._entries.move_to_end(key)
+                self._evict()
+            logger.info('Loaded model {} ({} bytes)'.format(
+                key, new_entry.size
+            ))
+            return model
+
+    def _evict(self):
+        if self.max_size is None:
+            return
+        # the most recently used one stays even when larger than max_size
+        while len(self._entries) > 1 and self.size > self.max_size:
+            key, _ = self._entries.popitem(last=False)
+            self.num_evictions += 1
+            logger.info('Evicted model {}'.format(key))
+
+    @property
+    def size(self):
+        return sum(entry.size for entry in self._entries.values())
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'loaded': list(self._entries.keys()),
+                'size': self.size,
+                'max_size': self.max_size,
+                'loads': self.num_loads,
+                'reloads': self.num_reloads,
+                'evictions': self.num_evictions
+            }
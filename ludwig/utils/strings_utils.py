@@ -21,6 +21,7 @@ from abc import abstractmethod
 from collections import Counter
 
 import numpy as np
+import pandas as pd
 
 from ludwig.utils.math_utils import int_type
 from ludwig.utils.misc_utils import get_from_registry
@@ -141,17 +142,80 @@ def create_vocabulary(
         unit_counts.update(processed_line)
         max_line_length = max(max_line_length, len(processed_line))
 
+    vocab, str2idx, str2freq = _vocabulary_from_counts(
+        unit_counts,
+        vocab=vocab,
+        add_unknown=add_unknown and tokenizer_type != 'hf_tokenizer',
+        add_padding=add_padding and tokenizer_type != 'hf_tokenizer',
+        num_most_frequent=num_most_frequent,
+        unknown_symbol=unknown_symbol,
+        padding_symbol=padding_symbol
+    )
+
+    pad_idx = None
+    if padding_symbol in str2idx.keys():
+        pad_idx = str2idx[padding_symbol]
+
+    return vocab, str2idx, str2freq, max_line_length, pad_idx, padding_symbol, unknown_symbol
+
+
+def create_stripped_vocabulary(
+        column,
+        add_unknown=True,
+        add_padding=False,
+        lowercase=False,
+        num_most_frequent=None,
+        unknown_symbol=UNKNOWN_SYMBOL,
+        padding_symbol=PADDING_SYMBOL
+):
+    """Equivalent to `create_vocabulary` with the `stripped` tokenizer, but
+    counts the distinct values of the column first, so only the unique values
+    are converted to strings, stripped and lowercased.
+
+    :param column: pandas Series of values of any type
+    :return: vocab, str2idx, str2freq
+    """
+    unit_counts = Counter()
+    codes, uniques = pd.factorize(column)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    # uniques are in order of first appearance, so ties in most_common
+    # are broken the same way as when counting row by row
+    for value, count in zip(uniques, counts):
+        unit = str(value)
+        if lowercase:
+            unit = unit.lower()
+        unit_counts[unit.strip()] += int(count)
+
+    return _vocabulary_from_counts(
+        unit_counts,
+        add_unknown=add_unknown,
+        add_padding=add_padding,
+        num_most_frequent=num_most_frequent,
+        unknown_symbol=unknown_symbol,
+        padding_symbol=padding_symbol
+    )
+
+
+def _vocabulary_from_counts(
+        unit_counts,
+        vocab=None,
+        add_unknown=True,
+        add_padding=True,
+        num_most_frequent=None,
+        unknown_symbol=UNKNOWN_SYMBOL,
+        padding_symbol=PADDING_SYMBOL
+):
     if vocab is None:
         vocab = [unit for unit, count in
                  unit_counts.most_common(num_most_frequent)]
 
     vocab_set = set(vocab)
 
-    if add_unknown and tokenizer_type != 'hf_tokenizer':
+    if add_unknown:
         if unknown_symbol in vocab_set:
             vocab.remove(unknown_symbol)
         vocab = [unknown_symbol] + vocab
-    if add_padding and tokenizer_type != 'hf_tokenizer':
+    if add_padding:
         if padding_symbol in vocab_set:
             vocab.remove(padding_symbol)
         vocab = [padding_symbol] + vocab
@@ -160,18 +224,38 @@ def create_vocabulary(
     str2freq = {unit: unit_counts.get(unit) if unit in unit_counts else 0 for
                 unit in vocab}
 
-    pad_idx = None
-    if padding_symbol in str2idx.keys():
-        pad_idx = str2idx[padding_symbol]
+    return vocab, str2idx, str2freq
 
-    return vocab, str2idx, str2freq, max_line_length, pad_idx, padding_symbol, unknown_symbol
+
+def map_stripped_to_idx(
+        column,
+        str2idx,
+        dtype,
+        unknown_symbol=UNKNOWN_SYMBOL
+):
+    """Maps the stripped string representation of every value of the column
+    to its index in str2idx, using the index of unknown_symbol for values
+    not in the vocabulary.
+
+    The column is factorized first, so the dictionary lookups happen once
+    per distinct value and the rows are remapped with a single NumPy take.
+    Missing values are mapped to the unknown index.
+    """
+    unknown_idx = str2idx[unknown_symbol]
+    codes, uniques = pd.factorize(column)
+    lookup = np.empty(len(uniques) + 1, dtype=dtype)
+    for i, value in enumerate(uniques):
+        lookup[i] = str2idx.get(str(value).strip(), unknown_idx)
+    # code -1 (missing value) picks the last element
+    lookup[-1] = unknown_idx
+    return lookup[codes]
 
 
 def get_sequence_vector(sequence, tokenizer_type, unit_to_id, lowercase=True):
     tokenizer = get_from_registry(tokenizer_type, tokenizer_registry)()
 
     format_dtype = int_type(len(unit_to_id) - 1)
-    return _get_sequence_vector(
+    return sequence_to_vector(
         sequence,
         tokenizer,
         tokenizer_type,
@@ -181,7 +265,7 @@ def get_sequence_vector(sequence, tokenizer_type, unit_to_id, lowercase=True):
     )
 
 
-def _get_sequence_vector(
+def sequence_to_vector(
         sequence,
         tokenizer,
         tokenizer_type,
@@ -190,6 +274,8 @@ def _get_sequence_vector(
         lowercase=True,
         unknown_symbol=UNKNOWN_SYMBOL
 ):
+    """Tokenizes sequence with an already created tokenizer and maps its
+    units to their ids in unit_to_id, unknown ones to unknown_symbol."""
     unit_sequence = tokenizer(
         sequence.lower() if lowercase else sequence
     )
@@ -230,7 +316,7 @@ def build_sequence_matrix(
     max_length = 0
     unit_vectors = []
     for sequence in sequences:
-        unit_indices_vector = _get_sequence_vector(
+        unit_indices_vector = sequence_to_vector(
             sequence,
             tokenizer,
             tokenizer_type,
@@ -18,12 +18,14 @@ import shutil
 import tempfile
 
 import numpy as np
+import pandas as pd
 
 from ludwig.api import LudwigModel
 from ludwig.utils.data_utils import read_csv
 from tests.integration_tests.utils import ENCODERS
 from tests.integration_tests.utils import category_feature
 from tests.integration_tests.utils import generate_data
+from tests.integration_tests.utils import numerical_feature
 from tests.integration_tests.utils import sequence_feature
 
 
@@ -265,3 +267,95 @@ def test_api_training_set(csv_filename):
         model.train(training_set=data_csv,
                     validation_set=val_csv,
                     test_set=test_csv)
+
+
+def test_api_prediction_cache(csv_filename):
+    input_features = [sequence_feature(reduce_output='sum')]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum')]
+    data_csv = generate_data(input_features, output_features, csv_filename)
+
+    model_definition = {
+        'input_features': input_features,
+        'output_features': output_features,
+        'combiner': {'type': 'concat', 'fc_size': 14},
+    }
+    model = LudwigModel(model_definition)
+    model.train_online(dataset=data_csv)
+    cache = model.enable_prediction_cache()
+
+    # counts the rows actually predicted
+    predicted_rows = []
+    predict, predict_chunk = model._predict, model._predict_chunk
+
+    def count_predict(dataset, *args, **kwargs):
+        predicted_rows.append(len(dataset))
+        return predict(dataset, *args, **kwargs)
+
+    def count_predict_chunk(predictor, chunk_df):
+        predicted_rows.append(len(chunk_df))
+        return predict_chunk(predictor, chunk_df)
+
+    model._predict = count_predict
+    model._predict_chunk = count_predict_chunk
+
+    data_df = read_csv(data_csv).head(5)
+    input_name = input_features[0]['name']
+    num_distinct = data_df[input_name].nunique()
+    prediction_column = output_features[0]['name'] + '_predictions'
+    dataset = pd.concat([data_df, data_df], ignore_index=True)
+
+    # duplicate rows are predicted once
+    predictions, _ = model.predict(dataset=dataset)
+    assert predicted_rows == [num_distinct]
+    assert len(predictions) == 10
+    assert list(predictions[prediction_column][:5]) == list(
+        predictions[prediction_column][5:]
+    )
+
+    # predict_chunks shares the entries of predict
+    chunks = list(model.predict_chunks(dataset=dataset, chunk_size=4))
+    assert predicted_rows == [num_distinct]
+    assert list(pd.concat(chunks)[prediction_column]) == list(
+        predictions[prediction_column]
+    )
+    assert cache.metrics()['hits'] > 0
+
+    # new weights are a new model version, cached predictions don't match
+    model.train_online(dataset=data_csv)
+    model.predict(dataset=dataset)
+    assert predicted_rows == [num_distinct, num_distinct]
+    list(model.predict_chunks(dataset=dataset, chunk_size=10))
+    assert predicted_rows == [num_distinct, num_distinct]
+
+
+def test_api_predict_output_features_save(csv_filename):
+    input_features = [sequence_feature(reduce_output='sum')]
+    output_features = [category_feature(vocab_size=2, reduce_input='sum'),
+                       numerical_feature()]
+    data_csv = generate_data(input_features, output_features, csv_filename)
+
+    model_definition = {
+        'input_features': input_features,
+        'output_features': output_features,
+        'combiner': {'type': 'concat', 'fc_size': 14},
+    }
+    model = LudwigModel(model_definition)
+    model.train_online(dataset=data_csv)
+
+    # each subset of output features has its own predict step
+    data_df = read_csv(data_csv)
+    subset_predictions, _ = model.predict(
+        dataset=data_df, output_features=[output_features[1]['name']]
+    )
+    predictions, _ = model.predict(dataset=data_df)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model.save(tmpdir)
+        loaded_model = LudwigModel.load(tmpdir)
+        loaded_predictions, _ = loaded_model.predict(dataset=data_df)
+
+    prediction_column = output_features[1]['name'] + '_predictions'
+    assert np.allclose(subset_predictions[prediction_column],
+                       predictions[prediction_column])
+    assert np.allclose(loaded_predictions[prediction_column],
+                       predictions[prediction_column])
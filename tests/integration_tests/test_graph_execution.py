@@ -18,6 +18,8 @@ import contextlib
 import pytest
 import tensorflow as tf
 
+from ludwig.api import LudwigModel
+from ludwig.utils.data_utils import read_csv
 from tests.integration_tests.utils import category_feature
 from tests.integration_tests.utils import generate_data
 from tests.integration_tests.utils import \
@@ -135,3 +137,34 @@ def test_sequence_generator(
 
         # run the experiment
         run_experiment(input_features, output_features, dataset=rel_path)
+
+
+def test_train_online_predict_no_retracing(csv_filename):
+    with graph_mode():
+        input_features = [sequence_feature(reduce_output='sum')]
+        output_features = [
+            category_feature(vocab_size=2, reduce_input='sum')
+        ]
+        data_csv = generate_data(input_features, output_features,
+                                 csv_filename)
+        model = LudwigModel({
+            'input_features': input_features,
+            'output_features': output_features,
+            'combiner': {'type': 'concat', 'fc_size': 14},
+        })
+
+        # python code of the step functions runs only while tracing
+        model.train_online(dataset=data_csv)
+        trace_counts = dict(model.model.trace_counts)
+        assert trace_counts['train_step'] > 0
+        model.train_online(dataset=data_csv)
+        assert model.model.trace_counts == trace_counts
+
+        # batches of any size and sequences of any length use the same trace
+        data_df = read_csv(data_csv)
+        model.predict(dataset=data_df)
+        trace_counts = dict(model.model.trace_counts)
+        assert trace_counts['predict_step'] > 0
+        for batch_size in (1, 3, 7):
+            model.predict(dataset=data_df, batch_size=batch_size)
+        assert model.model.trace_counts == trace_counts
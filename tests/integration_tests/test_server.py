@@ -150,5 +150,49 @@ def test_server_integration(csv_filename):
     model_output = model_output.to_dict('records')[0]
     assert model_output == server_response
 
+    entries = data_df.to_dict('records')
+    server_response = client.post('/batch_predict', json=entries)
+    assert server_response.status_code == 200
+    model_output, _ = model.predict(dataset=entries, data_format=dict)
+    assert model_output.to_dict('records') == server_response.json()
+
+    server_response = client.post(
+        '/batch_predict?format=columns',
+        data=data_df.to_csv(index=False),
+        headers={'content-type': 'text/csv'}
+    )
+    assert server_response.status_code == 200
+    server_response = server_response.json()
+    assert sorted(server_response.keys()) == sorted(model_output.columns)
+    assert all(len(values) == len(data_df)
+               for values in server_response.values())
+
+    # only the decoder of the numerical output feature runs
+    numerical_output = output_features[1]
+    server_response = client.post(
+        '/predict?output_features={}'.format(numerical_output['name']),
+        data=data,
+        files=files
+    )
+    assert sorted(server_response.json().keys()) == sorted(
+        output_keys_for([numerical_output])
+    )
+    server_response = client.post(
+        '/batch_predict?output_features=unknown',
+        json=entries
+    )
+    assert server_response.status_code == 400
+
+    server_response = client.post(
+        '/batch_predict',
+        data='entry',
+        headers={'content-type': 'text/plain'}
+    )
+    assert server_response.status_code == 415
+
+    # entries synthesized from the metadata, images included
+    timings = model.warm_up(batch_sizes=[1, 3])
+    assert sorted(timings.keys()) == [1, 3]
+
     shutil.rmtree(output_dir, ignore_errors=True)
     shutil.rmtree(image_dest_folder)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pandas as pd
+
+from ludwig.constants import NAME, PREPROCESSING, TYPE
+from ludwig.data.inference_preprocessing import InferencePreprocessor
+from ludwig.data.preprocessing import build_dataset_df
+from ludwig.utils.defaults import merge_with_defaults
+
+
+def test_inference_preprocessor():
+    model_definition = merge_with_defaults({
+        'input_features': [
+            {NAME: 'num', TYPE: 'numerical',
+             PREPROCESSING: {'normalization': 'zscore'}},
+            {NAME: 'bin', TYPE: 'binary'},
+            {NAME: 'cat', TYPE: 'category'},
+            {NAME: 'set', TYPE: 'set'},
+            {NAME: 'bag', TYPE: 'bag'},
+            {NAME: 'seq', TYPE: 'sequence'},
+            {NAME: 'text', TYPE: 'text'},
+            {NAME: 'vec', TYPE: 'vector'},
+        ],
+        'output_features': [{NAME: 'out', TYPE: 'binary'}]
+    })
+    input_features = model_definition['input_features']
+    dataset_df = pd.DataFrame({
+        'num': [1.5, None, -2, 4],
+        'bin': ['true', 'no', None, '1'],
+        'cat': ['a', ' b', 'c', None],
+        'set': ['x y', 'y', 'z x', None],
+        'bag': ['x x y', 'y', None, 'z'],
+        'seq': ['a b c', 'b', 'c a', None],
+        'text': ['Hello, world!', 'hello', None, 'World hello'],
+        'vec': ['1 2', '3 4', '5 6', '7 8'],
+    })
+    rows = dataset_df.to_dict('records')
+
+    dataset, metadata = build_dataset_df(
+        dataset_df,
+        input_features,
+        model_definition[PREPROCESSING]
+    )
+    dataset['text'] = dataset['text_word']
+
+    preprocessor = InferencePreprocessor(model_definition, metadata)
+    assert preprocessor.supported
+    for preprocessed in (
+            preprocessor.preprocess(rows),
+            preprocessor.preprocess(
+                {name: [row[name] for row in rows] for name in rows[0]}
+            )
+    ):
+        for feature in input_features:
+            expected = dataset[feature[NAME]]
+            assert preprocessed[feature[NAME]].dtype == expected.dtype
+            assert np.allclose(preprocessed[feature[NAME]], expected)
+
+    model_definition['input_features'][0][PREPROCESSING][
+        'missing_value_strategy'] = 'fill_with_mean'
+    metadata['num'].pop(PREPROCESSING)
+    preprocessor = InferencePreprocessor(model_definition, metadata)
+    assert not preprocessor.supported
+    assert preprocessor.unsupported_features == ['num']
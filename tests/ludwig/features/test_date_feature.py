@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.features.date_feature import DateFeatureMixin
+
+PREPROCESSING_PARAMETERS = {
+    'missing_value_strategy': 'fill_with_const',
+    'fill_value': '2000-01-01 00:00:00',
+    'datetime_format': None
+}
+
+
+@pytest.mark.parametrize('values,datetime_format', [
+    # explicit format, with a value it does not parse
+    (['2020-03-01 10:20:30', '1999-12-31 23:59:59', '03/01/2020'],
+     '%Y-%m-%d %H:%M:%S'),
+    # inferred format
+    (['2020-03-01 10:20:30', '2021-07-04 00:00:01', '1970-01-01 12:00:00'],
+     None),
+    # formats pandas does not infer, parsed by dateutil, and
+    # unparseable strings getting the fill value
+    (['March 1st 2020', 'not a date', '2020-03-01', None], None),
+    # numbers are not epoch nanoseconds, they are not parsed
+    ([20200301, 19991231, 1], None),
+    (pd.to_datetime(['2020-03-01 10:20:30', '1999-12-31 23:59:59']), None),
+])
+def test_dates_to_matrix(values, datetime_format):
+    column = pd.Series(values)
+    matrix = DateFeatureMixin.dates_to_matrix(
+        column, datetime_format, PREPROCESSING_PARAMETERS
+    )
+    expected = np.array([
+        DateFeatureMixin.date_to_list(
+            value.to_pydatetime().isoformat()
+            if isinstance(value, pd.Timestamp) else value,
+            datetime_format,
+            PREPROCESSING_PARAMETERS
+        )
+        for value in column
+    ], dtype=np.int16)
+    assert matrix.dtype == np.int16
+    assert np.array_equal(matrix, expected)
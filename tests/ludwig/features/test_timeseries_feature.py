@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.constants import NAME, PREPROCESSING, TYPE
+from ludwig.data.preprocessing import build_dataset_df
+from ludwig.features import timeseries_feature
+from ludwig.features.timeseries_feature import TimeseriesFeatureMixin
+from ludwig.utils.data_utils import is_native_sequence_column
+from ludwig.utils.defaults import merge_with_defaults
+
+
+@pytest.mark.parametrize('padding,expected', [
+    ('right', [[1, 2, -1], [3, 4, 5], [-1, -1, -1], [7, -1, -1]]),
+    ('left', [[-1, 1, 2], [3, 4, 5], [-1, -1, -1], [-1, -1, 7]]),
+])
+def test_pad_values(padding, expected):
+    # rows longer than the limit are truncated, empty rows are all padding
+    values = np.array([1, 2, 3, 4, 5, 6, 7], dtype=np.float32)
+    lengths = np.array([2, 4, 0, 1])
+
+    matrix = TimeseriesFeatureMixin.pad_values(
+        values, lengths, 3, -1, padding
+    )
+    assert matrix.dtype == np.float32
+    assert np.array_equal(matrix, expected)
+
+
+@pytest.mark.parametrize('padding', ['right', 'left'])
+@pytest.mark.parametrize('column', [
+    pd.Series(['1 2', '3 4 5 6', '7']),
+    pd.Series([[1, 2], np.array([3, 4, 5, 6]), [7]]),
+])
+def test_build_matrix(column, padding):
+    preprocessing_parameters = dict(
+        TimeseriesFeatureMixin.preprocessing_defaults,
+        timeseries_length_limit=3
+    )
+    metadata = TimeseriesFeatureMixin.get_feature_meta(
+        column, preprocessing_parameters
+    )
+    assert metadata == {'max_timeseries_length': 3}
+
+    matrix = TimeseriesFeatureMixin.build_matrix(
+        column, 'space', 3, 0, padding
+    )
+    # the per row parser of the other tokenizers
+    expected = TimeseriesFeatureMixin.build_matrix(
+        column.map(lambda x: ','.join(str(v) for v in x)
+                   if not isinstance(x, str) else x.replace(' ', ',')),
+        'comma', 3, 0, padding
+    )
+    assert np.array_equal(matrix, expected)
+    if padding == 'right':
+        assert np.array_equal(matrix, [[1, 2, 0], [3, 4, 5], [7, 0, 0]])
+
+
+def test_build_dataset_df_native_lists(monkeypatch):
+    # the columns of lists reach the bulk parser
+    native_columns = []
+    parse = timeseries_feature.parse_number_sequences
+
+    def parse_number_sequences(column):
+        native_columns.append(is_native_sequence_column(column))
+        return parse(column)
+
+    monkeypatch.setattr(timeseries_feature, 'parse_number_sequences',
+                        parse_number_sequences)
+
+    model_definition = merge_with_defaults({
+        'input_features': [
+            {NAME: 'ts', TYPE: 'timeseries',
+             PREPROCESSING: {'padding': 'left'}},
+            {NAME: 'vec', TYPE: 'vector'},
+            {NAME: 'set', TYPE: 'set'},
+        ],
+        'output_features': [{NAME: 'out', TYPE: 'binary'}]
+    })
+    input_features = model_definition['input_features']
+    datasets = []
+    for dataset_df in (
+            pd.DataFrame({
+                'ts': ['1 2', '3 4 5', '6'],
+                'vec': ['1 2', '3 4', '5 6'],
+                'set': ['a b', 'b', 'c a'],
+            }),
+            pd.DataFrame({
+                'ts': [[1, 2], np.array([3, 4, 5]), [6]],
+                'vec': [[1, 2], [3, 4], np.array([5, 6])],
+                'set': [['a', 'b'], ['b'], ['c', 'a']],
+            })
+    ):
+        dataset, _ = build_dataset_df(
+            dataset_df,
+            input_features,
+            model_definition[PREPROCESSING]
+        )
+        datasets.append(dataset)
+    assert native_columns == [False, True]
+
+    assert np.array_equal(datasets[1]['ts'],
+                          [[0, 1, 2], [3, 4, 5], [0, 0, 6]])
+    for name in ('ts', 'vec', 'set'):
+        assert np.array_equal(datasets[0][name], datasets[1][name])
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.constants import NAME
+from ludwig.features.vector_feature import VectorFeatureMixin
+
+
+def add_feature_data(values):
+    feature = {NAME: 'vector'}
+    dataset = {}
+    VectorFeatureMixin.add_feature_data(
+        feature,
+        pd.DataFrame({'vector': values}),
+        dataset,
+        {'vector': {}},
+        {}
+    )
+    return dataset['vector']
+
+
+@pytest.mark.parametrize('values', [
+    ['1 2.5 -3', '4 5 6'],
+    [[1, 2.5, -3], [4, 5, 6]],
+    [np.array([1, 2.5, -3]), np.array([4, 5, 6])],
+])
+def test_add_feature_data(values):
+    vectors = add_feature_data(values)
+    assert vectors.dtype == np.float32
+    assert np.array_equal(vectors, [[1, 2.5, -3], [4, 5, 6]])
+
+
+@pytest.mark.parametrize('values', [
+    ['1 2', '3'],
+    [[1, 2], [3]],
+])
+def test_add_feature_data_different_sizes(values):
+    with pytest.raises(ValueError):
+        add_feature_data(values)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+
+from ludwig.constants import LOGITS, PREDICTIONS, PROBABILITIES
+from ludwig.models.predictor import PredictionsAccumulator
+
+
+def test_predictions_accumulator():
+    accumulator = PredictionsAccumulator(
+        5, exclude={LOGITS, PROBABILITIES}
+    )
+    batches = [
+        {PREDICTIONS: np.array([1, 2, 3]),
+         PROBABILITIES: np.ones((3, 4)),
+         LOGITS: np.ones((3, 4)),
+         'sequence': np.array([[1, 2], [3, 4], [5, 6]])},
+        {PREDICTIONS: np.array([4, 5]),
+         PROBABILITIES: np.ones((2, 4)),
+         LOGITS: np.ones((2, 4)),
+         # longer sequences, the batches are padded
+         'sequence': np.array([[7, 8, 9], [10, 11, 12]])},
+    ]
+    for batch in batches:
+        accumulator.add({'out': batch})
+
+    predictions = accumulator.result()
+    assert sorted(predictions['out'].keys()) == [PREDICTIONS, 'sequence']
+    assert np.array_equal(predictions['out'][PREDICTIONS], [1, 2, 3, 4, 5])
+    assert np.array_equal(
+        predictions['out']['sequence'],
+        [[1, 2, 0], [3, 4, 0], [5, 6, 0], [7, 8, 9], [10, 11, 12]]
+    )
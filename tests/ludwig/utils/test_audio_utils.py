@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pytest
+
+from ludwig.utils.audio_utils import calculate_incr_mean
+from ludwig.utils.audio_utils import _preprocess_to_padded_matrix
+from ludwig.utils.audio_utils import calculate_incr_var
+from ludwig.utils.audio_utils import get_fbank
+from ludwig.utils.audio_utils import get_group_delay
+from ludwig.utils.audio_utils import get_phase_stft_magnitude
+from ludwig.utils.audio_utils import get_stft_magnitude
+from ludwig.utils.audio_utils import merge_incr_stats
+
+
+def accumulate(lengths):
+    count, mean, var = 0, 0, 0
+    for length in lengths:
+        count += 1
+        new_mean = calculate_incr_mean(count, mean, length)
+        var = calculate_incr_var(var, mean, new_mean, length)
+        mean = new_mean
+    return count, mean, var
+
+
+@pytest.mark.parametrize('split', [0, 1, 4, 10])
+def test_merge_incr_stats(split):
+    lengths = np.random.RandomState(0).uniform(0.5, 10, 10)
+
+    merged = merge_incr_stats(
+        *accumulate(lengths[:split]), *accumulate(lengths[split:])
+    )
+    expected = accumulate(lengths)
+
+    assert merged[0] == expected[0]
+    assert np.allclose(merged[1:], expected[1:])
+    assert np.isclose(merged[2] / merged[0], np.var(lengths))
+
+
+def test_preprocess_to_padded_matrix():
+    data = np.arange(1, 11, dtype=np.float64)
+
+    assert np.array_equal(
+        _preprocess_to_padded_matrix(data, 4, 3),
+        [[1, 2, 3, 4], [4, 5, 6, 7], [7, 8, 9, 10]]
+    )
+    assert np.array_equal(
+        _preprocess_to_padded_matrix(data, 4, 4, zero_mean_offset=True),
+        [[-1.5, -0.5, 0.5, 1.5], [-1.5, -0.5, 0.5, 1.5], [-0.5, 0.5, 0, 0]]
+    )
+
+
+@pytest.mark.parametrize('zero_mean_offset', [False, True])
+@pytest.mark.parametrize('shape', [(1,), (0,), (2, 1)])
+def test_preprocess_to_padded_matrix_short_clip(shape, zero_mean_offset):
+    # clips not longer than the window length minus the shift have no frames
+    frames = _preprocess_to_padded_matrix(
+        np.ones(shape), 4, 3, zero_mean_offset=zero_mean_offset
+    )
+    assert frames.shape == shape[:-1] + (0, 4)
+
+
+@pytest.mark.parametrize('get_feature', [get_fbank, get_group_delay,
+                                         get_phase_stft_magnitude,
+                                         get_stft_magnitude])
+def test_batch_features(get_feature):
+    clips = np.random.RandomState(0).uniform(-1, 1, (3, 1000))
+    params = (8000, 0.025, 0.01, 256, 'hamming')
+    if get_feature is get_fbank:
+        params += (20,)
+
+    batch = get_feature(clips, *params)
+    for clip, clip_features in zip(clips, batch):
+        assert np.allclose(get_feature(clip, *params), clip_features)
@@ -13,9 +13,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import os
+
+import numpy as np
 import pandas as pd
+import pytest
 
 from ludwig.utils.data_utils import add_sequence_feature_column
+from ludwig.utils.data_utils import figure_data_format_dataset
+from ludwig.utils.data_utils import iter_data_file_chunks
+from ludwig.utils.data_utils import parse_number_sequences
+from ludwig.utils.data_utils import read_data_file
+from ludwig.utils.data_utils import read_parquet_row_groups
+from ludwig.utils.data_utils import replace_file_extension
+from ludwig.utils.data_utils import save_data_chunks
 
 
 def test_add_sequence_feature_column():
@@ -53,3 +64,122 @@ def test_add_sequence_feature_column():
 
     add_sequence_feature_column(df, 'y', 2)
     assert df.equals(pd.DataFrame([1, 2, 3, 4, 5], columns=['x']))
+
+
+def test_parse_number_sequences():
+    values, lengths = parse_number_sequences(
+        pd.Series(['1 2.5 -3', ' 4e2\t5 ', '6'])
+    )
+    assert np.array_equal(
+        values,
+        np.array([1, 2.5, -3, 400, 5, 6], dtype=np.float32)
+    )
+    assert np.array_equal(lengths, [3, 2, 1])
+
+    values, lengths = parse_number_sequences(
+        pd.Series([[1, 2], np.array([3.5]), []])
+    )
+    assert np.array_equal(values, np.array([1, 2, 3.5], dtype=np.float32))
+    assert np.array_equal(lengths, [2, 1, 0])
+
+    # tokens that are not exactly one number need the per row parser
+    assert parse_number_sequences(pd.Series(['1 2', '3 a'])) is None
+    assert parse_number_sequences(pd.Series(['1 2', '3-4'])) is None
+    assert parse_number_sequences(pd.Series([1.0, 2.0])) is None
+
+
+@pytest.mark.parametrize('data_format', ['parquet', 'feather'])
+def test_read_data_file_columnar(tmpdir, data_format):
+    pytest.importorskip('pyarrow')
+    df = pd.DataFrame({
+        'x': np.arange(6, dtype=np.float32),
+        'vector': [[float(i), float(i + 1)] for i in range(6)],
+        'unused': ['a'] * 6,
+        'split': [0, 0, 0, 1, 2, 2]
+    })
+    data_fp = os.path.join(str(tmpdir), 'dataset.' + data_format)
+    if data_format == 'parquet':
+        df.to_parquet(data_fp, row_group_size=4)
+    else:
+        df.to_feather(data_fp)
+    assert figure_data_format_dataset(data_fp) == data_format
+
+    read_df = read_data_file(
+        data_fp,
+        data_format,
+        columns=['vector', 'x'],
+        optional_columns=['split', 'missing']
+    )
+    assert list(read_df.columns) == ['x', 'vector', 'split']
+    assert read_df['x'].dtype == np.float32
+    assert list(read_df['vector'].iloc[5]) == [5.0, 6.0]
+
+    with pytest.raises(ValueError):
+        read_data_file(data_fp, data_format, columns=['missing'])
+
+    # list columns are found by their name, not the one of their elements
+    chunks = list(iter_data_file_chunks(data_fp, data_format, 4,
+                                        columns=['vector']))
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+    assert all(list(chunk.columns) == ['vector'] for chunk in chunks)
+
+    if data_format == 'parquet':
+        row_groups = list(read_parquet_row_groups(data_fp,
+                                                  columns=['x', 'vector']))
+        assert [len(row_group) for row_group in row_groups] == [4, 2]
+        assert list(row_groups[1]['vector'].iloc[1]) == [5.0, 6.0]
+
+
+@pytest.mark.parametrize('file_name', ['dataset.csv', 'dataset.csv.gz'])
+def test_read_data_file_csv(tmpdir, file_name):
+    df = pd.DataFrame({
+        'category': ['01', '2', '03'],
+        'x': [1.5, 2.5, 3.5],
+        'unused': [1, 2, 3]
+    })
+    data_fp = os.path.join(str(tmpdir), file_name)
+    df.to_csv(data_fp, sep='\t', index=False)
+    assert figure_data_format_dataset(data_fp) == 'csv'
+    assert replace_file_extension(data_fp, 'hdf5') == os.path.join(
+        str(tmpdir), 'dataset.hdf5'
+    )
+
+    read_df = read_data_file(
+        data_fp,
+        'csv',
+        columns=['x', 'category'],
+        optional_columns=['split'],
+        dtype={'category': str, 'x': np.float32}
+    )
+    assert list(read_df.columns) == ['category', 'x']
+    assert list(read_df['category']) == ['01', '2', '03']
+    assert read_df['x'].dtype == np.float32
+
+
+def test_iter_data_file_chunks(tmpdir):
+    df = pd.DataFrame({'x': np.arange(10), 'y': ['a'] * 10})
+    data_fp = os.path.join(str(tmpdir), 'dataset.csv')
+    df.to_csv(data_fp, index=False)
+
+    chunks = list(iter_data_file_chunks(data_fp, 'csv', 4, columns=['x']))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert all(list(chunk.columns) == ['x'] for chunk in chunks)
+
+    output_fp = os.path.join(str(tmpdir), 'output.csv')
+    assert save_data_chunks(iter(chunks), output_fp) == 10
+    assert pd.read_csv(output_fp).equals(df[['x']])
+
+
+@pytest.mark.parametrize('csv_engine', [None, 'c', 'pyarrow'])
+def test_iter_data_file_chunks_csv_options(tmpdir, csv_engine):
+    data_fp = os.path.join(str(tmpdir), 'dataset.csv')
+    with open(data_fp, 'w') as f:
+        f.write('x,y\n0,a\n1,b\n2,c\\,d\n3,e\n4,f\n')
+
+    expected = read_data_file(data_fp, 'csv', csv_engine=csv_engine)
+    assert list(expected['y']) == ['a', 'b', 'c,d', 'e', 'f']
+
+    chunks = list(iter_data_file_chunks(data_fp, 'csv', 2,
+                                        csv_engine=csv_engine))
+    assert sum(len(chunk) for chunk in chunks) == 5
+    assert pd.concat(chunks, ignore_index=True).equals(expected)
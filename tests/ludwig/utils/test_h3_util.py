@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import random
+
+import numpy as np
+
+from ludwig.features.h3_feature import H3FeatureMixin
+from ludwig.features.h3_feature import MAX_H3_RESOLUTION
+from ludwig.utils.h3_util import components_to_h3
+from ludwig.utils.h3_util import h3_to_components_matrix
+
+
+def random_h3(rng):
+    resolution = rng.randint(0, MAX_H3_RESOLUTION)
+    return components_to_h3({
+        'mode': 1,
+        'edge': 0,
+        'resolution': resolution,
+        'base_cell': rng.randint(0, 121),
+        'cells': [rng.randint(0, 6) for _ in range(resolution)]
+    })
+
+
+def test_h3_to_components_matrix():
+    rng = random.Random(42)
+    h3_values = [random_h3(rng) for _ in range(1000)]
+    # arbitrary 63 bit integers exercise every bit position
+    h3_values += [rng.getrandbits(63) for _ in range(1000)]
+
+    expected = np.array(
+        [H3FeatureMixin.h3_to_list(h3_value) for h3_value in h3_values],
+        dtype=np.uint8
+    )
+
+    assert np.array_equal(
+        h3_to_components_matrix(np.array(h3_values, dtype=np.int64)),
+        expected
+    )
+    assert np.array_equal(
+        h3_to_components_matrix(np.array(h3_values, dtype=object)),
+        expected
+    )
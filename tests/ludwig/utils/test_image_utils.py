@@ -13,11 +13,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import os
+
 import numpy as np
+import pandas as pd
 import pytest
+from PIL import Image
 
+from ludwig.constants import CROP_OR_PAD, INTERPOLATE
+from ludwig.constants import NAME, PREPROCESSING, TYPE
+from ludwig.data.dataset import Dataset
+from ludwig.features.image_feature import ImageFeatureMixin
+from ludwig.data.preprocessing import build_dataset_df
+from ludwig.utils.batcher import Batcher
 from ludwig.utils.data_utils import get_abs_path
+from ludwig.utils.defaults import merge_with_defaults
+from ludwig.utils.image_utils import CachedImageReader
+from ludwig.utils.image_utils import DiskImageCache
+from ludwig.utils.image_utils import ImageLoader
+from ludwig.utils.image_utils import PILLOW, SKIMAGE
 from ludwig.utils.image_utils import num_channels_in_image
+from ludwig.utils.image_utils import read_image
+from ludwig.utils.image_utils import resize_image
 
 image_2d = np.random.randint(0, 1, (10, 10))
 image_3d = np.random.randint(0, 1, (10, 10, 3))
@@ -32,6 +49,254 @@ def test_num_channels_in_image():
         num_channels_in_image(None)
 
 
+def write_image(directory, mode, height=12, width=10, image_format='PNG',
+                transparency=False):
+    rs = np.random.RandomState(0)
+    num_channels = {'L': 1, 'P': 1, 'LA': 2, 'RGB': 3, 'RGBA': 4}[mode]
+    shape = (height, width) + ((num_channels,) if num_channels > 1 else ())
+    img = Image.fromarray(rs.randint(0, 256, shape, dtype=np.uint8), mode)
+    if mode == 'P':
+        img.putpalette(rs.randint(0, 256, 768, dtype=np.uint8).tolist())
+    file_path = os.path.join(
+        directory, '{}{}.{}'.format(mode, int(transparency),
+                                    image_format.lower())
+    )
+    if transparency:
+        img.save(file_path, image_format, transparency=0)
+    else:
+        img.save(file_path, image_format)
+    return file_path
+
+
+@pytest.mark.parametrize('mode,transparency', [
+    ('L', False), ('LA', False), ('RGB', False), ('RGBA', False),
+    ('P', False), ('P', True)
+])
+def test_read_image_backends(tmpdir, mode, transparency):
+    pytest.importorskip('skimage')
+    file_path = write_image(str(tmpdir), mode, transparency=transparency)
+
+    img = read_image(file_path, backend=PILLOW)
+    if mode == 'P':
+        # older versions of imageio keep the transparency as alpha
+        with Image.open(file_path) as pil_img:
+            expected = np.array(pil_img.convert('RGB'))
+        assert img.shape[2] == 3
+    else:
+        expected = read_image(file_path, backend=SKIMAGE)
+    assert img.dtype == np.uint8
+    if mode == 'LA' and expected.shape[2] == 4:
+        # older versions of imageio convert LA to RGBA
+        expected = expected[:, :, [0, 3]]
+    assert img.shape == expected.shape
+    assert np.array_equal(img, expected)
+
+    with open(file_path, 'rb') as f:
+        assert np.array_equal(read_image(f.read(), backend=PILLOW), img)
+
+
+@pytest.mark.parametrize('mode,num_channels', [
+    ('L', 1), ('L', 3), ('LA', 1), ('LA', 3), ('P', 1), ('P', 3),
+    ('RGBA', 3), ('RGBA', 4)
+])
+@pytest.mark.parametrize('resize_method', [CROP_OR_PAD, INTERPOLATE])
+def test_read_image_and_resize_backends(tmpdir, mode, num_channels,
+                                        resize_method):
+    pytest.importorskip('skimage')
+    file_path = write_image(str(tmpdir), mode, height=12, width=10)
+
+    images = [
+        ImageFeatureMixin._read_image_and_resize(
+            file_path,
+            img_width=6,
+            img_height=16,
+            should_resize=True,
+            num_channels=num_channels,
+            resize_method=resize_method,
+            user_specified_num_channels=True,
+            backend=backend
+        )
+        for backend in (PILLOW, SKIMAGE)
+    ]
+    for img in images:
+        assert img.dtype == np.uint8
+        assert img.shape == (16, 6, num_channels)
+    if resize_method == CROP_OR_PAD and mode != 'LA':
+        assert np.array_equal(images[0], images[1])
+
+
+def test_read_image_draft(tmpdir):
+    pytest.importorskip('skimage')
+    # a smooth image, so that decoding at a reduced resolution and then
+    # interpolating stays close to interpolating the full image
+    y, x = np.mgrid[0:48, 0:64]
+    img = np.stack([x * 4, y * 5, (x + y) * 2], axis=2).astype(np.uint8)
+    file_path = os.path.join(str(tmpdir), 'img.jpg')
+    Image.fromarray(img).save(file_path, quality=95)
+
+    assert read_image(file_path, backend=PILLOW).shape == (48, 64, 3)
+    # the largest scale of 1/2, 1/4 and 1/8 still at least min_size
+    assert read_image(file_path, backend=PILLOW,
+                      min_size=(10, 12)).shape == (12, 16, 3)
+    assert read_image(file_path, backend=PILLOW,
+                      min_size=(30, 20)).shape == (48, 64, 3)
+    assert read_image(file_path, backend=PILLOW,
+                      min_size=(100, 100)).shape == (48, 64, 3)
+    # formats other than JPEG are decoded at full resolution
+    png_path = os.path.join(str(tmpdir), 'img.png')
+    Image.fromarray(img).save(png_path)
+    assert read_image(png_path, backend=PILLOW,
+                      min_size=(10, 12)).shape == (48, 64, 3)
+
+    drafted = resize_image(
+        read_image(file_path, backend=PILLOW, min_size=(10, 12)),
+        (10, 12), INTERPOLATE, backend=PILLOW
+    )
+    expected = resize_image(
+        read_image(file_path, backend=SKIMAGE),
+        (10, 12), INTERPOLATE, backend=SKIMAGE
+    )
+    assert drafted.shape == expected.shape == (10, 12, 3)
+    assert np.abs(drafted.astype(int) - expected.astype(int)).mean() < 8
+
+
+@pytest.mark.parametrize('num_channels', [1, 2, 3, 4])
+@pytest.mark.parametrize('new_size', [(6, 5), (20, 24), (12, 3)])
+def test_resize_image_backends(num_channels, new_size):
+    pytest.importorskip('skimage')
+    img = np.random.RandomState(0).randint(
+        0, 256, (12, 10, num_channels), dtype=np.uint8
+    )
+    resized = resize_image(img, new_size, INTERPOLATE, backend=PILLOW)
+    expected = resize_image(img, new_size, INTERPOLATE, backend=SKIMAGE)
+    assert resized.dtype == expected.dtype == np.uint8
+    assert resized.shape == expected.shape == new_size + (num_channels,)
+
+
 def test_get_abs_path():
     assert get_abs_path('a', 'b.jpg') == 'a/b.jpg'
     assert get_abs_path(None, 'b.jpg') == 'b.jpg'
+
+
+def test_disk_image_cache(tmpdir):
+    file_paths = []
+    for i in range(3):
+        file_path = os.path.join(str(tmpdir), '{}.raw'.format(i))
+        with open(file_path, 'wb') as f:
+            f.write(bytes([i]) * 10)
+        file_paths.append(file_path)
+
+    decoded = []
+
+    def read_image(file_path):
+        decoded.append(file_path)
+        with open(file_path, 'rb') as f:
+            return np.frombuffer(f.read(), dtype=np.uint8).reshape(2, 5, 1)
+
+    cache_dir = os.path.join(str(tmpdir), 'cache')
+    reader = CachedImageReader(
+        read_image, DiskImageCache(cache_dir, 1024, key_params=(2, 5, 1))
+    )
+    for _ in range(2):
+        for i, file_path in enumerate(file_paths):
+            assert np.array_equal(reader(file_path), np.full((2, 5, 1), i))
+    assert decoded == file_paths
+
+    # different parameters are a different entry
+    other_reader = CachedImageReader(
+        read_image, DiskImageCache(cache_dir, 1024, key_params=(5, 2, 1))
+    )
+    other_reader(file_paths[0])
+    assert len(decoded) == 4
+
+    # the least recently used entries are evicted first
+    cache = DiskImageCache(cache_dir, 200, key_params=(2, 5, 1))
+    os.utime(cache._entry_path(file_paths[1]), (0, 0))
+    cache.evict()
+    assert cache.get(file_paths[1]) is None
+
+
+def write_images(directory, num_images, height=12, width=10):
+    rs = np.random.RandomState(0)
+    file_paths = []
+    for i in range(num_images):
+        file_path = os.path.join(directory, '{}.png'.format(i))
+        Image.fromarray(
+            rs.randint(0, 256, (height, width, 3), dtype=np.uint8)
+        ).save(file_path)
+        file_paths.append(file_path)
+    return file_paths
+
+
+def test_lazy_load_matches_in_memory(tmpdir):
+    file_paths = write_images(str(tmpdir), 5)
+    # repeated images, in memory they are decoded once
+    dataset_df = pd.DataFrame({'image': file_paths + file_paths[:2]})
+
+    datasets = {}
+    for lazy_load in (False, True):
+        model_definition = merge_with_defaults({
+            'input_features': [
+                {NAME: 'image', TYPE: 'image',
+                 PREPROCESSING: {'lazy_load': lazy_load,
+                                 'height': 8, 'width': 8}}
+            ],
+            'output_features': [{NAME: 'out', TYPE: 'binary'}]
+        })
+        input_features = model_definition['input_features']
+        dataset, metadata = build_dataset_df(
+            dataset_df,
+            input_features,
+            model_definition[PREPROCESSING]
+        )
+        datasets[lazy_load] = Dataset(
+            dataset, input_features, [], None, metadata
+        )
+    in_memory, lazy = datasets[False], datasets[True]
+    assert 'image' not in in_memory.image_loaders
+    assert 'image' in lazy.image_loaders
+
+    idx = [6, 0, 3]
+    assert np.array_equal(lazy.get('image', idx),
+                          in_memory.get('image', idx))
+
+    # the next batch is prefetched while the current one is used,
+    # the loading threads are stopped after the last one
+    batcher = Batcher(lazy, batch_size=3, should_shuffle=False)
+    batches = []
+    while not batcher.last_batch():
+        batches.append(batcher.next_batch()['image'])
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert np.array_equal(np.concatenate(batches),
+                          in_memory.get('image'))
+    assert lazy.image_loaders['image']._executor is None
+
+
+def test_image_loader_cache():
+    decoded = []
+
+    def read_image(file_path):
+        decoded.append(file_path)
+        return np.full((2, 2, 1), int(file_path), dtype=np.uint8)
+
+    loader = ImageLoader(read_image, (2, 2, 1), num_workers=1, cache_size=2)
+    images = loader.load(['1', '2', '1'])
+    assert images[:, 0, 0, 0].tolist() == [1, 2, 1]
+    assert decoded == ['1', '2']
+
+    loader.load(['1'])
+    assert decoded == ['1', '2']
+
+    # 2 is the least recently used one
+    loader.load(['3'])
+    loader.load(['1'])
+    loader.load(['2'])
+    assert decoded == ['1', '2', '3', '2']
+
+    # prefetched images are decoded once, and loaded after a close
+    loader.prefetch(['4', '5'])
+    assert loader.load(['4', '5'])[:, 0, 0, 0].tolist() == [4, 5]
+    assert decoded.count('4') == 1 and decoded.count('5') == 1
+    loader.close()
+    assert loader.load(['6'])[0, 0, 0, 0] == 6
+    loader.close()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.utils.prediction_cache import PredictionCache
+from ludwig.utils.prediction_cache import hash_row
+
+
+def test_hash_row():
+    assert hash_row([1, 'a', None], 'v1') == hash_row(
+        [np.int64(1), 'a', float('nan')], 'v1'
+    )
+    assert hash_row([1, 'a'], 'v1') != hash_row([1, 'a'], 'v2')
+    assert hash_row([1], 'v1') != hash_row(['1'], 'v1')
+    assert hash_row([b'ab', b'c'], 'v1') != hash_row([b'a', b'bc'], 'v1')
+
+
+@pytest.mark.parametrize('to_dataset', [
+    lambda rows: rows,
+    lambda rows: {name: [row[name] for row in rows] for name in rows[0]},
+    pd.DataFrame,
+])
+def test_prediction_cache(to_dataset):
+    predicted = []
+
+    def predict_fn(rows):
+        rows = pd.DataFrame(rows)
+        predicted.extend(rows['x'])
+        return pd.DataFrame({'y': 2 * rows['x']})
+
+    cache = PredictionCache(max_size=3)
+    rows = [{'x': x, 'other': i} for i, x in enumerate([1, 2, 1, 3, 2])]
+
+    predictions = cache.predict(to_dataset(rows), ['x'], 'v1', predict_fn)
+    assert list(predictions['y']) == [2, 4, 2, 6, 4]
+    assert predicted == [1, 2, 3]
+
+    predictions = cache.predict(
+        to_dataset([{'x': 3, 'other': 0}, {'x': 4, 'other': 0}]),
+        ['x'], 'v1', predict_fn
+    )
+    assert list(predictions['y']) == [6, 8]
+    assert predicted == [1, 2, 3, 4]
+    # 1 was the least recently used one
+    assert len(cache) == 3
+    assert cache.metrics()['hits'] == 1
+
+    cache.predict(to_dataset(rows[:1]), ['x'], 'v2', predict_fn)
+    assert predicted == [1, 2, 3, 4, 1]
+
+
+def test_prediction_cache_ttl():
+    cache = PredictionCache(ttl_s=0.05)
+    cache.put('key', {'y': 1})
+    assert cache.get('key') == {'y': 1}
+    time.sleep(0.1)
+    assert cache.get('key') is None
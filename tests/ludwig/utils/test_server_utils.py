@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import asyncio
+import threading
+
+import pytest
+
+from ludwig.utils.server_utils import Histogram
+from ludwig.utils.server_utils import MicroBatcher
+from ludwig.utils.server_utils import ModelCache
+from ludwig.utils.server_utils import QueueFullError
+
+
+def test_histogram():
+    histogram = Histogram([1, 5, 10])
+    for value in [0.5, 1, 3, 7, 20]:
+        histogram.observe(value)
+
+    assert histogram.to_dict() == {
+        'buckets': {'1': 2, '5': 3, '10': 4, '+Inf': 5},
+        'count': 5,
+        'sum': 31.5
+    }
+
+
+def test_micro_batcher():
+    batches = []
+
+    def predict_fn(entries):
+        batches.append(len(entries))
+        if any(entry < 0 for entry in entries):
+            raise ValueError('negative entry')
+        return [2 * entry for entry in entries]
+
+    async def run():
+        batcher = MicroBatcher(predict_fn, max_batch_size=4,
+                               max_latency_ms=50)
+        results = await asyncio.gather(
+            *[batcher.predict(i) for i in range(10)]
+        )
+        with pytest.raises(ValueError):
+            await batcher.predict(-1)
+        await batcher.close()
+        return results, batcher.metrics()
+
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        results, metrics = loop.run_until_complete(run())
+    finally:
+        loop.close()
+        asyncio.set_event_loop(None)
+
+    assert results == [2 * i for i in range(10)]
+    assert batches == [4, 4, 2, 1]
+    assert metrics['batch_size']['count'] == 4
+    assert metrics['queue_wait_ms']['count'] == 11
+
+
+def test_micro_batcher_queue_full():
+    async def run():
+        batcher = MicroBatcher(lambda entries: entries, max_batch_size=2,
+                               max_latency_ms=50, max_queue_size=3)
+        results = await asyncio.gather(
+            *[batcher.predict(i) for i in range(5)],
+            return_exceptions=True
+        )
+        await batcher.close()
+        return results, batcher.metrics()
+
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        results, metrics = loop.run_until_complete(run())
+    finally:
+        loop.close()
+        asyncio.set_event_loop(None)
+
+    assert results[:3] == [0, 1, 2]
+    assert all(isinstance(result, QueueFullError) for result in results[3:])
+    assert metrics['rejected'] == 2
+
+
+def test_model_cache():
+    versions = {'a': 1, 'b': 1, 'c': 1}
+    loads = []
+
+    def load_fn(key):
+        if versions[key] < 0:
+            raise IOError('model {} being written'.format(key))
+        loads.append(key)
+        return (key, versions[key])
+
+    cache = ModelCache(load_fn, versions.get, lambda model: 10,
+                       max_size=20, reload_check_interval_s=0)
+
+    assert cache.get('a') == ('a', 1)
+    assert cache.get('b') == ('b', 1)
+    assert cache.get('a') == ('a', 1)
+    assert loads == ['a', 'b']
+
+    # b is the least recently used one
+    assert cache.get('c') == ('c', 1)
+    assert cache.keys() == ['a', 'c']
+
+    # replaced once the new version is loaded
+    versions['a'] = 2
+    assert cache.get('a', check_reload=False) == ('a', 1)
+    assert cache.get('a') == ('a', 2)
+
+    # the loaded version is kept while the new one cannot be loaded
+    versions['c'] = -1
+    assert cache.get('c') == ('c', 1)
+
+    metrics = cache.metrics()
+    assert metrics['loads'] == 3
+    assert metrics['reloads'] == 1
+    assert metrics['evictions'] == 1
+    assert metrics['size'] == 20
+
+
+def test_model_cache_lookup_while_loading():
+    versions = {'a': 1, 'b': 1}
+    loading = threading.Event()
+    release = threading.Event()
+
+    def load_fn(key):
+        if key == 'b' or versions[key] > 1:
+            # a slow load, e.g. of large weights plus the warm-up
+            loading.set()
+            assert release.wait(5)
+        return (key, versions[key])
+
+    cache = ModelCache(load_fn, versions.get, lambda model: 1,
+                       reload_check_interval_s=0)
+    assert cache.get('a') == ('a', 1)
+
+    # a is served while b loads
+    loader = threading.Thread(target=cache.get, args=('b',))
+    loader.start()
+    assert loading.wait(5)
+    assert cache.lookup('a') == (('a', 1), True)
+    assert cache.lookup('b') == (None, False)
+    release.set()
+    loader.join(5)
+    assert cache.lookup('b')[0] == ('b', 1)
+    # the check handed out above, a did not change
+    assert cache.get('a') == ('a', 1)
+
+    # the old version is served until the new one is loaded,
+    # and a single caller is asked to check the files of a
+    loading.clear()
+    release.clear()
+    versions['a'] = 2
+    _, check = cache.lookup('a')
+    assert check
+    reloader = threading.Thread(target=cache.get, args=('a',))
+    reloader.start()
+    assert loading.wait(5)
+    assert cache.lookup('a') == (('a', 1), False)
+    release.set()
+    reloader.join(5)
+    assert cache.lookup('a')[0] == ('a', 2)
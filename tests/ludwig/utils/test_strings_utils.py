@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2019 Uber Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from ludwig.utils.strings_utils import UNKNOWN_SYMBOL
+from ludwig.utils.strings_utils import create_stripped_vocabulary
+from ludwig.utils.strings_utils import create_vocabulary
+from ludwig.utils.strings_utils import map_stripped_to_idx
+
+
+@pytest.mark.parametrize('lowercase', [True, False])
+@pytest.mark.parametrize('num_most_frequent', [None, 2])
+def test_create_stripped_vocabulary(lowercase, num_most_frequent):
+    column = pd.Series(['a', ' b', 'A ', 'c', 'b', 'a', 'C', 'd', ' a'])
+
+    expected = create_vocabulary(
+        column,
+        'stripped',
+        num_most_frequent=num_most_frequent,
+        lowercase=lowercase,
+        add_padding=False
+    )
+    idx2str, str2idx, str2freq = create_stripped_vocabulary(
+        column,
+        num_most_frequent=num_most_frequent,
+        lowercase=lowercase,
+        add_padding=False
+    )
+
+    assert idx2str == expected[0]
+    assert str2idx == expected[1]
+    assert str2freq == expected[2]
+
+
+def test_map_stripped_to_idx():
+    str2idx = {UNKNOWN_SYMBOL: 0, 'a': 1, 'b': 2, '3': 3}
+
+    column = pd.Series(['a', ' b', 'z', 'a ', np.nan])
+    assert np.array_equal(
+        map_stripped_to_idx(column, str2idx, np.int8),
+        np.array([1, 2, 0, 1, 0], dtype=np.int8)
+    )
+
+    # integer coded categories are not converted to strings row by row
+    column = pd.Series([3, 4, 3, 3])
+    assert np.array_equal(
+        map_stripped_to_idx(column, str2idx, np.int8),
+        np.array([3, 0, 3, 3], dtype=np.int8)
+    )